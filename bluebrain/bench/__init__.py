@@ -0,0 +1,88 @@
+# Blue Brain - A Discord bot designed to make your server a safer and better place.
+# Copyright (C) 2020  Sarker Istiyak Mahmud
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Sarker Istiyak Mahmud
+# kiyotaka.ayanokouji.ehou@gmail.com
+
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from pytz import utc
+
+from bluebrain.db import Database
+
+STATIC_DIR = Path(__file__).resolve().parents[1] / "data" / "static"
+
+
+class BenchBot:
+    """Just enough of `Blue_Bot` for the persistence layer to run against a scratch database."""
+
+    def __init__(self, directory=None):
+        self._tmp = tempfile.TemporaryDirectory(prefix="bluebrain-bench-") if directory is None else None
+        self._dynamic = directory or self._tmp.name
+        self._static = str(STATIC_DIR)
+        self.scheduler = AsyncIOScheduler()
+        self.scheduler.configure(timezone=utc)
+        self.db = Database(self)
+
+    def cleanup(self):
+        if self._tmp is not None:
+            self._tmp.cleanup()
+
+
+class Timer:
+    def __init__(self):
+        self.samples = []
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.samples.append(time.perf_counter() - self._start)
+
+    @property
+    def total(self):
+        return sum(self.samples)
+
+    def rate(self, ops):
+        return ops / self.total if self.total else float("inf")
+
+    def percentile(self, pct):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    @property
+    def median(self):
+        return statistics.median(self.samples) if self.samples else 0.0
+
+
+def snowflakes(count, seed=0):
+    rng = random.Random(seed)
+    return rng.sample(range(10 ** 17, 10 ** 18), count)
+
+
+def report(name, ops, timer):
+    print(
+        f" • {name}: {timer.rate(ops):,.0f} ops/s"
+        f" (p50: {timer.percentile(50) * 1e6:,.1f} µs, p99: {timer.percentile(99) * 1e6:,.1f} µs)"
+    )
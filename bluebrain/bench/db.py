@@ -0,0 +1,215 @@
+# Blue Brain - A Discord bot designed to make your server a safer and better place.
+# Copyright (C) 2020  Sarker Istiyak Mahmud
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Sarker Istiyak Mahmud
+# kiyotaka.ayanokouji.ehou@gmail.com
+
+"""Replays the hot query mix against a seeded scratch database, and reports throughput and tail latency.
+
+Usage: python -m bluebrain.bench.db [--guilds N] [--tags N] [--warns N] [--entrants N] [--ops N] [--concurrency N]
+
+Everything runs offline against a temporary database, so storage changes can be compared before they ship."""
+
+import argparse
+import asyncio
+import random
+import time
+
+from bluebrain.bench import BenchBot, Timer, snowflakes
+from bluebrain.bench.queries import QUERIES
+from bluebrain.db.blobs import pack
+from bluebrain.db.tags import search_expression
+
+WARN_TYPES = (("spam", 1), ("nsfw", 3), ("slur", 5), ("raid", 10))
+
+# How often each source's queries are issued, relative to one another. Every guild message resolves a prefix, and
+# most commands read the guild's settings, so these dominate.
+WEIGHTS = {
+    "prefix": 50,
+    "retrieve": 25,
+    "tags": 15,
+    "warn": 10,
+}
+
+
+class Dataset:
+    """The ids seeded into the scratch database, so queries can be given values that actually hit rows."""
+
+    def __init__(self, guilds, users, seed=0):
+        self.rng = random.Random(seed)
+        self.guild_ids = snowflakes(guilds, seed)
+        self.user_ids = snowflakes(users, seed + 1)
+        self.tags = {}
+        self.hashes = []
+        self.warn_ids = []
+
+    def params(self, names):
+        guild_id = self.rng.choice(self.guild_ids)
+        warn_type, points = self.rng.choice(WARN_TYPES)
+        values = {
+            "guild": guild_id,
+            "user": self.rng.choice(self.user_ids),
+            "tag": self.rng.choice(self.tags[guild_id]) if self.tags.get(guild_id) else "missing",
+            "content": f"content {self.rng.randrange(1_000_000)}",
+            "hash": self.rng.choice(self.hashes) if self.hashes else "missing",
+            "warn_type": warn_type,
+            "warn_id": self.rng.choice(self.warn_ids) if self.warn_ids else "missing",
+            "points": points,
+            "query": search_expression(guild_id, self.rng.choice(("content", "tag1", "of"))),
+            "limit": 20,
+            "uses": self.rng.randint(1, 10),
+            "time": "2021-01-01 00:00:00",
+            "since": "-30 days",
+        }
+        return [values[name] for name in names]
+
+
+async def seed_database(db, guilds, tags, warns, entrants, seed=0):
+    data = Dataset(guilds, max(entrants, 1) * 10, seed)
+    rng = data.rng
+
+    await db.executemany("INSERT INTO system (GuildID, GuildName) VALUES (?, ?)", [(g, f"Guild {g}") for g in data.guild_ids])
+    await db.executemany("INSERT INTO gateway (GuildID) VALUES (?)", [(g,) for g in data.guild_ids])
+    await db.executemany("INSERT INTO warn (GuildID) VALUES (?)", [(g,) for g in data.guild_ids])
+    await db.executemany(
+        "INSERT INTO warntypes (GuildID, WarnType, Points) VALUES (?, ?, ?)",
+        [(g, warn_type, points) for g in data.guild_ids for warn_type, points in WARN_TYPES],
+    )
+
+    tag_rows = []
+    blobs = {}
+    warn_rows = []
+    entrant_rows = []
+    for guild_id in data.guild_ids:
+        names = data.tags[guild_id] = [f"tag{i}" for i in range(tags)]
+        for i, name in enumerate(names):
+            # Plenty of bodies repeat across guilds, as they do in practice.
+            blob = pack(f"Content of {name} " * rng.randint(1, 20))
+            blobs[blob.hash] = blob
+            tag_rows.append((guild_id, rng.choice(data.user_ids), f"{guild_id}{i}", name, blob.hash))
+
+        for i in range(warns):
+            warn_type, points = rng.choice(WARN_TYPES)
+            warn_id = f"{guild_id}{i}"
+            data.warn_ids.append(warn_id)
+            warn_rows.append((warn_id, guild_id, rng.choice(data.user_ids), rng.choice(data.user_ids), warn_type, points))
+
+        entrant_rows.extend((guild_id, user_id) for user_id in rng.sample(data.user_ids, min(entrants, len(data.user_ids))))
+
+    await db.executemany(
+        "INSERT INTO tag_blobs (Hash, Size, Compressed, Content) VALUES (?, ?, ?, ?)", list(blobs.values())
+    )
+    await db.executemany(
+        "INSERT INTO tags (GuildID, UserID, TagID, TagName, ContentHash) VALUES (?, ?, ?, ?, ?)", tag_rows
+    )
+    data.hashes = list(blobs)
+    await db.executemany(
+        "INSERT INTO warns (WarnID, GuildID, UserID, ModID, WarnType, Points) VALUES (?, ?, ?, ?, ?, ?)", warn_rows
+    )
+    await db.executemany("INSERT INTO entrants (GuildID, UserID) VALUES (?, ?)", entrant_rows)
+    await db.commit()
+
+    return data
+
+
+def workload(data, ops):
+    sources = data.rng.choices(list(WEIGHTS), weights=list(WEIGHTS.values()), k=ops)
+    for source in sources:
+        sql, names = data.rng.choice(QUERIES[source])
+        yield source, sql, data.params(names)
+
+
+async def replay(db, queue, timers):
+    while queue:
+        source, sql, values = queue.pop()
+        start = time.perf_counter()
+
+        if sql.startswith("SELECT"):
+            await db.records(sql, *values)
+        else:
+            await db.execute(sql, *values)
+
+        timers[source].samples.append(time.perf_counter() - start)
+
+
+def report(name, timer):
+    print(
+        f" • {name}: {len(timer.samples):,} ops"
+        f" (p50: {timer.percentile(50) * 1e3:,.2f} ms,"
+        f" p99: {timer.percentile(99) * 1e3:,.2f} ms,"
+        f" p99.9: {timer.percentile(99.9) * 1e3:,.2f} ms,"
+        f" max: {max(timer.samples, default=0.0) * 1e3:,.2f} ms)"
+    )
+
+
+async def run(guilds, tags, warns, entrants, ops, concurrency, seed):
+    bot = BenchBot()
+    await bot.db.connect()
+
+    print(f"Seeding {guilds:,} guilds ({tags:,} tags, {warns:,} warns, and {entrants:,} entrants each)...")
+    start = time.perf_counter()
+    data = await seed_database(bot.db, guilds, tags, warns, entrants, seed)
+    print(f" Seeded in {time.perf_counter() - start:,.2f} s.")
+    bot.db.stats.reset()
+
+    print(f"Replaying {ops:,} queries with {concurrency:,} concurrent task(s)...")
+    queue = list(workload(data, ops))
+    timers = {source: Timer() for source in WEIGHTS}
+
+    start = time.perf_counter()
+    await asyncio.gather(*(replay(bot.db, queue, timers) for _ in range(concurrency)))
+    await bot.db.flush()
+    elapsed = time.perf_counter() - start
+
+    print(f" Throughput: {ops / elapsed:,.0f} queries/s ({elapsed:,.2f} s).")
+    everything = Timer()
+    for source, timer in timers.items():
+        report(source, timer)
+        everything.samples.extend(timer.samples)
+    report("all", everything)
+
+    print("Slowest statements by total time:")
+    for stats in bot.db.stats.top(5, "time"):
+        print(
+            f" • {stats.time * 1e3:,.1f} ms over {stats.calls:,} call(s)"
+            f" (p99: {stats.p99 * 1e3:,.2f} ms): {stats.template}"
+        )
+
+    pool = bot.db.readers.metrics
+    print(
+        f"Reader pool: {pool['acquisitions']:,} acquisitions"
+        f" (mean wait: {pool['wait_mean'] * 1e3:,.3f} ms, max wait: {pool['wait_max'] * 1e3:,.3f} ms)."
+    )
+
+    await bot.db.close()
+    bot.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guilds", type=int, default=1_000)
+    parser.add_argument("--tags", type=int, default=50, help="tags per guild")
+    parser.add_argument("--warns", type=int, default=50, help="warns per guild")
+    parser.add_argument("--entrants", type=int, default=5, help="entrants per guild")
+    parser.add_argument("--ops", type=int, default=50_000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(run(args.guilds, args.tags, args.warns, args.entrants, args.ops, args.concurrency, args.seed))
+
+
+if __name__ == "__main__":
+    main()
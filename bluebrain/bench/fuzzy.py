@@ -0,0 +1,128 @@
+# Blue Brain - A Discord bot designed to make your server a safer and better place.
+# Copyright (C) 2020  Sarker Istiyak Mahmud
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Sarker Istiyak Mahmud
+# kiyotaka.ayanokouji.ehou@gmail.com
+
+"""Checks that `SearchIndex` ranks names exactly as the original `Match` scorer does, and measures how much faster it is.
+
+Usage: python -m bluebrain.bench.fuzzy [--names N] [--terms N] [--limit N]
+
+Every ranking is compared against the reference, with and without NumPy if it is installed. Any difference is
+reported and fails the run."""
+
+import argparse
+import random
+import sys
+from string import ascii_letters, digits
+
+from bluebrain.bench import Timer, report
+from bluebrain.utils import search
+from bluebrain.utils.search import Match, SearchIndex
+
+# Names and terms picked to cover ties, case, repeated letters, terms longer than names, and lowercasing that changes
+# a name's length.
+GOLDEN_NAMES = (
+    "Kiyotaka", "kiyo", "Ayanokouji", "ayanokoji", "KIYOTAKA_57", "Horikita", "Suzune", "Kushida", "kikyou",
+    "Ichinose", "Honami", "Ryuuen", "Kakeru", "Sakayanagi", "Arisu", "Karuizawa", "Kei", "aaaa", "abab", "baba",
+    "Blue Brain", "blue", "brain", "bluebrain", "İstanbul", "straße", "ǅemal", "",
+)
+GOLDEN_TERMS = ("kiyo", "KIYOTAKA", "ayano", "kei", "aa", "ab", "blue brain", "brain", "i", "ist", "sse", "dž", "zzz")
+
+NAME_CHARS = ascii_letters + digits + "_."
+
+
+def names(count, rng):
+    return ["".join(rng.choices(NAME_CHARS, k=rng.randint(2, 32))) for _ in range(count)]
+
+
+def reference(term, comparisons, limit):
+    matches = [Match(term, c) for c in comparisons]
+    return [(m.comparison, m.strength) for m in sorted(matches, key=lambda m: m.strength, reverse=True)[:limit]]
+
+
+def ranked(term, index, limit):
+    return [(m.comparison, m.strength) for m in index.search(term).top(limit)]
+
+
+def check(label, comparisons, terms, limit, numpy_threshold):
+    index = SearchIndex(comparisons, numpy_threshold=numpy_threshold)
+    failures = 0
+
+    for term in terms:
+        if (expected := reference(term, comparisons, limit)) != (got := ranked(term, index, limit)):
+            failures += 1
+            print(f" ✗ [{label}] {term!r}: expected {expected!r}, got {got!r}")
+
+        best = index.search(term).best()
+        if (best.comparison, best.strength) != expected[0]:
+            failures += 1
+            print(f" ✗ [{label}] {term!r}: best was {best!r}")
+
+    print(f" {'✓' if not failures else '✗'} [{label}] {len(terms):,} term(s) over {len(comparisons):,} name(s).")
+    return failures
+
+
+def time_rankings(label, func, terms, limit):
+    timer = Timer()
+    for term in terms:
+        with timer:
+            func(term, limit)
+    report(label, len(terms), timer)
+    return timer
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--names", type=int, default=20_000)
+    parser.add_argument("--terms", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpus = names(args.names, rng)
+    terms = [rng.choice(corpus)[: rng.randint(2, 8)] for _ in range(args.terms)]
+    # Real lookups are often mistyped.
+    terms = [t[:-1] + rng.choice(NAME_CHARS) if i % 2 else t for i, t in enumerate(terms)]
+
+    thresholds = {"pure Python": float("inf")}
+    if search.numpy is not None:
+        thresholds["NumPy"] = 0
+    else:
+        print("NumPy is not installed, so only the pure Python path is checked.")
+
+    print("Checking rankings against the reference scorer...")
+    failures = 0
+    for label, threshold in thresholds.items():
+        failures += check(f"golden, {label}", GOLDEN_NAMES, GOLDEN_TERMS, len(GOLDEN_NAMES), threshold)
+        failures += check(f"random, {label}", corpus[:2_000], terms, args.limit, threshold)
+
+    print(f"Ranking the top {args.limit} of {args.names:,} names for {args.terms:,} terms...")
+    before = time_rankings("Before (Match per name)", lambda term, limit: reference(term, corpus, limit), terms, args.limit)
+    for label, threshold in thresholds.items():
+        with Timer() as build:
+            index = SearchIndex(corpus, numpy_threshold=threshold)
+        index.search(terms[0]).top(args.limit)
+        after = time_rankings(f"After ({label})", lambda term, limit: index.search(term).top(limit), terms, args.limit)
+        print(f"  Speed-up: {before.total / after.total:,.1f}x (index built in {build.total * 1e3:,.1f} ms)")
+
+    if failures:
+        sys.exit(f"{failures:,} ranking(s) differ from the reference.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# Blue Brain - A Discord bot designed to make your server a safer and better place.
+# Copyright (C) 2020  Sarker Istiyak Mahmud
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Sarker Istiyak Mahmud
+# kiyotaka.ayanokouji.ehou@gmail.com
+
+"""Measures how many guild message events per second the hub's message listener gets through.
+
+Each REST request is simulated with a sleep of `--latency` milliseconds, and counted.
+
+Usage: python -m bluebrain.bench.hub [--guilds N] [--events N] [--hub-share F] [--latency MS]"""
+
+import argparse
+import asyncio
+import random
+from types import SimpleNamespace
+
+from bluebrain import Config
+from bluebrain.bench import Timer, report, snowflakes
+from bluebrain.bot.extensions.hub import OWNER_ID, Hub
+from bluebrain.utils.resolver import EntityResolver
+
+
+class Rest:
+    def __init__(self, guilds, latency):
+        self.guilds = guilds
+        self.latency = latency
+        self.requests = 0
+
+    async def _request(self):
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+
+    async def fetch_guild(self, guild_id):
+        await self._request()
+        return self.guilds[guild_id]
+
+    async def fetch_channel(self, channel_id):
+        await self._request()
+        return next(g.channels[channel_id] for g in self.guilds.values() if channel_id in g.channels)
+
+
+class Cache:
+    def __init__(self, guilds):
+        self.guilds = guilds
+        self.channels = {c_id: c for g in guilds.values() for c_id, c in g.channels.items()}
+
+    def get_guild(self, guild_id):
+        return self.guilds.get(guild_id)
+
+    def get_guild_channel(self, channel_id):
+        return self.channels.get(channel_id)
+
+
+def guild(guild_id, channel_ids):
+    channels = {c_id: SimpleNamespace(id=c_id) for c_id in channel_ids}
+    return SimpleNamespace(id=guild_id, channels=channels, get_channel=channels.get)
+
+
+async def listener_before(bot, hub, event):
+    # How `Hub.on_guild_message_create` handled every message before the hub channels were resolved at startup.
+    hub.guild = await bot.rest.fetch_guild(Config.HUB_GUILD_ID)
+
+    if hub.guild is not None:
+        hub.commands_channel = hub.guild.get_channel(Config.HUB_COMMANDS_CHANNEL_ID)
+        hub.relay_channel = hub.guild.get_channel(Config.HUB_COMMANDS_CHANNEL_ID)
+        hub.stdout_channel = hub.guild.get_channel(Config.HUB_STDOUT_CHANNEL_ID)
+
+    server = await bot.rest.fetch_guild(event.guild_id)
+    channel = server.get_channel(event.channel_id)
+
+    if event.is_bot or not event.content:
+        return
+
+    if server == hub.guild and not event.is_bot and event.author_id == OWNER_ID:
+        if channel == hub.commands_channel:
+            if event.content.startswith("shutdown") or event.content.startswith("sd"):
+                await bot.close()
+
+
+def events(guilds, count, hub_share, seed=0):
+    rng = random.Random(seed)
+    hub_channels = (Config.HUB_COMMANDS_CHANNEL_ID, Config.HUB_RELAY_CHANNEL_ID, Config.HUB_STDOUT_CHANNEL_ID)
+    others = [g for g in guilds.values() if g.id != Config.HUB_GUILD_ID]
+    stream = []
+
+    for _ in range(count):
+        if rng.random() < hub_share:
+            guild_id, channel_id = Config.HUB_GUILD_ID, rng.choice(hub_channels)
+        else:
+            g = rng.choice(others)
+            guild_id, channel_id = g.id, rng.choice(list(g.channels))
+
+        stream.append(
+            SimpleNamespace(
+                guild_id=guild_id,
+                channel_id=channel_id,
+                author_id=rng.choice((OWNER_ID, rng.randrange(10 ** 17, 10 ** 18))),
+                is_bot=rng.random() < 0.1,
+                content=rng.choice(("", "hello", "sd later", "help")),
+            )
+        )
+
+    return stream
+
+
+async def run(guild_count, count, hub_share, latency):
+    ids = snowflakes(guild_count * 4)
+    guilds = {i: guild(i, ids[guild_count + n * 3 : guild_count + n * 3 + 3]) for n, i in enumerate(ids[:guild_count])}
+    guilds[Config.HUB_GUILD_ID] = guild(
+        Config.HUB_GUILD_ID,
+        (Config.HUB_COMMANDS_CHANNEL_ID, Config.HUB_RELAY_CHANNEL_ID, Config.HUB_STDOUT_CHANNEL_ID),
+    )
+
+    closes = []
+
+    async def close():
+        closes.append(None)
+
+    rest = Rest(guilds, latency / 1_000)
+    bot = SimpleNamespace(rest=rest, cache=Cache(guilds), close=close)
+    bot.resolver = EntityResolver(bot)
+    hub = Hub(bot)
+    stream = events(guilds, count, hub_share)
+
+    print(f"Handling {count:,} message events across {guild_count:,} guilds ({hub_share:.1%} in the hub)...")
+
+    before = Timer()
+    for event in stream:
+        with before:
+            await listener_before(bot, hub, event)
+    report("Before (REST per message)", count, before)
+    print(f"   {rest.requests:,} REST requests, {rest.requests / count:,.2f} per event; {len(closes):,} shutdowns")
+
+    rest.requests, closes[:] = 0, []
+    await hub.resolve()
+    after = Timer()
+    for event in stream:
+        with after:
+            await hub.on_guild_message_create(event)
+    report("After (resolved at startup)", count, after)
+    print(f"   {rest.requests:,} REST requests, {rest.requests / count:,.2f} per event; {len(closes):,} shutdowns")
+
+    print(f" Speed-up: {before.total / after.total:,.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guilds", type=int, default=1_000)
+    parser.add_argument("--events", type=int, default=20_000)
+    parser.add_argument("--hub-share", type=float, default=0.01)
+    parser.add_argument("--latency", type=float, default=0.0)
+    args = parser.parse_args()
+    asyncio.run(run(args.guilds, args.events, args.hub_share, args.latency))
+
+
+if __name__ == "__main__":
+    main()
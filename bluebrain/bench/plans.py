@@ -0,0 +1,82 @@
+# Blue Brain - A Discord bot designed to make your server a safer and better place.
+# Copyright (C) 2020  Sarker Istiyak Mahmud
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Sarker Istiyak Mahmud
+# kiyotaka.ayanokouji.ehou@gmail.com
+
+"""Checks that no hot query does a full table scan once every migration has been applied.
+
+Usage: python -m bluebrain.bench.plans
+
+Exits with a non-zero status if any query scans a table, so it can gate schema changes."""
+
+import sqlite3
+import sys
+import tempfile
+from pathlib import Path
+
+from bluebrain.bench import STATIC_DIR
+from bluebrain.bench.queries import QUERIES
+from bluebrain.db import migrations
+from bluebrain.db.tags import search_expression
+
+PARAMS = {
+    "guild": 1,
+    "user": 2,
+    "tag": "tag",
+    "content": "content",
+    "warn_type": "spam",
+    "warn_id": "0",
+    "points": 1,
+    "hash": "0" * 64,
+    "query": search_expression(1, "tag"),
+    "limit": 50,
+    "uses": 1,
+    "time": "2021-01-01 00:00:00",
+    "since": "-30 days",
+}
+
+
+def full_scans(cxn, sql, params):
+    plan = cxn.execute(f"EXPLAIN QUERY PLAN {sql}", [PARAMS[p] for p in params]).fetchall()
+    # A virtual table reports its own index lookups as scans.
+    return [detail for *_, detail in plan if detail.startswith("SCAN ") and "VIRTUAL TABLE INDEX" not in detail]
+
+
+def main():
+    failures = 0
+
+    with tempfile.TemporaryDirectory(prefix="bluebrain-plans-") as tmp:
+        cxn = sqlite3.connect(Path(tmp) / "database.db3", isolation_level=None)
+        migrations.apply(cxn, migrations.discover(STATIC_DIR / "migrations"))
+        print(f"Checking query plans at schema version {migrations.schema_version(cxn)}...")
+
+        for source, queries in QUERIES.items():
+            for sql, params in queries:
+                if scans := full_scans(cxn, sql, params):
+                    failures += 1
+                    print(f" ✗ [{source}] {sql}\n     {'; '.join(scans)}")
+                else:
+                    print(f" ✓ [{source}] {sql}")
+
+        cxn.close()
+
+    print(f"{failures:,} quer{'y' if failures == 1 else 'ies'} with full scans.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+# Blue Brain - A Discord bot designed to make your server a safer and better place.
+# Copyright (C) 2020  Sarker Istiyak Mahmud
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Sarker Istiyak Mahmud
+# kiyotaka.ayanokouji.ehou@gmail.com
+
+"""Measures how many guild messages per second can have their prefix resolved.
+
+Usage: python -m bluebrain.bench.prefix [--guilds N] [--messages N]"""
+
+import argparse
+import asyncio
+import random
+
+from bluebrain.bench import BenchBot, Timer, report, snowflakes
+from bluebrain.db import Prefixes
+
+PREFIXES = (">>", "!", "?", "bb.", "$")
+
+
+async def query_prefix(bot, guild_id):
+    # How `Blue_Bot.command_prefix` resolved prefixes before the in-memory table.
+    return await bot.db.field("SELECT Prefix FROM system WHERE GuildID = ?", guild_id)
+
+
+async def table_prefix(bot, guild_id):
+    return bot.prefixes.get(guild_id)
+
+
+async def run(guilds, messages):
+    bot = BenchBot()
+    bot.prefixes = Prefixes(bot)
+    await bot.db.connect()
+
+    rng = random.Random(0)
+    guild_ids = snowflakes(guilds)
+    await bot.db.executemany(
+        "INSERT INTO system (GuildID, Prefix) VALUES (?, ?)", [(g, rng.choice(PREFIXES)) for g in guild_ids]
+    )
+    await bot.db.commit()
+    stream = rng.choices(guild_ids, k=messages)
+
+    print(f"Resolving prefixes for {messages:,} messages across {guilds:,} guilds...")
+
+    before = Timer()
+    for guild_id in stream:
+        with before:
+            await query_prefix(bot, guild_id)
+    report("Before (SELECT per message)", messages, before)
+
+    await bot.prefixes.load()
+    after = Timer()
+    for guild_id in stream:
+        with after:
+            await table_prefix(bot, guild_id)
+    report("After (in-memory table)", messages, after)
+
+    print(f" Speed-up: {before.total / after.total:,.1f}x")
+
+    await bot.db.close()
+    bot.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guilds", type=int, default=10_000)
+    parser.add_argument("--messages", type=int, default=50_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.guilds, args.messages))
+
+
+if __name__ == "__main__":
+    main()
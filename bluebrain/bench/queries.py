@@ -0,0 +1,71 @@
+# Blue Brain - A Discord bot designed to make your server a safer and better place.
+# Copyright (C) 2020  Sarker Istiyak Mahmud
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Sarker Istiyak Mahmud
+# kiyotaka.ayanokouji.ehou@gmail.com
+
+"""The statements issued on hot paths, grouped by where they come from.
+
+Parameters are named rather than given values, so each harness can fill them in from its own data set. Keep this in
+step with the extensions when their queries change."""
+
+from bluebrain.db import blobs, settings, tags, transfer
+
+TAGS = (
+    (tags.LOAD_SQL, ("guild",)),
+    (tags.CONTENT_SQL, ("guild", "tag")),
+    (tags.DUPLICATE_SQL, ("hash", "guild", "guild", "content")),
+    ("SELECT UserID, TagID, TagTime FROM tags WHERE GuildID = ? AND TagName = ?", ("guild", "tag")),
+    (tags.SEARCH_SQL, ("query", "limit")),
+    (tags.STATS_FLUSH_SQL, ("guild", "tag", "uses", "time")),
+    (tags.TOP_SQL, ("guild", "limit")),
+    (tags.STALE_SQL, ("guild", "since", "limit")),
+    ("UPDATE tags SET ContentHash = ?, TagContent = NULL WHERE GuildID = ? AND TagName = ?", ("hash", "guild", "tag")),
+    (blobs.CONVERT_SQL, ("limit",)),
+    ("DELETE FROM tags WHERE GuildID = ? AND TagName = ?", ("guild", "tag")),
+    (transfer.EXPORT_SQL, ("guild",)),
+    (transfer.NAMES_SQL, ("guild",)),
+)
+
+WARN = (
+    ("SELECT WarnType, Points FROM warntypes WHERE GuildID = ?", ("guild",)),
+    ("SELECT WarnType FROM warntypes WHERE GuildID = ?", ("guild",)),
+    ("SELECT Points FROM warntypes WHERE GuildID = ? AND WarnType = ?", ("guild", "warn_type")),
+    ("SELECT WarnType, Points FROM warns WHERE GuildID = ? AND UserID = ?", ("guild", "user")),
+    (
+        "SELECT WarnID, ModID, WarnTime, WarnType, Points, Comment FROM warns WHERE GuildID = ? AND UserID = ? ORDER BY WarnTime DESC",
+        ("guild", "user"),
+    ),
+    ("UPDATE warns SET WarnType = ? WHERE GuildID = ? AND WarnType = ?", ("warn_type", "guild", "warn_type")),
+    (
+        "UPDATE warns SET Points = ? WHERE GuildID = ? AND WarnType = ? AND Points = ?",
+        ("points", "guild", "warn_type", "points"),
+    ),
+    ("DELETE FROM warns WHERE WarnID = ?", ("warn_id",)),
+    ("DELETE FROM warns WHERE GuildID = ? AND UserID = ?", ("guild", "user")),
+    ("DELETE FROM warns WHERE GuildID = ? AND WarnType = ?", ("guild", "warn_type")),
+)
+
+RETRIEVE = ((settings.LOAD_SQL, ("guild",)),)
+
+PREFIX = (("SELECT Prefix FROM system WHERE GuildID = ?", ("guild",)),)
+
+QUERIES = {
+    "tags": TAGS,
+    "warn": WARN,
+    "retrieve": RETRIEVE,
+    "prefix": PREFIX,
+}
@@ -0,0 +1,177 @@
+# Blue Brain - A Discord bot designed to make your server a safer and better place.
+# Copyright (C) 2020  Sarker Istiyak Mahmud
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Sarker Istiyak Mahmud
+# kiyotaka.ayanokouji.ehou@gmail.com
+
+"""Compares the similarity scorers in `bluebrain.utils.search` by accuracy and speed on realistic guild data.
+
+Usage: python -m bluebrain.bench.scorers [--members N] [--tags N [N ...]] [--queries N]
+
+Each corpus is searched with lookups made the way people make them: names cut short, mistyped, or in the wrong case.
+A lookup is accurate when the name it was made from ranks first (top-1) or in the first five (top-5)."""
+
+import argparse
+import random
+import re
+import time
+from pathlib import Path
+
+from bluebrain.bench import Timer
+from bluebrain.db.tags import MAX_SCORED_TAGS, SUGGESTION_SCORER
+from bluebrain.utils.search import SCORERS, SearchIndex
+
+EXTENSIONS_DIR = Path(__file__).resolve().parents[1] / "bot" / "extensions"
+COMMAND_NAME_REGEX = re.compile(r'name ?= ?"([a-z]+)"')
+
+ONSETS = ("", "b", "c", "d", "f", "g", "h", "j", "k", "l", "m", "n", "p", "r", "s", "t", "v", "w", "z", "ch", "sh", "th")
+VOWELS = ("a", "e", "i", "o", "u", "ai", "ou", "y")
+CODAS = ("", "", "", "n", "r", "s", "x", "k")
+
+# The scorer each call site uses today, marked in the report.
+IN_USE = {"members": "position", "tags": SUGGESTION_SCORER, "commands": "jaro_winkler"}
+
+
+def word(rng, syllables=None):
+    return "".join(
+        rng.choice(ONSETS) + rng.choice(VOWELS) + rng.choice(CODAS) for _ in range(syllables or rng.randint(1, 3))
+    )
+
+
+def member_name(rng):
+    style = rng.random()
+    if style < 0.3:
+        return f"{word(rng).title()}{rng.randint(1, 9999)}"
+    if style < 0.5:
+        return f"{word(rng)}_{word(rng)}"
+    if style < 0.6:
+        return f"xX{word(rng).title()}Xx"
+    if style < 0.8:
+        return f"{word(rng).title()} {word(rng).title()}"
+    return word(rng)
+
+
+def member_corpus(count, rng):
+    names = {member_name(rng) for _ in range(count)}
+    # About a third of members also have a nickname.
+    names |= {word(rng, 2).title() for _ in range(count // 3)}
+    return sorted(names)
+
+
+def tag_corpus(count, rng):
+    names = set()
+    while len(names) < count:
+        names.add((word(rng) + (word(rng) if rng.random() < 0.4 else ""))[:25])
+    return sorted(names)
+
+
+def command_corpus():
+    names = set()
+    for path in EXTENSIONS_DIR.glob("*.py"):
+        names.update(COMMAND_NAME_REGEX.findall(path.read_text(encoding="utf-8")))
+    return sorted(names)
+
+
+def mistype(name, rng):
+    if len(name) < 2:
+        return name
+
+    i = rng.randrange(len(name) - 1)
+    kind = rng.randrange(4)
+    if kind == 0:
+        return name[:i] + name[i + 1] + name[i] + name[i + 2 :]
+    if kind == 1:
+        return name[:i] + name[i + 1 :]
+    if kind == 2:
+        return name[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + name[i + 1 :]
+    return name[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + name[i:]
+
+
+def lookups(corpus, count, rng):
+    for _ in range(count):
+        target = rng.choice(corpus)
+        style = rng.randrange(3)
+        if style == 0:
+            term = target[: max(2, round(len(target) * rng.uniform(0.4, 0.8)))]
+        elif style == 1:
+            term = mistype(target, rng)
+        else:
+            term = "".join(c.upper() if rng.random() < 0.5 else c.lower() for c in target)
+        yield term, target
+
+
+def measure(corpus, queries):
+    results = {}
+
+    for name, scorer in SCORERS.items():
+        start = time.perf_counter()
+        index = SearchIndex(corpus, scorer=scorer)
+        build = time.perf_counter() - start
+
+        timer = Timer()
+        top1 = top5 = 0
+        for term, target in queries:
+            with timer:
+                top = index.top(term, 5)
+            ranked = [index.comparisons[i] for _, i in top]
+            top1 += bool(ranked) and ranked[0] == target
+            top5 += target in ranked
+
+        results[name] = (top1 / len(queries), top5 / len(queries), timer, build)
+
+    return results
+
+
+def in_use(label, corpus):
+    # Guilds with too many tags to score are given prefix suggestions.
+    if label == "tags" and len(corpus) > MAX_SCORED_TAGS:
+        return "prefix"
+    return IN_USE.get(label)
+
+
+def report(label, corpus, queries, results):
+    print(f"{label.title()} ({len(corpus):,} names, {len(queries):,} lookups):")
+    for name, (top1, top5, timer, build) in sorted(results.items(), key=lambda item: -item[1][0]):
+        marker = " (in use)" if in_use(label, corpus) == name else ""
+        print(
+            f" • {name}{marker}: top-1 {top1:.1%}, top-5 {top5:.1%},"
+            f" {timer.rate(len(queries)):,.0f} lookups/s (p99: {timer.percentile(99) * 1e6:,.0f} µs),"
+            f" index built in {build * 1e3:,.1f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=5_000)
+    parser.add_argument("--tags", type=int, nargs="+", default=[500, 2_000, 10_000])
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    corpora = [
+        ("members", member_corpus(args.members, rng)),
+        *(("tags", tag_corpus(count, rng)) for count in args.tags),
+        ("commands", command_corpus()),
+    ]
+
+    for label, corpus in corpora:
+        queries = list(lookups(corpus, args.queries, rng))
+        report(label, corpus, queries, measure(corpus, queries))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# Blue Brain - A Discord bot designed to make your server a safer and better place.
+# Copyright (C) 2020  Sarker Istiyak Mahmud
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Sarker Istiyak Mahmud
+# kiyotaka.ayanokouji.ehou@gmail.com
+
+"""Measures how name matching in `bluebrain.utils.search` and `bluebrain.utils.converters` scales with corpus size.
+
+Usage: python -m bluebrain.bench.search [--sizes N,N,...] [--ops N] [--seconds S] [--json PATH]
+
+Member and tag name corpora are generated at each size. Every operation is timed for up to `--ops` calls or
+`--seconds` seconds, whichever comes first, and its peak memory is traced in a separate pass. `--json` also writes every
+result to a file, so runs can be diffed between versions."""
+
+import argparse
+import json
+import platform
+import random
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from bluebrain.bench import Timer
+from bluebrain.bench.scorers import member_corpus, mistype, tag_corpus
+from bluebrain.utils import converters, search
+from bluebrain.utils.search import Search, SearchIndex
+
+DEFAULT_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000)
+# How many calls each operation's memory is traced over.
+TRACED_OPS = 3
+
+
+def corpora(size, rng):
+    members = member_corpus(size, rng)[:size]
+    return {
+        "members": [SimpleNamespace(id=i, username=name) for i, name in enumerate(members)],
+        "tags": [SimpleNamespace(id=i, username=name) for i, name in enumerate(tag_corpus(size, rng))],
+    }
+
+
+def operations(entries, index, rng):
+    """Yields each operation's name, and a function making one call to it."""
+    names = [entry.username for entry in entries]
+
+    def term():
+        return mistype(rng.choice(names), rng)
+
+    yield "SearchIndex", lambda: SearchIndex(names)
+    yield "Search.best", lambda: Search(term(), index).best()
+    yield "Search.top", lambda: Search(term(), index).top(5)
+    yield "converters.get", lambda: converters.get(entries, username=rng.choice(names))
+    yield "converters.find", lambda: converters.find(lambda e, name=rng.choice(names): e.username == name, entries)
+
+
+def time_operation(func, ops, seconds):
+    timer = Timer()
+    deadline = time.perf_counter() + seconds
+
+    while len(timer.samples) < ops and (not timer.samples or time.perf_counter() < deadline):
+        with timer:
+            func()
+
+    return timer
+
+
+def trace_operation(func):
+    tracemalloc.start()
+    try:
+        for _ in range(TRACED_OPS):
+            func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def index_size(names):
+    # What a prepared index holds on to, once it has been built.
+    tracemalloc.start()
+    try:
+        index = SearchIndex(names)
+        return index, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def run(sizes, ops, seconds, seed):
+    rng = random.Random(seed)
+    results = []
+
+    for size in sizes:
+        for corpus, entries in corpora(size, rng).items():
+            index, retained = index_size([entry.username for entry in entries])
+            print(f"{corpus.title()} ({len(entries):,} names; index holds {retained / 1024 ** 2:,.1f} MiB):")
+
+            for name, func in operations(entries, index, rng):
+                timer = time_operation(func, ops, seconds)
+                peak = trace_operation(func)
+                result = {
+                    "corpus": corpus,
+                    "size": len(entries),
+                    "operation": name,
+                    "ops": len(timer.samples),
+                    "ops_per_sec": timer.rate(len(timer.samples)),
+                    "p50_us": timer.percentile(50) * 1e6,
+                    "p99_us": timer.percentile(99) * 1e6,
+                    "peak_bytes": peak,
+                    "index_bytes": retained,
+                }
+                results.append(result)
+                print(
+                    f" • {name}: {result['ops_per_sec']:,.1f} ops/s"
+                    f" (p50: {result['p50_us']:,.1f} µs, p99: {result['p99_us']:,.1f} µs,"
+                    f" peak: {peak / 1024:,.0f} KiB)"
+                )
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        type=lambda arg: [int(size) for size in arg.split(",")],
+        default=DEFAULT_SIZES,
+        help="comma separated corpus sizes",
+    )
+    parser.add_argument("--ops", type=int, default=200, help="most calls timed per operation")
+    parser.add_argument("--seconds", type=float, default=2.0, help="most time spent timing each operation")
+    parser.add_argument("--json", help="also write results to this file")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.ops, args.seconds, args.seed)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "numpy": search.numpy is not None,
+                    "seed": args.seed,
+                    "results": results,
+                },
+                f,
+                indent=2,
+            )
+        print(f"Wrote {len(results):,} result(s) to {args.json}.")
+
+
+if __name__ == "__main__":
+    main()
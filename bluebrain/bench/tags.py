@@ -0,0 +1,142 @@
+# Blue Brain - A Discord bot designed to make your server a safer and better place.
+# Copyright (C) 2020  Sarker Istiyak Mahmud
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Sarker Istiyak Mahmud
+# kiyotaka.ayanokouji.ehou@gmail.com
+
+"""Measures moving tags into blob storage, `tags list`, and `tags search`, for a guild with many tags.
+
+Usage: python -m bluebrain.bench.tags [--tags N] [--pages N] [--runs N] [--searches N]"""
+
+import argparse
+import asyncio
+
+from bluebrain.bench import BenchBot, Timer, snowflakes
+from bluebrain.db import TagContents, TagIndex
+from bluebrain.db.tags import CONTENT_SQL, SEARCH_SQL, search_expression
+
+GUILD_ID = 1
+WORDS = ("python", "discord", "rules", "welcome", "moderation", "giveaway", "music", "roles", "faq", "events")
+
+
+async def query_pages(bot):
+    # How `tags list` built its pages before they were loaded lazily: every page, up front, one query per tag.
+    names = await bot.db.column("SELECT TagName FROM tags WHERE GuildID = ?", GUILD_ID)
+    pages = []
+    for tag_name in sorted(names):
+        content, tag_id = await bot.db.record(
+            "SELECT TagContent, TagID FROM tag_contents WHERE GuildID = ? AND TagName = ?", GUILD_ID, tag_name
+        )
+        pages.append((tag_name, tag_id, content[:350]))
+    return pages
+
+
+async def lazy_page(bot, records, page):
+    tag_name, tag_id = records[page]
+    content = await bot.db.field(CONTENT_SQL, GUILD_ID, tag_name) or ""
+    return tag_name, tag_id, content[:350]
+
+
+async def index_records(bot):
+    tags = await bot.tag_index.guild(GUILD_ID)
+    return tags, [(tag_name, tags.get(tag_name).tag_id) for tag_name in tags]
+
+
+def report(name, timer):
+    print(f" • {name}: p50 {timer.percentile(50) * 1e3:,.2f} ms, p99 {timer.percentile(99) * 1e3:,.2f} ms")
+
+
+async def run(tag_count, pages, runs, searches):
+    bot = BenchBot()
+    bot.tag_index = TagIndex(bot)
+    await bot.db.connect()
+
+    users = snowflakes(50)
+    await bot.db.executemany(
+        "INSERT INTO tags (GuildID, UserID, TagID, TagName, TagContent) VALUES (?, ?, ?, ?, ?)",
+        [
+            (GUILD_ID, users[i % len(users)], str(i), f"tag{i:06}", f"Content of tag {i} about {WORDS[i % len(WORDS)]}. " * 40)
+            for i in range(tag_count)
+        ],
+    )
+    await bot.db.commit()
+
+    print(f"Moving {tag_count:,} tags into blob storage...")
+    conversion = Timer()
+    with conversion:
+        await TagContents(bot).convert()
+    blobs, size, stored = await bot.db.record("SELECT COUNT(*), SUM(Size), SUM(length(Content)) FROM tag_blobs")
+    print(
+        f" • Converted in {conversion.total:,.2f} s ({conversion.rate(tag_count):,.0f} tags/s),"
+        f" {blobs:,} distinct bodies, {size / 1024:,.0f} KiB stored as {stored / 1024:,.0f} KiB"
+    )
+
+    print(f"Showing `tags list` for a guild with {tag_count:,} tags ({runs:,} run(s))...")
+
+    before = Timer()
+    for _ in range(runs):
+        with before:
+            await query_pages(bot)
+    report("Before, first page (every page built up front)", before)
+
+    cold = Timer()
+    for _ in range(runs):
+        bot.tag_index.invalidate(GUILD_ID)
+        with cold:
+            tags, records = await index_records(bot)
+            await lazy_page(bot, records, 0)
+    report("After, first page (tag index not loaded)", cold)
+
+    warm = Timer()
+    for _ in range(runs):
+        with warm:
+            tags, records = await index_records(bot)
+            await lazy_page(bot, records, 0)
+    report("After, first page (tag index loaded)", warm)
+
+    turns = Timer()
+    for page in range(1, min(pages, tag_count)):
+        with turns:
+            await lazy_page(bot, records, page)
+    report(f"After, turning a page ({max(0, min(pages, tag_count) - 1):,} pages)", turns)
+
+    print(f" Speed-up to first page: {before.median / cold.median:,.1f}x (cold), {before.median / warm.median:,.1f}x (warm)")
+
+    print(f"Running `tags search` {searches:,} time(s)...")
+    search = Timer()
+    for i in range(searches):
+        # Alternate between words that match a tenth of the guild's tags, and unfinished words matched as prefixes.
+        word = WORDS[i % len(WORDS)]
+        with search:
+            await bot.db.records(SEARCH_SQL, search_expression(GUILD_ID, word if i % 2 else word[:3]), 50)
+    report("Search, top 50 results", search)
+
+    await bot.db.close()
+    bot.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tags", type=int, default=10_000)
+    parser.add_argument("--pages", type=int, default=100, help="pages to turn through after the first")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--searches", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args.tags, args.pages, args.runs, args.searches))
+
+
+if __name__ == "__main__":
+    main()
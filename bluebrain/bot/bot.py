@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import time
 from pathlib import Path
 
@@ -9,9 +10,7 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from pytz import utc
 
 from bluebrain import Config, utils
-from bluebrain.db import Database
-
-EMOJI_GUILD = None
+from bluebrain.db import Database, GuildSettings, Prefixes, TagContents, TagIndex, TagStats, TagTransfer
 
 class Blue_Bot(lightbulb.Bot):
 
@@ -23,9 +22,19 @@ class Blue_Bot(lightbulb.Bot):
         self.scheduler = AsyncIOScheduler()
         self.scheduler.configure(timezone=utc)
         self.db = Database(self)
+        self.settings = GuildSettings(self)
+        self.prefixes = Prefixes(self)
+        self.tag_index = TagIndex(self)
+        self.tag_contents = TagContents(self)
+        self.tag_stats = TagStats(self)
+        self.tag_transfer = TagTransfer(self)
 
         self.embed = utils.EmbedConstructor(self)
-        #self.emoji = utils.EmojiGetter(self)
+        self.members = utils.MemberIndex(self)
+        self.resolver = utils.EntityResolver(self)
+        self.bans = utils.BanIndex(self)
+        self.commands_registry = utils.CommandRegistry(self)
+        self.emoji = utils.EmojiRegistry(self)
         self.loc = utils.CodeCounter()
         self.presence = utils.PresenceSetter(self)
         self.ready = utils.Ready(self)
@@ -45,6 +54,12 @@ class Blue_Bot(lightbulb.Bot):
         self.event_manager.subscribe(hikari.StartingEvent, self.on_starting)
         self.event_manager.subscribe(hikari.StartedEvent, self.on_started)
         self.event_manager.subscribe(hikari.StoppingEvent, self.on_stopping)
+        self.event_manager.subscribe(hikari.MemberCreateEvent, self.members.on_member_create)
+        self.event_manager.subscribe(hikari.MemberUpdateEvent, self.members.on_member_update)
+        self.event_manager.subscribe(hikari.MemberDeleteEvent, self.members.on_member_delete)
+        self.event_manager.subscribe(hikari.BanCreateEvent, self.bans.on_ban_create)
+        self.event_manager.subscribe(hikari.BanDeleteEvent, self.bans.on_ban_delete)
+        self.event_manager.subscribe(hikari.EmojisUpdateEvent, self.emoji.on_emojis_update)
         #self.event_manager.subscribe(hikari.ExceptionEvent, self.on_error)
         
         super().run(
@@ -66,15 +81,22 @@ class Blue_Bot(lightbulb.Bot):
     #    print(" Connected to database.")
 
 
+    def add_plugin(self, plugin) -> None:
+        super().add_plugin(plugin)
+        self.commands_registry.refresh()
+
+
+    def remove_plugin(self, name) -> None:
+        super().remove_plugin(name)
+        self.commands_registry.refresh()
+
+
     async def prefix(self, guild_id):
-        if guild_id is not None:
-            return await self.db.field("SELECT Prefix FROM system WHERE GuildID = ?", guild_id)
-        return Config.DEFAULT_PREFIX
+        return self.prefixes.get(guild_id)
 
 
     async def command_prefix(self, _: lightbulb.Bot, message: hikari.Message) -> None:
-        prefix = await self.prefix(message.guild_id)
-        return prefix
+        return self.prefixes.get(message.guild_id)
 
 
     async def on_starting(self, event: hikari.StartingEvent) -> None:
@@ -84,8 +106,9 @@ class Blue_Bot(lightbulb.Bot):
             self.load_extension(f"bluebrain.bot.extensions.{ext}")
             print(f" • {ext} extension loaded")
 
-        self.emoji_guild = await self.rest.fetch_guild(Config.HUB_GUILD_ID)
-        
+        await self.emoji.load()
+        print(f" • {len(self.emoji):,} hub emoji loaded")
+
         print("Setup complete.")
 
 
@@ -101,7 +124,7 @@ class Blue_Bot(lightbulb.Bot):
 
             print(" Connecting to Database...")
             await self.db.connect()
-            print(" Connected to database.")
+            print(f" Connected to database (schema version {self.db.schema_version}).")
 
             print(" Readied.")
             self.client_id = self.get_me().id
@@ -109,9 +132,17 @@ class Blue_Bot(lightbulb.Bot):
             self.scheduler.start()
             print(f" Scheduler started ({len(self.scheduler.get_jobs()):,} job(s)).")
 
-            await self.db.sync()
+            timings = await self.db.sync()
             self.ready.synced = True
-            print(" Synchronised database.")
+            print(
+                f" Synchronised database ({sum(timings.values()) * 1_000:,.0f} ms;"
+                f" {', '.join(f'{phase}: {latency * 1_000:,.1f} ms' for phase, latency in timings.items())})."
+            )
+
+            await self.prefixes.load()
+            print(f" Loaded prefixes ({len(self.prefixes):,} guild(s)).")
+
+            self.tag_conversion = asyncio.create_task(self.convert_tag_contents())
 
             self.ready.booted = True
             print(" Bot booted. Don't use CTRL+C to shut the bot down!")
@@ -122,6 +153,12 @@ class Blue_Bot(lightbulb.Bot):
         print("Bot Ready!")
 
 
+    async def convert_tag_contents(self) -> None:
+        # Tags created before blob storage are moved over in the background, so booting doesn't wait on it.
+        if converted := await self.tag_contents.convert():
+            print(f" Moved {converted:,} tag(s) to blob storage.")
+
+
     async def on_stopping(self, event: hikari.StoppingEvent) -> None:
 
         print("Shutting down...")
@@ -129,6 +166,11 @@ class Blue_Bot(lightbulb.Bot):
         self.scheduler.shutdown()
         print(" Shut down scheduler.")
 
+        if (conversion := getattr(self, "tag_conversion", None)) is not None:
+            conversion.cancel()
+
+        await self.tag_stats.flush()
+
         await self.db.close()
         print(" Closed database connection.")
 
@@ -183,37 +225,25 @@ class Blue_Bot(lightbulb.Bot):
 
     @property
     def info(self):
-        #emoji = await self.rest.fetch_guild(Config.HUB_GUILD_ID)
-        return self.emoji_guild.get_emoji(796345797112365107).mention
+        return self.emoji.mention("info")
 
     @property
     def tick(self):
-        #emoji = await self.rest.fetch_guild(Config.HUB_GUILD_ID)
-        return self.emoji_guild.get_emoji(832160810738253834).mention
+        return self.emoji.mention("confirm")
 
     @property
     def cross(self):
-        #emoji = await self.rest.fetch_guild(Config.HUB_GUILD_ID)
-        return self.emoji_guild.get_emoji(832160894079074335).mention
+        return self.emoji.mention("cancel")
 
     @staticmethod
     def generate_id():
         return hex(int(time.time() * 1e7))[2:]
 
     async def grab_user(self, arg):
-        try:
-            return await self.rest.fetch_user(arg)
-        except (ValueError, hikari.NotFoundError):
-            return None
+        return await self.resolver.user(arg)
 
     async def grab_channel(self, arg):
-        try:
-            return await self.rest.fetch_channel(arg)
-        except (ValueError, hikari.NotFoundError):
-            return None
+        return await self.resolver.channel(arg)
 
     async def grab_guild(self, arg):
-        try:
-            return await self.rest.fetch_guild(arg)
-        except (ValueError, hikari.NotFoundError):
-            return None
+        return await self.resolver.guild(arg)
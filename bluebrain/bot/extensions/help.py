@@ -4,11 +4,14 @@ import lightbulb
 import typing as t
 import datetime as dt
 
-from collections import defaultdict
-
 from bluebrain.bot import Blue_Bot
 
 from bluebrain.utils import checks, chron, converters, menu, modules, string
+from bluebrain.utils.search import Search
+
+# How command names are matched when suggesting one for a name that doesn't exist.
+COMMAND_SCORER = "jaro_winkler"
+COMMAND_MIN_ACCURACY = 0.8
 
 
 class HelpMenu(menu.MultiPageMenu):
@@ -108,17 +111,12 @@ class Help(lightbulb.Plugin):
         #    return "No - Solaris is not configured properly"
 
     async def get_command_mapping(self, ctx):
-        mapping = defaultdict(list)
-        plugins = []
-
-        for extension in self.bot._extensions:
-            if extension.__doc__ is not None:
-                for cmd in self.bot.get_plugin(extension.title()).walk_commands():
-                    if (self.bot.get_plugin(extension.title()).__doc__) is not None:
-                    #if (lightbulb.help.get_help_text(self.bot.get_command(cmd.name))) is not None:
-                        mapping[extension].append(cmd)
-
-        return mapping
+        # Straight from the registry, which groups commands by plugin whenever extensions are loaded or unloaded.
+        return {
+            name: cmds
+            for name, (plugin, cmds) in self.bot.commands_registry.plugins.items()
+            if cmds and plugin.__doc__ is not None
+        }
 
     @lightbulb.check(lightbulb.guild_only)
     @lightbulb.command(
@@ -131,6 +129,10 @@ class Help(lightbulb.Plugin):
         if isinstance(cmd, str):
             await ctx.respond(f"{self.bot.cross} Solaris has no commands or aliases with that name.")
 
+            names = self.bot.commands_registry.names
+            if names and (match := Search(cmd, names, scorer=COMMAND_SCORER).best(COMMAND_MIN_ACCURACY)) is not None:
+                await ctx.respond(f"Did you mean `{match}`?")
+
         elif isinstance(cmd, lightbulb.commands.Command):
             if cmd.name == "config":
                 await ConfigHelpMenu(ctx).start()
@@ -5,41 +5,48 @@ from hikari import events
 from bluebrain import Config
 from bluebrain.bot import Blue_Bot
 
+OWNER_ID = 714022418200657971
+# The only channels whose messages the hub acts on. Channel IDs are unique across guilds, so these alone identify them.
+HUB_CHANNEL_IDS = frozenset((Config.HUB_COMMANDS_CHANNEL_ID, Config.HUB_RELAY_CHANNEL_ID))
+
 class Hub(lightbulb.Plugin):
     def __init__(self, bot: Blue_Bot) -> None:
         self.bot = bot
+        self.guild = None
+        self.commands_channel = None
+        self.relay_channel = None
+        self.stdout_channel = None
         super().__init__()
 
+    async def resolve(self) -> None:
+        # Done once; the gateway cache answers these unless the hub hasn't arrived in it yet.
+        self.guild = await self.bot.resolver.guild(Config.HUB_GUILD_ID)
+        self.commands_channel = await self.bot.resolver.channel(Config.HUB_COMMANDS_CHANNEL_ID)
+        self.relay_channel = await self.bot.resolver.channel(Config.HUB_RELAY_CHANNEL_ID)
+        self.stdout_channel = await self.bot.resolver.channel(Config.HUB_STDOUT_CHANNEL_ID)
+
     @lightbulb.plugins.listener()
     async def on_started(self, event: hikari.StartedEvent) -> None:
         if not self.bot.ready.booted:
             self.bot.ready.up(self)
-            
-        self.guild = await self.bot.rest.fetch_guild(Config.HUB_GUILD_ID)
 
-        if self.guild is not None:
-            self.commands_channel = self.guild.get_channel(Config.HUB_COMMANDS_CHANNEL_ID)
-            self.relay_channel = self.guild.get_channel(Config.HUB_COMMANDS_CHANNEL_ID)
-            self.stdout_channel = self.guild.get_channel(Config.HUB_STDOUT_CHANNEL_ID)
+        await self.resolve()
 
-            if self.stdout_channel is not None:
-                await self.stdout_channel.send(
-                    f"{self.bot.info} Blue Brain is now online! (Version {self.bot.version})"
-                )
+        if self.stdout_channel is not None:
+            await self.stdout_channel.send(
+                f"{self.bot.info} Blue Brain is now online! (Version {self.bot.version})"
+            )
 
 
     @lightbulb.plugins.listener()
     async def on_guild_join(self, event: events.GuildJoinEvent) -> None:
-        self.guild = await self.bot.rest.fetch_guild(Config.HUB_GUILD_ID)
-
-        if self.guild is not None:
-            self.stdout_channel = self.guild.get_channel(Config.HUB_STDOUT_CHANNEL_ID)
-
         guild_name = str(event.guild)
 
         await self.bot.db.execute("INSERT OR IGNORE INTO system (GuildName, GuildID) VALUES (?, ?)", guild_name, event.guild_id,)
         await self.bot.db.execute("INSERT OR IGNORE INTO gateway (GuildID) VALUES (?)", event.guild_id,)
         await self.bot.db.execute("INSERT OR IGNORE INTO warn (GuildID) VALUES (?)", event.guild_id,)
+        self.bot.settings.invalidate(event.guild_id)
+        await self.bot.prefixes.refresh(event.guild_id)
 
         if self.stdout_channel is not None:
             await self.stdout_channel.send(
@@ -49,16 +56,17 @@ class Hub(lightbulb.Plugin):
 
     @lightbulb.plugins.listener()
     async def on_guild_leave(self, event: events.GuildLeaveEvent) -> None:
-        self.guild = await self.bot.rest.fetch_guild(Config.HUB_GUILD_ID)
-
-        if self.guild is not None:
-            self.stdout_channel = self.guild.get_channel(Config.HUB_STDOUT_CHANNEL_ID)
-
         guild_name = await self.bot.db.record("SELECT GuildName FROM system WHERE GuildID = ?", event.guild_id)
 
-        await self.bot.db.execute("DELETE FROM system WHERE GuildID = ?", event.guild_id)
-        await self.bot.db.execute("DELETE FROM gateway WHERE GuildID = ?", event.guild_id)
-        await self.bot.db.execute("DELETE FROM warn WHERE GuildID = ?", event.guild_id)
+        async with self.bot.db.transaction():
+            await self.bot.db.execute("DELETE FROM system WHERE GuildID = ?", event.guild_id)
+            await self.bot.db.execute("DELETE FROM gateway WHERE GuildID = ?", event.guild_id)
+            await self.bot.db.execute("DELETE FROM warn WHERE GuildID = ?", event.guild_id)
+        self.bot.settings.invalidate(event.guild_id)
+        self.bot.prefixes.remove(event.guild_id)
+        self.bot.tag_index.invalidate(event.guild_id)
+        self.bot.members.invalidate(event.guild_id)
+        self.bot.bans.invalidate(event.guild_id)
 
         if self.stdout_channel is not None:
             await self.stdout_channel.send(
@@ -68,25 +76,16 @@ class Hub(lightbulb.Plugin):
 
     @lightbulb.plugins.listener()
     async def on_guild_message_create(self, event: events.GuildMessageCreateEvent) -> None:
-        self.guild = await self.bot.rest.fetch_guild(Config.HUB_GUILD_ID)
-
-        if self.guild is not None:
-            self.commands_channel = self.guild.get_channel(Config.HUB_COMMANDS_CHANNEL_ID)
-            self.relay_channel = self.guild.get_channel(Config.HUB_COMMANDS_CHANNEL_ID)
-            self.stdout_channel = self.guild.get_channel(Config.HUB_STDOUT_CHANNEL_ID)
-
-        server = await self.bot.rest.fetch_guild(event.guild_id)
-        channel = server.get_channel(event.channel_id)
-
-        if event.is_bot or not event.content:
+        # Every message the bot can see comes through here, so anything outside the hub is turned away first.
+        if event.channel_id not in HUB_CHANNEL_IDS or event.is_bot or not event.content:
             return
-        
-        if server == self.guild and not event.is_bot and event.author_id == 714022418200657971:
-            if channel == self.commands_channel:
+
+        if event.author_id == OWNER_ID:
+            if event.channel_id == Config.HUB_COMMANDS_CHANNEL_ID:
                 if event.content.startswith("shutdown") or event.content.startswith("sd"):
                     await self.bot.close()
 
-            elif channel == self.relay_channel:
+            elif event.channel_id == Config.HUB_RELAY_CHANNEL_ID:
                 # TODO: Add relay system.
                 pass
 
@@ -65,11 +65,11 @@ class SetupMenu(menu.SelectionMenu):
                     topic=f"Log output for {self.ctx.bot.get_me().mention}",
                     reason="Needed for Solaris log output.",
                 )
-                await self.bot.db.execute(
-                    "UPDATE system SET DefaultLogChannelID = ?, LogChannelID = ? WHERE GuildID = ?",
-                    lc.id,
-                    lc.id,
+                await self.bot.settings.update(
                     self.ctx.get_guild().id,
+                    "system",
+                    DefaultLogChannelID=lc.id,
+                    LogChannelID=lc.id,
                 )
                 await lc.send(f"{self.bot.tick} The log channel has been created and set to {lc.mention}.")
             else:
@@ -96,11 +96,11 @@ class SetupMenu(menu.SelectionMenu):
                     permissions=hikari.Permissions(value=0),
                     reason="Needed for Solaris configuration.",
                 )
-                await self.bot.db.execute(
-                    "UPDATE system SET DefaultAdminRoleID = ?, AdminRoleID = ? WHERE GuildID = ?",
-                    ar.id,
-                    ar.id,
+                await self.bot.settings.update(
                     self.ctx.get_guild().id,
+                    "system",
+                    DefaultAdminRoleID=ar.id,
+                    AdminRoleID=ar.id,
                 )
                 await lc.send(f"{self.bot.tick} The admin role has been created and set to {ar.mention}.")
             else:
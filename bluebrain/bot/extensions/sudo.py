@@ -22,6 +22,65 @@ class Sudo(lightbulb.Plugin):
         await ctx.bot.close()
 
 
+    @lightbulb.check(lightbulb.owner_only)
+    @lightbulb.check(lightbulb.guild_only)
+    @lightbulb.command(name="dbstats")
+    async def dbstats_command(self, ctx: lightbulb.Context, sort_by: str = "time") -> None:
+        """Shows the statements that account for the most database time."""
+        if sort_by not in ("time", "calls", "rows", "wait", "max"):
+            return await ctx.respond(f"{self.bot.cross} Statements can be sorted by time, calls, rows, wait, or max.")
+
+        stats = self.bot.db.stats
+        readers = self.bot.db.readers.metrics
+
+        await ctx.respond(
+            embed=self.bot.embed.build(
+                ctx=ctx,
+                header="Database",
+                description=(
+                    f"{stats.calls:,} call(s) over {len(stats):,} statement(s). "
+                    f"{readers['in_use']} of {readers['size']} reader(s) in use, "
+                    f"mean wait {readers['wait_mean'] * 1_000:,.2f} ms."
+                ),
+                fields=(
+                    (
+                        f"{s.time * 1_000:,.0f} ms over {s.calls:,} call(s)",
+                        f"```{s.template[:900]}```"
+                        f"Rows: {s.rows:,} • p50: {s.p50 * 1_000:,.2f} ms • p99: {s.p99 * 1_000:,.2f} ms"
+                        f" • Waited: {s.wait * 1_000:,.0f} ms",
+                        False,
+                    )
+                    for s in stats.top(10, sort_by)
+                ),
+            )
+        )
+
+
+    @lightbulb.check(lightbulb.owner_only)
+    @lightbulb.check(lightbulb.guild_only)
+    @lightbulb.command(name="cachestats")
+    async def cachestats_command(self, ctx: lightbulb.Context) -> None:
+        """Shows how often users, channels, and guilds are resolved without a request."""
+        resolver = self.bot.resolver
+
+        await ctx.respond(
+            embed=self.bot.embed.build(
+                ctx=ctx,
+                header="Caches",
+                description=f"{resolver.hit_ratio():.1%} of lookups answered without a request.",
+                fields=(
+                    (
+                        kind.title(),
+                        f"Hit ratio: {stats['hit_ratio']:.1%} • Gateway: {stats['gateway']:,} • Cached: {stats['cached']:,}"
+                        f" • Known missing: {stats['negative']:,} • Fetched: {stats['fetched']:,} • Entries: {stats['entries']:,}",
+                        False,
+                    )
+                    for kind, stats in resolver.stats.items()
+                ),
+            )
+        )
+
+
 def load(bot: Blue_Bot) -> None:
     bot.add_plugin(Sudo(bot))
 
@@ -5,14 +5,23 @@ import typing as t
 from string import ascii_lowercase
 
 from bluebrain.bot import Blue_Bot
+from bluebrain.db.blobs import content_hash
+from bluebrain.db.tags import CONTENT_SQL, DUPLICATE_SQL, SEARCH_SQL, STALE_SQL, TOP_SQL, search_expression
+from bluebrain.db.transfer import POLICIES
 from bluebrain.utils import menu, checks, markdown, converters
 
 #MAX_TAGS = 35
 MAX_TAGNAME_LENGTH = 25
+MAX_SEARCH_RESULTS = 50
+SEARCH_RESULTS_PER_PAGE = 5
+MAX_LISTED_TAGS = 20
+STALE_AFTER_DAYS = 30
+# Discord's own upload limit, for servers without boosts.
+MAX_IMPORT_SIZE = 8 * 1024 * 1024
 
-class HelpMenu(menu.MultiPageMenu):
-    def __init__(self, ctx, pagemaps):
-        super().__init__(ctx, pagemaps, timeout=120.0)
+class HelpMenu(menu.LazyMultiPageMenu):
+    def __init__(self, ctx, page_count, build_page):
+        super().__init__(ctx, page_count, build_page, timeout=120.0)
 
 class Tags(lightbulb.Plugin):
     """Commands for creating tags."""
@@ -34,21 +43,18 @@ class Tags(lightbulb.Plugin):
     async def tag_command(self, ctx: lightbulb.Context, tag_name: str) -> None:
         """Shows the content of an existing tag."""
         if any(c not in ascii_lowercase for c in tag_name):
-            return await ctx.respond(f"{(await self.bot.cross)} Tag identifiers can only contain lower case letters.")
+            return await ctx.respond(f"{self.bot.cross} Tag identifiers can only contain lower case letters.")
 
-        tag_names= await self.bot.db.column("SELECT TagName FROM tags WHERE GuildID = ?", ctx.get_guild().id)
+        tags = await self.bot.tag_index.guild(ctx.get_guild().id)
 
-        cache = []
-
-        if tag_name not in tag_names:
-            await ctx.respond(f'{(await self.bot.cross)} The Tag `{tag_name}` does not exist.')
-            for x in range(len(tag_names)):
-                if tag_names[x][0] == tag_name[0]:
-                    cache.append(tag_names[x])
-                    return await ctx.respond("Did you mean..." + '\n'.join(cache) + " ?")
+        if tag_name not in tags:
+            await ctx.respond(f'{self.bot.cross} The Tag `{tag_name}` does not exist.')
+            if suggestions := tags.suggest(tag_name):
+                return await ctx.respond("Did you mean..." + '\n'.join(suggestions) + " ?")
 
         else:
-        	content, tag_id = await self.bot.db.record("SELECT TagContent, TagID FROM tags WHERE GuildID = ? AND TagName = ?", ctx.get_guild().id, tag_name)
+        	content = await self.bot.db.field(CONTENT_SQL, ctx.get_guild().id, tag_name)
+        	self.bot.tag_stats.hit(ctx.get_guild().id, tag_name)
 
         	await ctx.respond(content)
 
@@ -77,7 +83,7 @@ class Tags(lightbulb.Plugin):
                         (
                             cmd.name.title(),
                             #f"{lightbulb.get_help_text(self.bot.get_command(cmd.name))} For more infomation, use `{prefix}help tags {cmd.name}`",
-                            f"{lightbulb.get_help_text(self.bot.get_command(f'{ctx.command.name} {cmd.name}'))} For more infomation, use `{prefix}help tags {cmd.name}`",
+                            f"{lightbulb.get_help_text(self.bot.commands_registry.get(f'{ctx.command.name} {cmd.name}'))} For more infomation, use `{prefix}help tags {cmd.name}`",
                             False,
                         )
                         for cmd in cmds
@@ -94,33 +100,36 @@ class Tags(lightbulb.Plugin):
     async def tag_create(self, ctx: lightbulb.Context, tag_name: str, *, content) -> None:
         """Creates a new tag."""
         if any(c not in ascii_lowercase for c in tag_name):
-            return await ctx.respond(f"{(await self.bot.cross)} Tag identifiers can only contain lower case letters.")
+            return await ctx.respond(f"{self.bot.cross} Tag identifiers can only contain lower case letters.")
 
         if len(tag_name) > MAX_TAGNAME_LENGTH:
             return await ctx.respond(
-                f"{(await self.bot.cross)} Tag identifiers must not exceed `{MAX_TAGNAME_LENGTH}` characters in length."
+                f"{self.bot.cross} Tag identifiers must not exceed `{MAX_TAGNAME_LENGTH}` characters in length."
             )
 
-        tag_names = await self.bot.db.column("SELECT TagName FROM tags WHERE GuildID = ?", ctx.get_guild().id)
+        tags = await self.bot.tag_index.guild(ctx.get_guild().id)
 
-        #if len(tag_names) == MAX_TAGS:
+        #if len(tags) == MAX_TAGS:
             #return await ctx.send(f"{self.bot.cross} You can only set up to {MAX_TAGS} warn types.")
 
-        if tag_name in tag_names:
-            prefix = await self.bot.prefix(ctx.guild)
-            return await ctx.repond(
-                f"{(await self.bot.cross)} That tag already exists. You can use `{prefix}tag edit {tag_name}`"
+        if tag_name in tags:
+            prefix = await self.bot.prefix(ctx.get_guild().id)
+            return await ctx.respond(
+                f"{self.bot.cross} That tag already exists. You can use `{prefix}tags edit {tag_name}`"
             )
 
-        await self.bot.db.execute(
-            "INSERT INTO tags (GuildID, UserID, TagID, TagName, TagContent) VALUES (?, ?, ?, ?, ?)",
-            ctx.get_guild().id,
-            ctx.author.id,
-            self.bot.generate_id(),
-            tag_name,
-            content
-        )
-        await ctx.respond(f'{(await self.bot.tick)} The tag `{tag_name}` has been created.')
+        tag_id = self.bot.generate_id()
+        async with self.bot.db.transaction():
+            await self.bot.db.execute(
+                "INSERT INTO tags (GuildID, UserID, TagID, TagName, ContentHash) VALUES (?, ?, ?, ?, ?)",
+                ctx.get_guild().id,
+                ctx.author.id,
+                tag_id,
+                tag_name,
+                await self.bot.tag_contents.store(content)
+            )
+        self.bot.tag_index.add(ctx.get_guild().id, tag_name, tag_id, ctx.author.id)
+        await ctx.respond(f'{self.bot.tick} The tag `{tag_name}` has been created.')
 
 
     @checks.bot_has_booted()
@@ -132,32 +141,30 @@ class Tags(lightbulb.Plugin):
     async def tag_edit(self, ctx: lightbulb.Context, tag_name: str, *, content):
         """Edits an existing tag."""
         if any(c not in ascii_lowercase for c in tag_name):
-            return await ctx.repond(f"{(await self.bot.cross)} Tag identifiers can only contain lower case letters.")
+            return await ctx.respond(f"{self.bot.cross} Tag identifiers can only contain lower case letters.")
 
-        user_id, tag_id = await self.bot.db.record("SELECT UserID, TagID FROM tags WHERE GuildID = ? AND TagName = ?", ctx.get_guild().id, tag_name)
+        tag = await self.bot.tag_index.get(ctx.get_guild().id, tag_name)
 
-        if user_id != ctx.author.id:
-            return await ctx.repond(f"{(await self.bot.cross)} You can't edit others tags. You can only edit your own tags.")
+        if tag is None:
+            return await ctx.respond(f'{self.bot.cross} The tag `{tag_name}` does not exist.')
 
-        else:
-            tag_content = await self.bot.db.column("SELECT TagContent FROM tags WHERE GuildID = ?", ctx.get_guild().id)
-            tag_names = await self.bot.db.column("SELECT TagName FROM tags WHERE GuildID = ?", ctx.get_guild().id)
+        if tag.user_id != ctx.author.id:
+            return await ctx.respond(f"{self.bot.cross} You can't edit others tags. You can only edit your own tags.")
 
-            if tag_name not in tag_names:
-                return await ctx.repond(f'{(await self.bot.cross)} The tag `{tag_name}` does not exist.')
+        else:
+            if await self.bot.db.field(DUPLICATE_SQL, content_hash(content), ctx.get_guild().id, ctx.get_guild().id, content):
+                return await ctx.respond(f'{self.bot.cross} That content already exists in this `{tag_name}` tag.')
 
-            if content in tag_content:
-                return await ctx.repond(f'{(await self.bot.cross)} That content already exists in this `{tag_name}` tag.')
-
-            await self.bot.db.execute(
-                "UPDATE tags SET TagContent = ? WHERE GuildID = ? AND TagName = ?",
-                content,
-                ctx.get_guild().id,
-                tag_name,
-            )
+            async with self.bot.db.transaction():
+                await self.bot.db.execute(
+                    "UPDATE tags SET ContentHash = ?, TagContent = NULL WHERE GuildID = ? AND TagName = ?",
+                    await self.bot.tag_contents.store(content),
+                    ctx.get_guild().id,
+                    tag_name,
+                )
 
             await ctx.respond(
-                f"{(await self.bot.tick)} The `{tag_name}` tag's content has been updated."
+                f"{self.bot.tick} The `{tag_name}` tag's content has been updated."
             )
 
 
@@ -171,21 +178,23 @@ class Tags(lightbulb.Plugin):
     async def tag_delete_command(self, ctx: lightbulb.Context, tag_name: str) -> None:
         """Deletes an existing tag."""
         if any(c not in ascii_lowercase for c in tag_name):
-            return await ctx.respond(f"{(await self.bot.cross)} Tag identifiers can only contain lower case letters.")
+            return await ctx.respond(f"{self.bot.cross} Tag identifiers can only contain lower case letters.")
+
+        tag = await self.bot.tag_index.get(ctx.get_guild().id, tag_name)
 
-        user_id, tag_id = await self.bot.db.record("SELECT UserID, TagID FROM tags WHERE GuildID = ? AND TagName = ?", ctx.get_guild().id, tag_name)
+        if tag is None:
+            return await ctx.respond(f"{self.bot.cross} That tag does not exist.")
 
-        if user_id != ctx.author.id:
-            return await ctx.respond(f"{(await self.bot.cross)} You can't delete others tags. You can only delete your own tags.")
+        if tag.user_id != ctx.author.id:
+            return await ctx.respond(f"{self.bot.cross} You can't delete others tags. You can only delete your own tags.")
 
-        modified = await self.bot.db.execute(
+        await self.bot.db.execute(
             "DELETE FROM tags WHERE GuildID = ? AND TagName = ?", ctx.get_guild().id, tag_name
         )
+        self.bot.tag_index.remove(ctx.get_guild().id, tag_name)
+        self.bot.tag_stats.forget(ctx.get_guild().id, tag_name)
 
-        if not modified:
-            return await ctx.respond(f"{(await self.bot.cross)} That tag does not exist.")
-
-        await ctx.send(f'{self.bot.tick} Tag `{tag_name}` deleted.')
+        await ctx.respond(f'{self.bot.tick} Tag `{tag_name}` deleted.')
 
 
     @checks.bot_has_booted()
@@ -195,12 +204,10 @@ class Tags(lightbulb.Plugin):
     async def tag_info_command(self, ctx: lightbulb.Context, tag_name: str) -> None:
         """Shows information about an existing tag."""
         if any(c not in ascii_lowercase for c in tag_name):
-            return await ctx.respond(f"{(await self.bot.cross)} Tag identifiers can only contain lower case letters.")
-
-        tag_names = await self.bot.db.column("SELECT TagName FROM tags WHERE GuildID = ?", ctx.get_guild().id)
+            return await ctx.respond(f"{self.bot.cross} Tag identifiers can only contain lower case letters.")
 
-        if tag_name not in tag_names:
-            return await ctx.respond(f'{(await self.bot.cross)} The Tag `{tag_name}` does not exist.')
+        if tag_name not in await self.bot.tag_index.guild(ctx.get_guild().id):
+            return await ctx.respond(f'{self.bot.cross} The Tag `{tag_name}` does not exist.')
 
         user_id, tag_id, tag_time = await self.bot.db.record("SELECT UserID, TagID, TagTime FROM tags WHERE GuildID = ? AND TagName = ?", ctx.get_guild().id, tag_name)
 
@@ -225,40 +232,28 @@ class Tags(lightbulb.Plugin):
         """Shows the tag list of a tag owner."""
         target = target or ctx.author
         prefix = await self.bot.prefix(ctx.get_guild().id)
-        all_tags = await self.bot.db.column("SELECT TagName FROM tags WHERE GuildID = ?", ctx.get_guild().id)
-        tag_names = await self.bot.db.column("SELECT TagName FROM tags WHERE GuildID = ? AND UserID = ?", ctx.get_guild().id, target.id)
-        tag_all = await self.bot.db.records("SELECT Tagname, TagID FROM tags WHERE GuildID = ? AND UserID = ?", ctx.get_guild().id, target.id)
-        if len(tag_names) == 0:
+        tags = await self.bot.tag_index.guild(ctx.get_guild().id)
+        tag_all = [(tag_name, tag.tag_id) for tag_name in tags if (tag := tags.get(tag_name)).user_id == target.id]
+        if len(tag_all) == 0:
             if target == ctx.author:
-                return await ctx.respond(f"{(await self.bot.cross)} You don't have any tag list.")
+                return await ctx.respond(f"{self.bot.cross} You don't have any tag list.")
             else:
-                return await ctx.respond(f"{(await self.bot.cross)} That member doesn't have any tag list.")
+                return await ctx.respond(f"{self.bot.cross} That member doesn't have any tag list.")
 
         self.user = await self.bot.grab_user(target.id)
 
         try:
-            pagemaps = []
-
-            for tag_name, tag_id in sorted(tag_all):
-                content, tag_id = await self.bot.db.record("SELECT TagContent, TagID FROM tags WHERE GuildID = ? AND TagName = ?", ctx.get_guild().id, tag_name)
-                first_step = content
-                pagemaps.append(
-                    {
-                        "header": "Tags",
-                        "title": f"All tags of this server for {self.user.username}",
-                        "description": f"Using {len(tag_names)} of this server's {len(all_tags)} tags.",
-                        "thumbnail":self.user.avatar_url,
-                        "fields": (
-                            (
-                                tag_name,
-                                "ID: " + tag_id + "\n\n**Content**" + "\n```\n" + ''.join(first_step.replace('<', '\\<')[0:350]) + "..." + "\n\n```\n***To see this tags whole content type `" + prefix + "tag " + tag_name + "`***",
-                                False
-                                ),
-                            ),
-                        }
-                    )
-
-            await HelpMenu(ctx, pagemaps).start()
+            async def build_page(page):
+                return await self.tag_page(
+                    ctx,
+                    prefix,
+                    *tag_all[page],
+                    title=f"All tags of this server for {self.user.username}",
+                    description=f"Using {len(tag_all)} of this server's {len(tags)} tags.",
+                    thumbnail=self.user.avatar_url,
+                )
+
+            await HelpMenu(ctx, len(tag_all), build_page).start()
 
         except IndexError:
             await ctx.send(
@@ -266,9 +261,9 @@ class Tags(lightbulb.Plugin):
                 ctx=ctx,
                 header="Tags",
                 title=f"All tags of this server for {self.user.username}",
-                description=f"Using {len(tag_names)} of this server's {len(all_tags)} tags.",
+                description=f"Using {len(tag_all)} of this server's {len(tags)} tags.",
                 thumbnail=self.user.avatar_url,
-                fields=((tag_name, f"ID: {tag_id}", True) for tag_name, tag_id in sorted(tag_all)),
+                fields=((tag_name, f"ID: {tag_id}", True) for tag_name, tag_id in tag_all),
             )
         )
 
@@ -280,15 +275,12 @@ class Tags(lightbulb.Plugin):
     async def raw_command(self, ctx: lightbulb.Context, tag_name: str) -> None:
         """Gets the raw content of the tag. This is with markdown escaped. Useful for editing."""
         if any(c not in ascii_lowercase for c in tag_name):
-            return await ctx.respond(f"{(await self.bot.cross)} Tag identifiers can only contain lower case letters.")
+            return await ctx.respond(f"{self.bot.cross} Tag identifiers can only contain lower case letters.")
 
-        tag_content = await self.bot.db.column("SELECT TagContent FROM tags WHERE GuildID = ?", ctx.get_guild().id)
-        tag_names = await self.bot.db.column("SELECT TagName FROM tags WHERE GuildID = ?", ctx.get_guild().id)
+        if tag_name not in await self.bot.tag_index.guild(ctx.get_guild().id):
+            return await ctx.respond(f'{self.bot.cross} The Tag `{tag_name}` does not exist.')
 
-        if tag_name not in tag_names:
-            return await ctx.respond(f'{(await self.bot.cross)} The Tag `{tag_name}` does not exist.')
-
-        content, tag_id = await self.bot.db.record("SELECT TagContent, TagID FROM tags WHERE GuildID = ? AND TagName = ?", ctx.get_guild().id, tag_name)
+        content = await self.bot.db.field(CONTENT_SQL, ctx.get_guild().id, tag_name)
 
         first_step = markdown.escape_markdown(content)
         await ctx.respond(first_step.replace('<', '\\<'))
@@ -303,32 +295,21 @@ class Tags(lightbulb.Plugin):
     async def tags_list_command(self, ctx: lightbulb.Context) -> None:
         """Lists the server's tags."""
         prefix = await self.bot.prefix(ctx.get_guild().id)
-        tag_names = await self.bot.db.column("SELECT TagName FROM tags WHERE GuildID = ?", ctx.get_guild().id)
-        records = await self.bot.db.records("SELECT TagName, TagID FROM tags WHERE GuildID = ?", ctx.get_guild().id)
+        tags = await self.bot.tag_index.guild(ctx.get_guild().id)
+        records = [(tag_name, tags.get(tag_name).tag_id) for tag_name in tags]
 
         try:
-            pagemaps = []
-
-            for tag_name, tag_id in sorted(records):
-                content, tag_id = await self.bot.db.record("SELECT TagContent, TagID FROM tags WHERE GuildID = ? AND TagName = ?", ctx.get_guild().id, tag_name)
-                first_step = content
-                pagemaps.append(
-                    {
-                        "header": "Tags",
-                        "title": f"All tags of this server",
-                        "description": f"A total of {len(tag_names)} tags of this server.",
-                        "thumbnail": ctx.get_guild().icon_url,
-                        "fields": (
-                            (
-                                tag_name,
-                                "ID: " + tag_id + "\n\n**Content**" + "\n```\n" + ''.join(first_step.replace('<', '\\<')[0:350]) + "..." + "\n\n```\n***To see this tags whole content type `" + prefix + "tag " + tag_name + "`***",
-                                False
-                                ),
-                            ),
-                        }
-                    )
-
-            await HelpMenu(ctx, pagemaps).start()
+            async def build_page(page):
+                return await self.tag_page(
+                    ctx,
+                    prefix,
+                    *records[page],
+                    title="All tags of this server",
+                    description=f"A total of {len(records)} tags of this server.",
+                    thumbnail=ctx.get_guild().icon_url,
+                )
+
+            await HelpMenu(ctx, len(records), build_page).start()
 
         except IndexError:
             await ctx.send(
@@ -336,13 +317,184 @@ class Tags(lightbulb.Plugin):
                 ctx=ctx,
                 header="Tags",
                 title="All tags of this server",
-                description=f"A total of {len(tag_names)} tags of this server.",
+                description=f"A total of {len(records)} tags of this server.",
+                thumbnail=ctx.get_guild().icon_url,
+                fields=((tag_name, f"ID: {tag_id}", True) for tag_name, tag_id in records),
+            )
+        )
+
+
+    @checks.bot_has_booted()
+    @checks.bot_is_ready()
+    @lightbulb.check(lightbulb.guild_only)
+    @tags_group.command(
+        name="search"
+    )
+    async def tags_search_command(self, ctx: lightbulb.Context, *, query: str) -> None:
+        """Searches the server's tags by name and content, best matches first."""
+        if (expression := search_expression(ctx.get_guild().id, query)) is None:
+            return await ctx.respond(f"{self.bot.cross} Give something to search for.")
+
+        results = await self.bot.db.records(SEARCH_SQL, expression, MAX_SEARCH_RESULTS)
+
+        if not results:
+            return await ctx.respond(f"{self.bot.cross} No tags match `{query}`.")
+
+        pagemaps = [
+            {
+                "header": "Tags",
+                "title": f"Tags matching `{query}`",
+                "description": f"{len(results)} result(s), best matches first.",
+                "thumbnail": ctx.get_guild().icon_url,
+                "fields": tuple(
+                    (tag_name, f"ID: {tag_id}\n" + snippet.replace('<', '\\<'), False)
+                    for tag_name, tag_id, snippet in results[i:i + SEARCH_RESULTS_PER_PAGE]
+                ),
+            }
+            for i in range(0, len(results), SEARCH_RESULTS_PER_PAGE)
+        ]
+
+        await menu.MultiPageMenu(ctx, pagemaps, timeout=120.0).start()
+
+
+    @checks.bot_has_booted()
+    @checks.bot_is_ready()
+    @lightbulb.check(lightbulb.guild_only)
+    @tags_group.command(
+        name="top"
+    )
+    async def tags_top_command(self, ctx: lightbulb.Context) -> None:
+        """Shows the server's most used tags."""
+        await self.bot.tag_stats.flush()
+        tags = await self.bot.tag_index.guild(ctx.get_guild().id)
+        records = [
+            record
+            for record in await self.bot.db.records(TOP_SQL, ctx.get_guild().id, MAX_LISTED_TAGS)
+            if record[0] in tags
+        ]
+
+        if not records:
+            return await ctx.respond(f"{self.bot.cross} None of this server's tags have been used yet.")
+
+        await ctx.respond(
+            embed=self.bot.embed.build(
+                ctx=ctx,
+                header="Tags",
+                title="Most used tags",
+                description=f"The {len(records)} most used of this server's {len(tags)} tags.",
+                thumbnail=ctx.get_guild().icon_url,
+                fields=(
+                    (f"{i}. {tag_name}", f"Used {uses:,} time(s), most recently at {last_used} UTC.", False)
+                    for i, (tag_name, uses, last_used) in enumerate(records, start=1)
+                ),
+            )
+        )
+
+
+    @checks.bot_has_booted()
+    @checks.bot_is_ready()
+    @lightbulb.check(lightbulb.guild_only)
+    @tags_group.command(
+        name="stale"
+    )
+    async def tags_stale_command(self, ctx: lightbulb.Context, days: int = STALE_AFTER_DAYS) -> None:
+        """Lists tags that have not been used in a while, or at all, least recently used first."""
+        if days < 1:
+            return await ctx.respond(f"{self.bot.cross} The number of days must be at least 1.")
+
+        await self.bot.tag_stats.flush()
+        records = await self.bot.db.records(STALE_SQL, ctx.get_guild().id, f"-{days} days", MAX_LISTED_TAGS)
+
+        if not records:
+            return await ctx.respond(f"{self.bot.tick} Every tag in this server has been used in the last {days} day(s).")
+
+        await ctx.respond(
+            embed=self.bot.embed.build(
+                ctx=ctx,
+                header="Tags",
+                title="Stale tags",
+                description=f"Showing up to {MAX_LISTED_TAGS} tags that have not been used in the last {days} day(s).",
                 thumbnail=ctx.get_guild().icon_url,
-                fields=((tag_name, f"ID: {tag_id}", True) for tag_name, tag_id in sorted(records)),
+                fields=(
+                    (tag_name, f"Last used at {last_used} UTC." if last_used else "Never used.", True)
+                    for tag_name, last_used in records
+                ),
             )
         )
 
 
+    @checks.bot_has_booted()
+    @checks.bot_is_ready()
+    @lightbulb.check(lightbulb.guild_only)
+    @tags_group.command(
+        name="export"
+    )
+    async def tags_export_command(self, ctx: lightbulb.Context) -> None:
+        """Exports the server's tags as a JSON Lines file, one tag per line."""
+        data, count = await self.bot.tag_transfer.export(ctx.get_guild().id)
+
+        if not count:
+            return await ctx.respond(f"{self.bot.cross} This server doesn't have any tags to export.")
+
+        await ctx.respond(
+            f"{self.bot.tick} Exported {count:,} tag(s).",
+            attachment=hikari.Bytes(data, f"tags-{ctx.get_guild().id}.jsonl"),
+        )
+
+
+    @checks.bot_has_booted()
+    @checks.bot_is_ready()
+    @lightbulb.check(lightbulb.guild_only)
+    @lightbulb.has_guild_permissions(hikari.Permissions.MANAGE_GUILD)
+    @tags_group.command(
+        name="import"
+    )
+    async def tags_import_command(self, ctx: lightbulb.Context, policy: t.Optional[str] = "skip") -> None:
+        """Imports tags from an attached JSON Lines file, like the one `tags export` makes. Tags whose names are already taken are skipped, overwritten, or renamed, depending on the policy given."""
+        policy = policy.lower()
+        if policy not in POLICIES:
+            return await ctx.respond(
+                f"{self.bot.cross} The conflict policy must be one of: {', '.join(f'`{p}`' for p in POLICIES)}."
+            )
+
+        if not ctx.message.attachments:
+            return await ctx.respond(f"{self.bot.cross} Attach a JSON Lines file to import tags from.")
+
+        attachment = ctx.message.attachments[0]
+        if attachment.size > MAX_IMPORT_SIZE:
+            return await ctx.respond(
+                f"{self.bot.cross} Import files must not exceed `{MAX_IMPORT_SIZE // (1024 * 1024)}` MiB."
+            )
+
+        async with attachment.stream() as reader:
+            result = await self.bot.tag_transfer.import_(
+                ctx.get_guild().id, ctx.author.id, reader, policy, MAX_TAGNAME_LENGTH
+            )
+
+        await ctx.respond(
+            f"{self.bot.tick} Imported {result.created + result.renamed:,} new tag(s)"
+            f" ({result.renamed:,} renamed), overwrote {result.overwritten:,},"
+            f" skipped {result.skipped:,}, and ignored {result.invalid:,} invalid line(s)."
+        )
+
+
+    async def tag_page(self, ctx, prefix, tag_name, tag_id, **pagemap):
+        # Only the page being viewed has its tag's content fetched.
+        content = await self.bot.db.field(CONTENT_SQL, ctx.get_guild().id, tag_name) or ""
+
+        return {
+            "header": "Tags",
+            **pagemap,
+            "fields": (
+                (
+                    tag_name,
+                    "ID: " + tag_id + "\n\n**Content**" + "\n```\n" + ''.join(content.replace('<', '\\<')[0:350]) + "..." + "\n\n```\n***To see this tags whole content type `" + prefix + "tag " + tag_name + "`***",
+                    False
+                ),
+            ),
+        }
+
+
 def load(bot: Blue_Bot) -> None:
     bot.add_plugin(Tags(bot))
 
@@ -1,5 +1,6 @@
 import time
 import typing as t
+from collections import deque
 from string import ascii_lowercase
 
 import hikari
@@ -49,7 +50,7 @@ class Warn(lightbulb.Plugin):
     ) -> None:
         """Warns one or more members in your server."""
         if not targets:
-            return await ctx.respond(f"{(await self.bot.cross)} No valid targets were passed.")
+            return await ctx.respond(f"{self.bot.cross} No valid targets were passed.")
 
         if any(c not in ascii_lowercase for c in warn_type):
             return await ctx.respond(f"{self.bot.cross} Warn type identifiers can only contain lower case letters.")
@@ -91,10 +92,8 @@ class Warn(lightbulb.Plugin):
             records = await self.bot.db.records(
                 "SELECT WarnType, Points FROM warns WHERE GuildID = ? AND UserID = ?", ctx.get_guild().id, target.id
             )
-            max_points, max_strikes = (
-                await self.bot.db.record("SELECT MaxPoints, MaxStrikes FROM warn WHERE GuildID = ?", ctx.get_guild().id)
-                or [None] * 2
-            )
+            settings = (await self.bot.settings.guild(ctx.get_guild().id))["warn"]
+            max_points, max_strikes = settings["MaxPoints"], settings["MaxStrikes"]
 
             if (wc := [r[0] for r in records].count(warn_type)) >= (max_strikes or 3):
                 # Account for unbans.
@@ -156,19 +155,25 @@ class Warn(lightbulb.Plugin):
                 f"{self.bot.cross} Blue Brain was unable to identify a member with the information provided."
             )
 
-        records = await self.bot.db.records(
+        # Only the warns that are displayed are kept; everything else is just counted.
+        records = deque(maxlen=10)
+        count = points = 0
+
+        async for record in self.bot.db.stream(
             "SELECT WarnID, ModID, WarnTime, WarnType, Points, Comment FROM warns WHERE GuildID = ? AND UserID = ? ORDER BY WarnTime DESC",
             ctx.get_guild().id,
             target.id,
-        )
-        points = sum(record[4] for record in records)
+        ):
+            records.append(record)
+            count += 1
+            points += record[4]
 
         await ctx.respond(
             embed=self.bot.embed.build(
                 ctx=ctx,
                 header="Warn",
                 title=f"Warn information for {target.username}",
-                description=f"{points} point(s) accumulated. Showing {min(len(records), 10)} of {len(records)} warning(s).",
+                description=f"{points} point(s) accumulated. Showing {len(records)} of {count} warning(s).",
                 #colour=target.get_top_role().color,
                 thumbnail=target.avatar_url,
                 fields=(
@@ -178,7 +183,7 @@ class Warn(lightbulb.Plugin):
                         f"{getattr(ctx.guild.get_member(record[1]), 'mention', 'Unknown')} - {chron.short_date_and_time(chron.from_iso(record[2]))}",
                         False,
                     )
-                    for record in records[-10:]
+                    for record in records
                 ),
             )
         )
@@ -205,7 +210,7 @@ class Warn(lightbulb.Plugin):
                     *(
                         (
                             cmd.name.title(),
-                            f"{lightbulb.get_help_text(self.bot.get_command(f'{ctx.command.name} {cmd.name}'))}{lightbulb.get_help_text(self.bot.get_command(f'{ctx.command.name} {cmd.name}'))} For more infomation, use `{prefix}help warntype {cmd.name}`",
+                            f"{lightbulb.get_help_text(self.bot.commands_registry.get(f'{ctx.command.name} {cmd.name}'))}{lightbulb.get_help_text(self.bot.commands_registry.get(f'{ctx.command.name} {cmd.name}'))} For more infomation, use `{prefix}help warntype {cmd.name}`",
                             False,
                         )
                         for cmd in cmds
@@ -258,7 +263,7 @@ class Warn(lightbulb.Plugin):
     async def warntype_edit_command(self, ctx, warn_type: str, new_points: t.Optional[int], new_name: t.Optional[str]) -> None:
         """Edits an existing warn type. Existing warn records are updated to reflect the changes, but action is not retroactively taken based on point values."""
         if new_points is None and new_name is None:
-            await ctx.respond(f"{self.bot.cross} Nothing to modify.")
+            return await ctx.respond(f"{self.bot.cross} Nothing to modify.")
 
         if new_points is not None:
             if not MIN_POINTS <= new_points <= MAX_POINTS:
@@ -281,55 +286,70 @@ class Warn(lightbulb.Plugin):
             if new_name in warn_types:
                 return await ctx.respond(f'{self.bot.cross} That warn type "{new_name}" already exists.')
 
-        if new_name and new_points:
-            if await self.bot.db.field("SELECT RetroUpdates FROM warn WHERE GuildID = ?", ctx.get_guild().id):
-                default = await self.bot.db.field(
-                    "SELECT Points FROM warntypes WHERE GuildID = ? AND WarnType = ?", ctx.get_guild().id, warn_type
+        retro_updates = await self.bot.settings.get(ctx.get_guild().id, "warn", "RetroUpdates")
+
+        async with self.bot.db.transaction():
+            if new_name and new_points:
+                if retro_updates:
+                    default = await self.bot.db.field(
+                        "SELECT Points FROM warntypes WHERE GuildID = ? AND WarnType = ?", ctx.get_guild().id, warn_type
+                    )
+                    await self.bot.db.execute(
+                        "UPDATE warns SET Points = ? WHERE GuildID = ? AND WarnType = ? AND Points = ?",
+                        new_points,
+                        ctx.get_guild().id,
+                        warn_type,
+                        default,
+                    )
+                await self.bot.db.execute(
+                    "UPDATE warns SET WarnType = ? WHERE GuildID = ? AND WarnType = ?",
+                    new_name,
+                    ctx.get_guild().id,
+                    warn_type,
                 )
                 await self.bot.db.execute(
-                    "UPDATE warns SET WarnType = ?, Points = ? WHERE GuildID = ? AND WarnType = ? AND Points = ?",
+                    "UPDATE warntypes SET WarnType = ?, Points = ? WHERE GuildID = ? AND WarnType = ?",
                     new_name,
                     new_points,
                     ctx.get_guild().id,
                     warn_type,
-                    default,
                 )
-            else:
+            elif new_name:
                 await self.bot.db.execute(
-                    "UPDATE warns SET WarnType = ? WHERE GuildID = ? AND WarnType = ?",
+                    "UPDATE warntypes SET WarnType = ? WHERE GuildID = ? AND WarnType = ?",
                     new_name,
                     ctx.get_guild().id,
                     warn_type,
                 )
-        elif new_name:
-            await self.bot.db.execute(
-                "UPDATE warntypes SET WarnType = ? WHERE GuildID = ? AND WarnType = ?",
-                new_name,
-                ctx.get_guild().id,
-                warn_type,
-            )
-            await self.bot.db.execute(
-                "UPDATE warns SET WarnType = ? WHERE GuildID = ? AND WarnType = ?", new_name, ctx.get_guild().id, warn_type
-            )
-            await ctx.respond(f'{self.bot.tick} The warn type "{warn_type}" has been renamed to "{new_name}".')         
-        elif new_points:
-            if await self.bot.db.field("SELECT RetroUpdates FROM warn WHERE GuildID = ?", ctx.get_guild().id):
-                default = await self.bot.db.field(
-                    "SELECT Points FROM warntypes WHERE GuildID = ? AND WarnType = ?", ctx.get_guild().id, warn_type
+                await self.bot.db.execute(
+                    "UPDATE warns SET WarnType = ? WHERE GuildID = ? AND WarnType = ?", new_name, ctx.get_guild().id, warn_type
                 )
+            elif new_points:
+                if retro_updates:
+                    default = await self.bot.db.field(
+                        "SELECT Points FROM warntypes WHERE GuildID = ? AND WarnType = ?", ctx.get_guild().id, warn_type
+                    )
+                    await self.bot.db.execute(
+                        "UPDATE warns SET Points = ? WHERE GuildID = ? AND WarnType = ? AND Points = ?",
+                        new_points,
+                        ctx.get_guild().id,
+                        warn_type,
+                        default,
+                    )
                 await self.bot.db.execute(
-                    "UPDATE warns SET Points = ? WHERE GuildID = ? AND WarnType = ? AND Points = ?",
+                    "UPDATE warntypes SET Points = ? WHERE GuildID = ? AND WarnType = ?",
                     new_points,
                     ctx.get_guild().id,
                     warn_type,
-                    default,
                 )
-            await self.bot.db.execute(
-                "UPDATE warntypes SET Points = ? WHERE GuildID = ? AND WarnType = ?",
-                new_points,
-                ctx.get_guild().id,
-                warn_type,
+
+        if new_name and new_points:
+            await ctx.respond(
+                f'{self.bot.tick} The warn type "{warn_type}" has been renamed to "{new_name}", and is now worth {new_points} point(s).'
             )
+        elif new_name:
+            await ctx.respond(f'{self.bot.tick} The warn type "{warn_type}" has been renamed to "{new_name}".')
+        elif new_points:
             await ctx.respond(f'{self.bot.tick} The warn type "{warn_type}" is now worth {new_points} point(s).')
 
 
@@ -344,14 +364,17 @@ class Warn(lightbulb.Plugin):
         if any(c not in ascii_lowercase for c in warn_type):
             return await ctx.respond("Warn types can only contain lower case letters.")
 
-        modified = await self.bot.db.execute(
-            "DELETE FROM warntypes WHERE GuildID = ? AND WarnType = ?", ctx.get_guild().id, warn_type
-        )
+        async with self.bot.db.transaction():
+            modified = await self.bot.db.execute(
+                "DELETE FROM warntypes WHERE GuildID = ? AND WarnType = ?", ctx.get_guild().id, warn_type
+            )
+
+            if modified:
+                await self.bot.db.execute("DELETE FROM warns WHERE GuildID = ? AND WarnType = ?", ctx.get_guild().id, warn_type)
 
         if not modified:
             return await ctx.respond(f"{self.bot.cross} That warn type does not exist.")
 
-        await self.bot.db.execute("DELETE FROM warns WHERE GuildID = ? AND WarnType = ?", ctx.get_guild().id, warn_type)
         await ctx.respond(f'{self.bot.tick} Warn type "{warn_type}" deleted.')
 
 
@@ -0,0 +1,13 @@
+-- Indexes for the hot query patterns in the tags and warn extensions.
+
+-- Tag lookups by name, including existence and ownership checks, which this index covers.
+CREATE INDEX IF NOT EXISTS tags_guild_name ON tags (GuildID, TagName, UserID, TagID);
+
+-- A member's tags, listed by name.
+CREATE INDEX IF NOT EXISTS tags_guild_user ON tags (GuildID, UserID, TagName, TagID);
+
+-- A member's warns, ordered by time. Also covers the strike and point totals.
+CREATE INDEX IF NOT EXISTS warns_guild_user ON warns (GuildID, UserID, WarnTime, WarnType, Points);
+
+-- Warns of a given type, for retroactive updates and deletions.
+CREATE INDEX IF NOT EXISTS warns_guild_type ON warns (GuildID, WarnType, Points);
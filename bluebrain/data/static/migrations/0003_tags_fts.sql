@@ -0,0 +1,21 @@
+-- Full-text search over tag names and content, for `tags search`.
+
+-- The index reads tag text back out of `tags` itself rather than keeping a second copy. `GuildID` is indexed as a
+-- token so a search can be narrowed to one guild inside the index, and is given no weight when ranking.
+CREATE VIRTUAL TABLE IF NOT EXISTS tags_fts USING fts5 (GuildID, TagName, TagContent, content='tags');
+
+CREATE TRIGGER IF NOT EXISTS tags_fts_insert AFTER INSERT ON tags BEGIN
+	INSERT INTO tags_fts (rowid, GuildID, TagName, TagContent) VALUES (new.rowid, new.GuildID, new.TagName, new.TagContent);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tags_fts_delete AFTER DELETE ON tags BEGIN
+	INSERT INTO tags_fts (tags_fts, rowid, GuildID, TagName, TagContent) VALUES ('delete', old.rowid, old.GuildID, old.TagName, old.TagContent);
+END;
+
+CREATE TRIGGER IF NOT EXISTS tags_fts_update AFTER UPDATE OF GuildID, TagName, TagContent ON tags BEGIN
+	INSERT INTO tags_fts (tags_fts, rowid, GuildID, TagName, TagContent) VALUES ('delete', old.rowid, old.GuildID, old.TagName, old.TagContent);
+	INSERT INTO tags_fts (rowid, GuildID, TagName, TagContent) VALUES (new.rowid, new.GuildID, new.TagName, new.TagContent);
+END;
+
+-- Index the tags that already exist. Until 0006 gives `tags` an INTEGER PRIMARY KEY, a VACUUM may renumber its rows.
+INSERT INTO tags_fts (tags_fts) VALUES ('rebuild');
@@ -0,0 +1,62 @@
+-- Requires the `inflate` SQL function: the triggers below call it on every write to `tags`. Anything writing to `tags`,
+-- a migration, a maintenance script, or a shell, needs it registered first, with `bluebrain.db.blobs.register`.
+-- `migrations.apply` and `Database` do this themselves; the sqlite3 shell can't, so use Python for manual edits.
+
+-- Content-addressed tag content. Each distinct body is stored once, across every tag and guild, keyed by its SHA-256,
+-- and is compressed when that makes it smaller. `inflate` is registered on every connection by `bluebrain.db.blobs`.
+CREATE TABLE IF NOT EXISTS tag_blobs (
+	Hash text PRIMARY KEY,
+	Size integer,
+	Compressed integer DEFAULT 0,
+	Content blob
+) WITHOUT ROWID;
+
+-- Existing rows keep their `TagContent` until `TagContents.convert` moves it into `tag_blobs`, so both have to be
+-- read from until then.
+ALTER TABLE tags ADD COLUMN ContentHash text;
+
+-- Finds what is left to convert, and whether a blob is still referenced.
+CREATE INDEX IF NOT EXISTS tags_content_hash ON tags (ContentHash, GuildID);
+
+CREATE VIEW IF NOT EXISTS tag_contents AS
+	SELECT tags.rowid AS TagRowID, tags.GuildID, tags.UserID, tags.TagID, tags.TagName,
+		coalesce(tags.TagContent, inflate(tag_blobs.Compressed, tag_blobs.Content)) AS TagContent
+	FROM tags LEFT JOIN tag_blobs ON tag_blobs.Hash = tags.ContentHash;
+
+-- The search index now reads tag text through the view. Triggers on `tags` keep it current, and drop blobs once
+-- nothing refers to them.
+DROP TRIGGER IF EXISTS tags_fts_insert;
+DROP TRIGGER IF EXISTS tags_fts_delete;
+DROP TRIGGER IF EXISTS tags_fts_update;
+DROP TABLE IF EXISTS tags_fts;
+
+CREATE VIRTUAL TABLE tags_fts USING fts5 (GuildID, TagName, TagContent, content='tag_contents', content_rowid='TagRowID');
+
+CREATE TRIGGER tags_fts_insert AFTER INSERT ON tags BEGIN
+	INSERT INTO tags_fts (rowid, GuildID, TagName, TagContent) VALUES (
+		new.rowid, new.GuildID, new.TagName,
+		coalesce(new.TagContent, (SELECT inflate(Compressed, Content) FROM tag_blobs WHERE Hash = new.ContentHash))
+	);
+END;
+
+CREATE TRIGGER tags_fts_delete AFTER DELETE ON tags BEGIN
+	INSERT INTO tags_fts (tags_fts, rowid, GuildID, TagName, TagContent) VALUES (
+		'delete', old.rowid, old.GuildID, old.TagName,
+		coalesce(old.TagContent, (SELECT inflate(Compressed, Content) FROM tag_blobs WHERE Hash = old.ContentHash))
+	);
+	DELETE FROM tag_blobs WHERE Hash = old.ContentHash AND NOT EXISTS (SELECT 1 FROM tags WHERE ContentHash = old.ContentHash);
+END;
+
+CREATE TRIGGER tags_fts_update AFTER UPDATE OF GuildID, TagName, TagContent, ContentHash ON tags BEGIN
+	INSERT INTO tags_fts (tags_fts, rowid, GuildID, TagName, TagContent) VALUES (
+		'delete', old.rowid, old.GuildID, old.TagName,
+		coalesce(old.TagContent, (SELECT inflate(Compressed, Content) FROM tag_blobs WHERE Hash = old.ContentHash))
+	);
+	INSERT INTO tags_fts (rowid, GuildID, TagName, TagContent) VALUES (
+		new.rowid, new.GuildID, new.TagName,
+		coalesce(new.TagContent, (SELECT inflate(Compressed, Content) FROM tag_blobs WHERE Hash = new.ContentHash))
+	);
+	DELETE FROM tag_blobs WHERE Hash = old.ContentHash AND NOT EXISTS (SELECT 1 FROM tags WHERE ContentHash = old.ContentHash);
+END;
+
+INSERT INTO tags_fts (tags_fts) VALUES ('rebuild');
@@ -0,0 +1,16 @@
+-- How often, and how recently, each tag has been shown. Rows are written in batches by `TagStats.flush`.
+CREATE TABLE IF NOT EXISTS tag_stats (
+	GuildID integer,
+	TagName text,
+	Uses integer DEFAULT 0,
+	LastUsed text,
+	PRIMARY KEY (GuildID, TagName)
+) WITHOUT ROWID;
+
+-- A guild's most used tags.
+CREATE INDEX IF NOT EXISTS tag_stats_guild_uses ON tag_stats (GuildID, Uses);
+
+-- A deleted tag takes its stats with it, so a new tag with the same name starts from nothing.
+CREATE TRIGGER IF NOT EXISTS tag_stats_delete AFTER DELETE ON tags BEGIN
+	DELETE FROM tag_stats WHERE GuildID = old.GuildID AND TagName = old.TagName;
+END;
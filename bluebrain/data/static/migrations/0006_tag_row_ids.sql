@@ -0,0 +1,75 @@
+-- Requires the `inflate` SQL function: the triggers below call it on every write to `tags`. Anything writing to `tags`,
+-- a migration, a maintenance script, or a shell, needs it registered first, with `bluebrain.db.blobs.register`.
+-- `migrations.apply` and `Database` do this themselves; the sqlite3 shell can't, so use Python for manual edits.
+
+-- Gives `tags` an explicit INTEGER PRIMARY KEY. The search index is keyed on each tag's rowid, and an implicit rowid
+-- can be renumbered by a VACUUM, which would leave search results pointing at the wrong tags. `TagRowID` is an alias
+-- for the rowid, so it keeps every existing row's number and is never renumbered.
+
+-- The view and the triggers refer to `tags`, so they have to go while it is rebuilt.
+DROP VIEW IF EXISTS tag_contents;
+DROP TRIGGER IF EXISTS tags_fts_insert;
+DROP TRIGGER IF EXISTS tags_fts_delete;
+DROP TRIGGER IF EXISTS tags_fts_update;
+DROP TRIGGER IF EXISTS tag_stats_delete;
+
+CREATE TABLE tags_rebuilt (
+	TagRowID integer PRIMARY KEY,
+	GuildID integer,
+	UserID integer,
+	TagID text,
+	TagName text,
+	TagContent text,
+	TagAliases text,
+	TagTime text DEFAULT CURRENT_TIMESTAMP,
+	ContentHash text
+);
+
+INSERT INTO tags_rebuilt (TagRowID, GuildID, UserID, TagID, TagName, TagContent, TagAliases, TagTime, ContentHash)
+	SELECT rowid, GuildID, UserID, TagID, TagName, TagContent, TagAliases, TagTime, ContentHash FROM tags;
+
+DROP TABLE tags;
+ALTER TABLE tags_rebuilt RENAME TO tags;
+
+CREATE INDEX tags_guild_name ON tags (GuildID, TagName, UserID, TagID);
+CREATE INDEX tags_guild_user ON tags (GuildID, UserID, TagName, TagID);
+CREATE INDEX tags_content_hash ON tags (ContentHash, GuildID);
+
+CREATE VIEW tag_contents AS
+	SELECT tags.TagRowID, tags.GuildID, tags.UserID, tags.TagID, tags.TagName,
+		coalesce(tags.TagContent, inflate(tag_blobs.Compressed, tag_blobs.Content)) AS TagContent
+	FROM tags LEFT JOIN tag_blobs ON tag_blobs.Hash = tags.ContentHash;
+
+CREATE TRIGGER tags_fts_insert AFTER INSERT ON tags BEGIN
+	INSERT INTO tags_fts (rowid, GuildID, TagName, TagContent) VALUES (
+		new.TagRowID, new.GuildID, new.TagName,
+		coalesce(new.TagContent, (SELECT inflate(Compressed, Content) FROM tag_blobs WHERE Hash = new.ContentHash))
+	);
+END;
+
+CREATE TRIGGER tags_fts_delete AFTER DELETE ON tags BEGIN
+	INSERT INTO tags_fts (tags_fts, rowid, GuildID, TagName, TagContent) VALUES (
+		'delete', old.TagRowID, old.GuildID, old.TagName,
+		coalesce(old.TagContent, (SELECT inflate(Compressed, Content) FROM tag_blobs WHERE Hash = old.ContentHash))
+	);
+	DELETE FROM tag_blobs WHERE Hash = old.ContentHash AND NOT EXISTS (SELECT 1 FROM tags WHERE ContentHash = old.ContentHash);
+END;
+
+CREATE TRIGGER tags_fts_update AFTER UPDATE OF GuildID, TagName, TagContent, ContentHash ON tags BEGIN
+	INSERT INTO tags_fts (tags_fts, rowid, GuildID, TagName, TagContent) VALUES (
+		'delete', old.TagRowID, old.GuildID, old.TagName,
+		coalesce(old.TagContent, (SELECT inflate(Compressed, Content) FROM tag_blobs WHERE Hash = old.ContentHash))
+	);
+	INSERT INTO tags_fts (rowid, GuildID, TagName, TagContent) VALUES (
+		new.TagRowID, new.GuildID, new.TagName,
+		coalesce(new.TagContent, (SELECT inflate(Compressed, Content) FROM tag_blobs WHERE Hash = new.ContentHash))
+	);
+	DELETE FROM tag_blobs WHERE Hash = old.ContentHash AND NOT EXISTS (SELECT 1 FROM tags WHERE ContentHash = old.ContentHash);
+END;
+
+CREATE TRIGGER tag_stats_delete AFTER DELETE ON tags BEGIN
+	DELETE FROM tag_stats WHERE GuildID = old.GuildID AND TagName = old.TagName;
+END;
+
+-- The rows kept their numbers, but rebuilding makes sure the index matches them.
+INSERT INTO tags_fts (tags_fts) VALUES ('rebuild');
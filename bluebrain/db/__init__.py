@@ -17,4 +17,11 @@
 # Sarker Istiyak Mahmud
 # kiyotaka.ayanokouji.ehou@gmail.com
 
+from .blobs import TagContents
 from .db import Database
+from .pool import ReaderPool
+from .prefixes import Prefixes
+from .settings import GuildSettings
+from .stats import QueryStats
+from .tags import TagIndex, TagStats
+from .transfer import TagTransfer
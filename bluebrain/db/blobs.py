@@ -0,0 +1,128 @@
+# Blue Brain - A Discord bot designed to make your server a safer and better place.
+# Copyright (C) 2020  Sarker Istiyak Mahmud
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Sarker Istiyak Mahmud
+# kiyotaka.ayanokouji.ehou@gmail.com
+
+import asyncio
+import zlib
+from hashlib import sha256
+from typing import NamedTuple
+
+# Bodies at least this many bytes long are compressed, if that makes them smaller.
+COMPRESS_THRESHOLD = 256
+# How many tags `TagContents.convert` moves into blob storage per transaction.
+CONVERT_CHUNK_SIZE = 500
+
+# The next tags `TagContents.convert` has to move into blob storage.
+CONVERT_SQL = "SELECT TagRowID, TagContent FROM tags WHERE ContentHash IS NULL LIMIT ?"
+
+
+class Blob(NamedTuple):
+    hash: str
+    size: int
+    compressed: int
+    content: object
+
+
+def content_hash(content):
+    return sha256(content.encode("utf-8")).hexdigest()
+
+
+def pack(content, threshold=COMPRESS_THRESHOLD):
+    data = content.encode("utf-8")
+    digest = sha256(data).hexdigest()
+
+    if len(data) >= threshold and len(packed := zlib.compress(data, 9)) < len(data):
+        return Blob(digest, len(data), 1, packed)
+
+    return Blob(digest, len(data), 0, content)
+
+
+def inflate(compressed, content):
+    if compressed and content is not None:
+        return zlib.decompress(content).decode("utf-8")
+    return content
+
+
+# Registered on every connection, so SQL (and the search index) can read blob content.
+FUNCTIONS = (("inflate", 2, inflate),)
+
+
+def register(cxn):
+    for name, num_params, func in FUNCTIONS:
+        cxn.create_function(name, num_params, func, deterministic=True)
+
+
+class TagContents:
+    """Stores tag bodies in `tag_blobs`, once per distinct body, and moves legacy `TagContent` values over."""
+
+    def __init__(self, bot, threshold=COMPRESS_THRESHOLD):
+        self.bot = bot
+        self.threshold = threshold
+
+    async def store(self, content):
+        """Stores `content` if it is not stored already, and returns its hash for `tags.ContentHash`.
+
+        Run this in the same transaction as the write that points a tag at the hash. Otherwise another tag with the
+        same body could be deleted or edited in between, and its trigger would drop the blob as unreferenced."""
+        blob = pack(content, self.threshold)
+        await self.bot.db.execute(
+            "INSERT OR IGNORE INTO tag_blobs (Hash, Size, Compressed, Content) VALUES (?, ?, ?, ?)", *blob
+        )
+        return blob.hash
+
+    async def convert(self, chunk_size=CONVERT_CHUNK_SIZE):
+        """Moves every tag still holding its own `TagContent` into blob storage, a chunk at a time.
+
+        Compression happens off the event loop, and each chunk is its own transaction, so other work carries on in
+        between. Returns how many tags were converted."""
+        loop = asyncio.get_running_loop()
+        converted = 0
+
+        while rows := await self.bot.db.records(CONVERT_SQL, chunk_size):
+            blobs = await loop.run_in_executor(None, lambda: [pack(content or "", self.threshold) for _, content in rows])
+
+            async with self.bot.db.transaction():
+                # Tags edited or deleted since the chunk was read are left alone, so their new content isn't overwritten.
+                current = dict(
+                    await self.bot.db.records(
+                        "SELECT TagRowID, TagContent FROM tags WHERE ContentHash IS NULL"
+                        f" AND TagRowID IN ({', '.join('?' * len(rows))})",
+                        *(rowid for rowid, _ in rows),
+                    )
+                )
+                chunk = [
+                    (blob, rowid)
+                    for blob, (rowid, content) in zip(blobs, rows)
+                    if rowid in current and current[rowid] == content
+                ]
+
+                await self.bot.db.executemany(
+                    "INSERT OR IGNORE INTO tag_blobs (Hash, Size, Compressed, Content) VALUES (?, ?, ?, ?)",
+                    [blob for blob, _ in chunk],
+                )
+                await self.bot.db.executemany(
+                    "UPDATE tags SET ContentHash = ?, TagContent = NULL WHERE TagRowID = ? AND ContentHash IS NULL",
+                    [(blob.hash, rowid) for blob, rowid in chunk],
+                )
+
+            converted += len(chunk)
+
+        return converted
+
+    def __repr__(self):
+        return f"<TagContents threshold={self.threshold!r}>"
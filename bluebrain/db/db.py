@@ -17,18 +17,62 @@
 # Sarker Istiyak Mahmud
 # kiyotaka.ayanokouji.ehou@gmail.com
 
+import asyncio
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from os import path
+from time import perf_counter
 
-from aiosqlite import connect
 from apscheduler.triggers.cron import CronTrigger
 
+from . import blobs, migrations
+from .pool import POOL_SIZE, ReaderPool
+from .stats import SLOW_QUERY_THRESHOLD, QueryStats
+
+# A batch is flushed as soon as it holds this many writes...
+BATCH_SIZE = 128
+# ...or this many seconds after its first write was queued, whichever comes first.
+FLUSH_INTERVAL = 0.01
+# How many rows `Database.stream` fetches at a time.
+STREAM_CHUNK_SIZE = 256
+# Every guild the bot is in gets a row in each of these tables...
+SYNC_TABLES = ("system", "gateway", "warn")
+# ...and guilds it has left have their rows removed from each of these.
+PRUNE_TABLES = ("system", "gateway", "warn", "tags", "warns", "entrants")
+
 
 class Database:
-    def __init__(self, bot):
+    def __init__(
+        self,
+        bot,
+        batch_size=BATCH_SIZE,
+        flush_interval=FLUSH_INTERVAL,
+        pool_size=POOL_SIZE,
+        slow_query_threshold=SLOW_QUERY_THRESHOLD,
+    ):
         self.bot = bot
         self.db_path = f"{self.bot._dynamic}/database.db3"
-        self.build_path = f"{self.bot._static}/build.sql"
-        self._calls = 0
+        self.migrations_path = f"{self.bot._static}/migrations"
+        self.schema_version = 0
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.stats = QueryStats(f"{self.bot._dynamic}/slow_queries.log", slow_query_threshold)
+
+        # Reads are spread over a pool of read-only connections.
+        self.readers = ReaderPool(self.db_path, pool_size, blobs.FUNCTIONS)
+
+        # All writes go through a single connection owned by a single thread, so a whole batch costs one hop.
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="bluebrain-db-writer")
+        self.wxn = None
+        self._writes = None
+        self._writer = None
+
+        # Held by whoever is using the writer connection outside of a batch, so nothing else is interleaved with it.
+        self._lock = asyncio.Lock()
+        # The task with an open transaction, and how deeply it is nested.
+        self._owner = None
+        self._depth = 0
 
         self.bot.scheduler.add_job(self.commit, CronTrigger(second=0))
 
@@ -39,78 +83,378 @@ class Database:
 
             makedirs(self.bot._dynamic)
 
-        self.cxn = await connect(self.db_path)
-        await self.execute("pragma journal_mode=wal")
-        await self.executescript(self.build_path)
-        await self.commit()
+        self.wxn = await self._run(sqlite3.connect, self.db_path, isolation_level=None, check_same_thread=False)
+        # The pragma returns a row, and its statement has to be finished before anything can commit.
+        await self._run(lambda: self.wxn.execute("pragma journal_mode=wal").fetchall())
+        await self._run(blobs.register, self.wxn)
+        await self.migrate()
+
+        await self.readers.open()
+
+        self._writes = asyncio.Queue()
+        self._writer = asyncio.create_task(self._write_loop(self._writes))
+
+    async def migrate(self):
+        applied = await self._run(migrations.apply, self.wxn, migrations.discover(self.migrations_path))
+        self.schema_version = await self._run(migrations.schema_version, self.wxn)
+        return applied
 
     async def commit(self):
-        #if self.bot.ready.ok:
+        # Writes are committed as their batch is flushed. This waits for everything queued so far to be flushed,
+        # and records when that happened.
         await self.execute("UPDATE bot SET Value = CURRENT_TIMESTAMP WHERE Key = 'last commit'")
 
-        await self.cxn.commit()
+    async def flush(self):
+        if self._writes is not None:
+            await self._writes.join()
 
     async def close(self):
-        await self.commit()
-        await self.cxn.close()
+        # Closing is safe after a failed or skipped `connect`, such as when shutting down from a failed start.
+        if self._writes is not None:
+            await self.commit()
+
+            # Stop accepting writes, then drain whatever is still queued.
+            writes, self._writes = self._writes, None
+            await writes.join()
+
+        if self._writer is not None:
+            self._writer.cancel()
+            self._writer = None
+
+        await self.readers.close()
+        if self.wxn is not None:
+            await self._run(self.wxn.close)
+            self.wxn = None
+        self._executor.shutdown()
+        self.stats.close()
 
     async def sync(self):
-        # Insert.
-        await self.executemany("INSERT OR IGNORE INTO system (GuildID) VALUES (?)", [(g.id,) for g in (await self.bot.rest.fetch_my_guilds())])
-        await self.executemany(
-            "INSERT OR IGNORE INTO gateway (GuildID) VALUES (?)", [(g.id,) for g in (await self.bot.rest.fetch_my_guilds())]
-        )
-        await self.executemany("INSERT OR IGNORE INTO warn (GuildID) VALUES (?)", [(g.id,) for g in (await self.bot.rest.fetch_my_guilds())])
-
-        # Remove.
-        stored = await self.column("SELECT GuildID FROM system")
-        member_of = [g.id for g in (await self.bot.rest.fetch_my_guilds())]
-        removals = [(g_id,) for g_id in set(stored) - set(member_of)]
-        await self.executemany("DELETE FROM system WHERE GuildID = ?", removals)
-        await self.executemany("DELETE FROM gateway WHERE GuildID = ?", removals)
-        await self.executemany("DELETE FROM warn WHERE GuildID = ?", removals)
-
-        # Commit.
-        await self.commit()
+        """Reconciles the guild tables with the guilds the bot is in, and returns how long each phase took."""
+        timings = {}
 
-    async def field(self, sql, *values):
-        cur = await self.cxn.execute(sql, tuple(values))
-        self._calls += 1
+        start = perf_counter()
+        guild_ids = [g.id for g in await self.bot.rest.fetch_my_guilds()]
+        timings["fetch"] = perf_counter() - start
+
+        # Anything queued before the sync should land before it.
+        await self.flush()
+        async with self._exclusive():
+            timings.update(await self._run(self._reconcile, guild_ids))
+
+        for phase, latency in timings.items():
+            self.stats.record(f"-- sync: {phase}", latency)
+
+        return timings
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Runs everything inside the block as one transaction, with a single commit at the end.
+
+        While the block is open, the current task's statements run immediately on the writer connection, and its
+        reads see its own uncommitted changes. Nested blocks are savepoints, so an exception only undoes the innermost
+        block it escapes from. Other tasks, including ones started inside the block, are not part of the transaction, and
+        their writes wait until the outermost block ends."""
+        async with self._exclusive():
+            savepoint = f"sp_{self._depth}"
+            await self._run(self.wxn.execute, f"SAVEPOINT {savepoint}")
+            self._owner = asyncio.current_task()
+            self._depth += 1
+
+            try:
+                yield self
+            except BaseException:
+                await self._run(self._end_savepoint, savepoint, False)
+                raise
+            else:
+                await self._run(self._end_savepoint, savepoint, True)
+            finally:
+                self._depth -= 1
+                if not self._depth:
+                    self._owner = None
 
-        if (row := await cur.fetchone()) is not None:
+    @property
+    def in_transaction(self):
+        return self._owner is not None and self._owner is asyncio.current_task()
+
+    async def field(self, sql, *values):
+        if (row := await self._read(sql, values, lambda cur: cur.fetchone())) is not None:
             return row[0]
 
     async def record(self, sql, *values):
-        cur = await self.cxn.execute(sql, tuple(values))
-        self._calls += 1
-
-        return await cur.fetchone()
+        return await self._read(sql, values, lambda cur: cur.fetchone())
 
     async def records(self, sql, *values):
-        cur = await self.cxn.execute(sql, tuple(values))
-        self._calls += 1
-
-        return await cur.fetchall()
+        return await self._read(sql, values, lambda cur: cur.fetchall())
 
     async def column(self, sql, *values):
-        cur = await self.cxn.execute(sql, tuple(values))
-        self._calls += 1
+        return [row[0] for row in await self._read(sql, values, lambda cur: cur.fetchall())]
 
-        return [row[0] for row in await cur.fetchall()]
+    async def stream(self, sql, *values, chunk_size=STREAM_CHUNK_SIZE):
+        """Yields rows as they are fetched, `chunk_size` at a time, so only one chunk is ever held in memory.
 
-    async def execute(self, sql, *values):
-        cur = await self.cxn.execute(sql, tuple(values))
-        self._calls += 1
+        A pooled reader is held until the stream is exhausted or closed."""
+        values = tuple(values)
 
-        return cur.rowcount
+        if self.in_transaction:
+            for row in await self._execute_now(sql, values, False, lambda cur: cur.fetchall()):
+                yield row
+            return
 
-    async def executemany(self, sql, valueset):
-        cur = await self.cxn.executemany(sql, valueset)
-        self._calls += 1  # NOTE: Should this be `len(valueset)`?
+        queued = perf_counter()
+        rows = 0
+        latency = 0.0
+
+        async with self.readers.acquire() as cxn:
+            start = perf_counter()
+            cur = await cxn.execute(sql, values)
+            latency += perf_counter() - start
+
+            try:
+                while True:
+                    fetched = perf_counter()
+                    chunk = await cur.fetchmany(chunk_size)
+                    latency += perf_counter() - fetched
+
+                    if not chunk:
+                        break
 
-        return cur.rowcount
+                    rows += len(chunk)
+                    for row in chunk:
+                        yield row
+            finally:
+                await cur.close()
+                self.stats.record(sql, latency, start - queued, rows)
+
+    def enqueue(self, sql, *values):
+        """Queues a write and returns a future that resolves to its row count once the write has been committed.
+
+        Inside a transaction, the write is run straight away instead, and the future resolves once it has run."""
+        return self._enqueue(sql, tuple(values), False)
+
+    def enqueue_many(self, sql, valueset):
+        return self._enqueue(sql, list(valueset), True)
+
+    async def execute(self, sql, *values):
+        return await self.enqueue(sql, *values)
+
+    async def executemany(self, sql, valueset):
+        return await self.enqueue_many(sql, valueset)
 
     async def executescript(self, path):
+        if self.in_transaction:
+            # `executescript` commits whatever is pending before it runs.
+            raise RuntimeError("Scripts can not be run inside a transaction.")
+
         with open(path, "r", encoding="utf-8") as script:
-            await self.cxn.executescript(script.read())
-        self._calls += 1  # NOTE: Should this be different?
+            async with self._exclusive():
+                start = perf_counter()
+                await self._run(self.wxn.executescript, script.read())
+                self.stats.record(f"-- script: {path}", perf_counter() - start)
+
+    async def _read(self, sql, values, fetch):
+        values = tuple(values)
+
+        if self.in_transaction:
+            return await self._execute_now(sql, values, False, fetch)
+
+        queued = perf_counter()
+
+        async with self.readers.acquire() as cxn:
+            start = perf_counter()
+            async with cxn.execute(sql, values) as cur:
+                result = await fetch(cur)
+            latency = perf_counter() - start
+
+            if self.stats.is_slow(latency):
+                async with cxn.execute(f"EXPLAIN QUERY PLAN {sql}", values) as cur:
+                    self.stats.log_slow(sql, latency, start - queued, await cur.fetchall())
+
+        rows = len(result) if isinstance(result, list) else int(result is not None)
+        self.stats.record(sql, latency, start - queued, rows)
+        return result
+
+    def _enqueue(self, sql, values, many):
+        if self._writes is None:
+            raise RuntimeError("The database is not connected.")
+
+        if self.in_transaction:
+            return asyncio.ensure_future(self._execute_now(sql, values, many))
+
+        future = asyncio.get_running_loop().create_future()
+        self._writes.put_nowait((sql, values, many, future, perf_counter()))
+        return future
+
+    async def _run(self, func, *args, **kwargs):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, lambda: func(*args, **kwargs))
+
+    @asynccontextmanager
+    async def _exclusive(self):
+        # The task holding an open transaction already has the writer to itself.
+        if self.in_transaction:
+            yield
+        else:
+            async with self._lock:
+                yield
+
+    async def _execute_now(self, sql, values, many, fetch=None):
+        # Runs a statement on the writer connection as part of the current transaction.
+        start = perf_counter()
+        result, rows = await self._run(self._execute_on_writer, sql, values, many, fetch)
+        latency = perf_counter() - start
+
+        self.stats.record(sql, latency, 0.0, rows)
+        if self.stats.is_slow(latency):
+            plan = await self._run(self._explain, sql, values[0] if many and values else values)
+            self.stats.log_slow(sql, latency, 0.0, plan)
+
+        return result
+
+    async def _write_loop(self, writes):
+        # `close` detaches the queue to turn new writes away while this drains it, so the loop holds its own reference.
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await writes.get()]
+            deadline = loop.time() + self.flush_interval
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(writes.get_nowait())
+                except asyncio.QueueEmpty:
+                    if (timeout := deadline - loop.time()) <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(writes.get(), timeout))
+                    except asyncio.TimeoutError:
+                        break
+
+            try:
+                async with self._lock:
+                    results, timings = await self._run(self._apply, batch)
+
+                for future, result, exc in results:
+                    if future.done():
+                        continue
+                    if exc is not None:
+                        future.set_exception(exc)
+                    else:
+                        future.set_result(result)
+
+                for sql, latency, wait, rows, plan in timings:
+                    self.stats.record(sql, latency, wait, rows)
+                    if plan is not None:
+                        self.stats.log_slow(sql, latency, wait, plan)
+            except Exception as exc:
+                for *_, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(exc)
+            finally:
+                for _ in batch:
+                    writes.task_done()
+
+    def _apply(self, batch):
+        # Runs on the writer thread. Every write in the batch shares one transaction, and so one commit. Each write runs
+        # inside its own savepoint, so one that fails, even partway through an `executemany`, has all of its own changes
+        # rolled back and none of the others'.
+        results = []
+        timings = []
+        cur = self.wxn.cursor()
+        cur.execute("BEGIN")
+
+        for sql, values, many, future, queued in batch:
+            rows = 0
+            start = perf_counter()
+            cur.execute("SAVEPOINT write")
+            try:
+                if many:
+                    cur.executemany(sql, values)
+                else:
+                    cur.execute(sql, values)
+                rows = cur.rowcount
+                cur.execute("RELEASE write")
+                results.append((future, rows, None))
+            except sqlite3.Error as exc:
+                cur.execute("ROLLBACK TO write")
+                cur.execute("RELEASE write")
+                results.append((future, None, exc))
+
+            latency = perf_counter() - start
+            plan = self._explain(sql, values[0] if many and values else values) if self.stats.is_slow(latency) else None
+            timings.append((sql, latency, start - queued, rows, plan))
+
+        start = perf_counter()
+        try:
+            cur.execute("COMMIT")
+        except sqlite3.Error as exc:
+            if self.wxn.in_transaction:
+                cur.execute("ROLLBACK")
+            return [(future, None, exc) for future, *_ in results], timings
+
+        timings.append(("COMMIT", perf_counter() - start, 0.0, 0, None))
+        return results, timings
+
+    def _execute_on_writer(self, sql, values, many, fetch):
+        cur = self.wxn.executemany(sql, values) if many else self.wxn.execute(sql, values)
+
+        if fetch is None:
+            return cur.rowcount, cur.rowcount
+
+        result = fetch(cur)
+        return result, len(result) if isinstance(result, list) else int(result is not None)
+
+    def _end_savepoint(self, savepoint, release):
+        if release:
+            try:
+                # Releasing the outermost savepoint commits the transaction.
+                self.wxn.execute(f"RELEASE {savepoint}")
+                return
+            except sqlite3.Error:
+                self._end_savepoint(savepoint, False)
+                raise
+
+        self.wxn.execute(f"ROLLBACK TO {savepoint}")
+        self.wxn.execute(f"RELEASE {savepoint}")
+
+    def _reconcile(self, guild_ids):
+        # Runs on the writer thread, as one transaction. The guild list is loaded into a temp table so each table is
+        # reconciled with a single statement.
+        timings = {}
+        cur = self.wxn.cursor()
+
+        start = perf_counter()
+        cur.execute("BEGIN")
+        try:
+            cur.execute("CREATE TEMP TABLE IF NOT EXISTS member_of (GuildID integer PRIMARY KEY)")
+            cur.execute("DELETE FROM member_of")
+            cur.executemany("INSERT OR IGNORE INTO member_of (GuildID) VALUES (?)", ((g_id,) for g_id in guild_ids))
+            timings["load"] = perf_counter() - start
+
+            start = perf_counter()
+            for table in SYNC_TABLES:
+                cur.execute(f"INSERT OR IGNORE INTO {table} (GuildID) SELECT GuildID FROM member_of")
+            timings["insert"] = perf_counter() - start
+
+            # An empty guild list is far more likely to be a bad response than the bot having left every guild, and
+            # acting on it would wipe the database.
+            start = perf_counter()
+            if guild_ids:
+                for table in PRUNE_TABLES:
+                    cur.execute(f"DELETE FROM {table} WHERE GuildID NOT IN (SELECT GuildID FROM member_of)")
+            timings["delete"] = perf_counter() - start
+
+            start = perf_counter()
+            cur.execute("DROP TABLE member_of")
+            cur.execute("COMMIT")
+            timings["commit"] = perf_counter() - start
+        except BaseException:
+            if self.wxn.in_transaction:
+                cur.execute("ROLLBACK")
+            raise
+
+        return timings
+
+    def _explain(self, sql, values):
+        try:
+            return self.wxn.execute(f"EXPLAIN QUERY PLAN {sql}", values).fetchall()
+        except sqlite3.Error:
+            return []
@@ -0,0 +1,85 @@
+# Blue Brain - A Discord bot designed to make your server a safer and better place.
+# Copyright (C) 2020  Sarker Istiyak Mahmud
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Sarker Istiyak Mahmud
+# kiyotaka.ayanokouji.ehou@gmail.com
+
+import re
+from pathlib import Path
+from typing import NamedTuple
+
+from . import blobs
+
+MIGRATION_PATTERN = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    path: Path
+
+    @property
+    def script(self):
+        return self.path.read_text(encoding="utf-8")
+
+
+def discover(directory):
+    """Returns every migration in `directory`, ordered by version. Migrations are named `<version>_<name>.sql`."""
+    migrations = []
+
+    for file in Path(directory).iterdir():
+        if (m := MIGRATION_PATTERN.match(file.name)) is not None:
+            migrations.append(Migration(int(m.group(1)), m.group(2), file))
+
+    migrations.sort()
+
+    if len({m.version for m in migrations}) != len(migrations):
+        raise ValueError(f"Two or more migrations in {directory} share a version number.")
+
+    return migrations
+
+
+def schema_version(cxn):
+    return cxn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def apply(cxn, migrations):
+    """Applies each migration newer than the database's `user_version`, each in its own transaction.
+
+    This is blocking, and expects a connection in autocommit mode (`isolation_level=None`). Returns the migrations
+    that were applied.
+
+    The SQL functions in `blobs.FUNCTIONS` are registered on the connection first, since the `tags` triggers, and so
+    any migration writing to `tags`, call them."""
+    blobs.register(cxn)
+    applied = []
+    current = schema_version(cxn)
+
+    for migration in migrations:
+        if migration.version <= current:
+            continue
+
+        try:
+            cxn.executescript(f"BEGIN;\n{migration.script}\nPRAGMA user_version = {migration.version};\nCOMMIT;")
+        except Exception:
+            if cxn.in_transaction:
+                cxn.execute("ROLLBACK")
+            raise
+
+        applied.append(migration)
+        current = migration.version
+
+    return applied
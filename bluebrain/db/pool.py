@@ -0,0 +1,105 @@
+# Blue Brain - A Discord bot designed to make your server a safer and better place.
+# Copyright (C) 2020  Sarker Istiyak Mahmud
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Sarker Istiyak Mahmud
+# kiyotaka.ayanokouji.ehou@gmail.com
+
+import asyncio
+from contextlib import asynccontextmanager
+from pathlib import Path
+from time import perf_counter
+
+from aiosqlite import connect
+
+POOL_SIZE = 4
+
+
+class ReaderPool:
+    """A fixed-size pool of read-only connections.
+
+    Under WAL, readers never block the writer or each other, so SELECTs can run side by side on their own threads
+    rather than queueing behind every other statement on a single connection."""
+
+    def __init__(self, db_path, size=POOL_SIZE, functions=()):
+        self.uri = f"{Path(db_path).resolve().as_uri()}?mode=ro"
+        self.size = size
+        # SQL functions to register on every connection, as (name, number of arguments, callable).
+        self.functions = functions
+        self.acquisitions = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+        self._idle = None
+        self._connections = []
+
+    async def open(self):
+        self._idle = asyncio.Queue()
+
+        for _ in range(self.size):
+            cxn = await connect(self.uri, uri=True)
+            for name, num_params, func in self.functions:
+                await cxn.create_function(name, num_params, func, deterministic=True)
+            self._connections.append(cxn)
+            self._idle.put_nowait(cxn)
+
+    async def close(self):
+        for cxn in self._connections:
+            await cxn.close()
+
+        self._connections.clear()
+        self._idle = None
+
+    @asynccontextmanager
+    async def acquire(self):
+        start = perf_counter()
+        cxn = await self._idle.get()
+        wait = perf_counter() - start
+
+        self.acquisitions += 1
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+
+        try:
+            yield cxn
+        finally:
+            self._idle.put_nowait(cxn)
+
+    @property
+    def idle(self):
+        return self._idle.qsize() if self._idle is not None else 0
+
+    @property
+    def in_use(self):
+        return len(self._connections) - self.idle
+
+    @property
+    def wait_mean(self):
+        return self.wait_total / self.acquisitions if self.acquisitions else 0.0
+
+    @property
+    def metrics(self):
+        return {
+            "size": self.size,
+            "idle": self.idle,
+            "in_use": self.in_use,
+            "acquisitions": self.acquisitions,
+            "wait_total": self.wait_total,
+            "wait_mean": self.wait_mean,
+            "wait_max": self.wait_max,
+        }
+
+    def __repr__(self):
+        return f"<ReaderPool size={self.size!r} in_use={self.in_use!r} wait_mean={self.wait_mean!r}>"
@@ -0,0 +1,54 @@
+# Blue Brain - A Discord bot designed to make your server a safer and better place.
+# Copyright (C) 2020  Sarker Istiyak Mahmud
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Sarker Istiyak Mahmud
+# kiyotaka.ayanokouji.ehou@gmail.com
+
+from bluebrain import Config
+
+
+class Prefixes:
+    """Every guild's prefix, held in memory so resolving a prefix never touches the database.
+
+    The table is loaded in bulk once the database has been synchronised, and is kept current by the prefix config
+    setter and the guild join and leave handlers."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._prefixes = {}
+
+    async def load(self):
+        self._prefixes = dict(await self.bot.db.records("SELECT GuildID, Prefix FROM system"))
+
+    async def refresh(self, guild_id):
+        self._prefixes[guild_id] = await self.bot.db.field("SELECT Prefix FROM system WHERE GuildID = ?", guild_id)
+
+    def get(self, guild_id):
+        if guild_id is None:
+            return Config.DEFAULT_PREFIX
+        return self._prefixes.get(guild_id) or Config.DEFAULT_PREFIX
+
+    def set(self, guild_id, prefix):
+        self._prefixes[guild_id] = prefix
+
+    def remove(self, guild_id):
+        self._prefixes.pop(guild_id, None)
+
+    def __len__(self):
+        return len(self._prefixes)
+
+    def __repr__(self):
+        return f"<Prefixes guilds={len(self)!r}>"
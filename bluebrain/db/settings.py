@@ -0,0 +1,165 @@
+# Blue Brain - A Discord bot designed to make your server a safer and better place.
+# Copyright (C) 2020  Sarker Istiyak Mahmud
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Sarker Istiyak Mahmud
+# kiyotaka.ayanokouji.ehou@gmail.com
+
+from collections import OrderedDict
+
+MAX_GUILDS = 10_000
+
+COLUMNS = {
+    "system": (
+        "GuildName",
+        "RunFTS",
+        "Prefix",
+        "DefaultLogChannelID",
+        "LogChannelID",
+        "DefaultAdminRoleID",
+        "AdminRoleID",
+    ),
+    "gateway": (
+        "Active",
+        "RulesChannelID",
+        "GateMessageID",
+        "BlockingRoleID",
+        "MemberRoleIDs",
+        "ExceptionRoleIDs",
+        "WelcomeChannelID",
+        "GoodbyeChannelID",
+        "Timeout",
+        "GateText",
+        "WelcomeText",
+        "WelcomeBotText",
+        "GoodbyeText",
+        "GoodbyeBotText",
+    ),
+    "warn": (
+        "WarnRoleID",
+        "MaxPoints",
+        "MaxStrikes",
+        "RetroUpdates",
+    ),
+}
+
+LOAD_SQL = "SELECT {} FROM system LEFT JOIN gateway USING (GuildID) LEFT JOIN warn USING (GuildID) WHERE GuildID = ?".format(
+    ", ".join(f"{table}.{column}" for table, columns in COLUMNS.items() for column in columns)
+)
+
+
+class GuildSettings:
+    """A write-through cache of each guild's `system`, `gateway`, and `warn` rows.
+
+    A guild's settings are loaded with a single query the first time they are needed, and kept in memory until the
+    guild falls out of the cache. All writes to these tables should go through `update` so the cache never goes
+    stale."""
+
+    def __init__(self, bot, max_guilds=MAX_GUILDS):
+        self.bot = bot
+        self.max_guilds = max_guilds
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._guilds = OrderedDict()
+        # Bumped by every write to or invalidation of a guild, so a load that raced one knows its row is stale.
+        self._versions = {}
+        self._generation = 0
+
+    async def load(self, guild_id):
+        while True:
+            version = self._version(guild_id)
+            record = await self.bot.db.record(LOAD_SQL, guild_id)
+            if self._version(guild_id) == version:
+                break
+
+        values = iter(record or [None] * sum(len(c) for c in COLUMNS.values()))
+        settings = {table: {column: next(values) for column in columns} for table, columns in COLUMNS.items()}
+
+        # Guilds without a row yet are not cached, so their settings are picked up as soon as the row is made.
+        if record is None:
+            return settings
+
+        self._guilds[guild_id] = settings
+        self._guilds.move_to_end(guild_id)
+
+        while len(self._guilds) > self.max_guilds:
+            self._guilds.popitem(last=False)
+            self.evictions += 1
+
+        return settings
+
+    async def guild(self, guild_id):
+        if (settings := self._guilds.get(guild_id)) is not None:
+            self.hits += 1
+            self._guilds.move_to_end(guild_id)
+            return settings
+
+        self.misses += 1
+        return await self.load(guild_id)
+
+    async def get(self, guild_id, table, column):
+        return (await self.guild(guild_id))[table][column]
+
+    async def update(self, guild_id, table, **values):
+        if any(column not in COLUMNS[table] for column in values):
+            raise ValueError(f"Invalid column(s) for the {table} table: {', '.join(values)}.")
+
+        try:
+            await self.bot.db.execute(
+                f"UPDATE {table} SET {', '.join(f'{column} = ?' for column in values)} WHERE GuildID = ?",
+                *values.values(),
+                guild_id,
+            )
+        finally:
+            self._bump(guild_id)
+
+        if (settings := self._guilds.get(guild_id)) is not None:
+            settings[table].update(values)
+
+    def invalidate(self, guild_id):
+        self._guilds.pop(guild_id, None)
+        self._bump(guild_id)
+
+    def clear(self):
+        self._guilds.clear()
+        self._generation += 1
+
+    def _version(self, guild_id):
+        return self._generation, self._versions.get(guild_id, 0)
+
+    def _bump(self, guild_id):
+        self._versions[guild_id] = self._versions.get(guild_id, 0) + 1
+
+    @property
+    def hit_ratio(self):
+        return self.hits / (self.hits + self.misses) if self.hits or self.misses else 0.0
+
+    def __len__(self):
+        return len(self._guilds)
+
+    def __contains__(self, guild_id):
+        return guild_id in self._guilds
+
+    def __repr__(self):
+        return (
+            f"<GuildSettings"
+            f" guilds={len(self)!r}"
+            f" max_guilds={self.max_guilds!r}"
+            f" hits={self.hits!r}"
+            f" misses={self.misses!r}"
+            f" evictions={self.evictions!r}>"
+        )
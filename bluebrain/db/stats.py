@@ -0,0 +1,143 @@
+# Blue Brain - A Discord bot designed to make your server a safer and better place.
+# Copyright (C) 2020  Sarker Istiyak Mahmud
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Sarker Istiyak Mahmud
+# kiyotaka.ayanokouji.ehou@gmail.com
+
+import logging
+from collections import deque
+from datetime import datetime
+from logging.handlers import QueueListener
+from queue import SimpleQueue
+
+# Statements slower than this many seconds are written to the slow query log.
+SLOW_QUERY_THRESHOLD = 0.1
+# How many recent latencies are kept per statement to estimate percentiles.
+SAMPLE_SIZE = 1024
+
+
+def template(sql):
+    return " ".join(sql.split())
+
+
+class StatementStats:
+    __slots__ = ("template", "calls", "rows", "time", "wait", "max", "_samples")
+
+    def __init__(self, template):
+        self.template = template
+        self.calls = 0
+        self.rows = 0
+        self.time = 0.0
+        self.wait = 0.0
+        self.max = 0.0
+        self._samples = deque(maxlen=SAMPLE_SIZE)
+
+    def add(self, latency, wait, rows):
+        self.calls += 1
+        self.rows += rows
+        self.time += latency
+        self.wait += wait
+        self.max = max(self.max, latency)
+        self._samples.append(latency)
+
+    def percentile(self, pct):
+        if not self._samples:
+            return 0.0
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    @property
+    def p50(self):
+        return self.percentile(50)
+
+    @property
+    def p99(self):
+        return self.percentile(99)
+
+    def __repr__(self):
+        return (
+            f"<StatementStats"
+            f" template={self.template!r}"
+            f" calls={self.calls!r}"
+            f" rows={self.rows!r}"
+            f" p50={self.p50!r}"
+            f" p99={self.p99!r}>"
+        )
+
+
+class QueryStats:
+    """Per-statement call counts, row counts, latencies, and wait times, plus a log of slow statements."""
+
+    def __init__(self, log_path, threshold=SLOW_QUERY_THRESHOLD):
+        self.log_path = log_path
+        self.threshold = threshold
+        self._statements = {}
+
+        # Slow statements are appended to the log by a background thread, so logging one never blocks the event loop.
+        self._queue = SimpleQueue()
+        self._listener = None
+
+    def is_slow(self, latency):
+        return latency >= self.threshold
+
+    def record(self, sql, latency, wait=0.0, rows=0):
+        key = template(sql)
+
+        if (stats := self._statements.get(key)) is None:
+            stats = self._statements[key] = StatementStats(key)
+
+        stats.add(latency, wait, rows)
+
+    def log_slow(self, sql, latency, wait, plan):
+        lines = [
+            f"[{datetime.utcnow().isoformat(' ', 'seconds')}] {latency * 1_000:,.1f} ms"
+            f" (waited {wait * 1_000:,.1f} ms): {template(sql)}",
+            *(f"    {detail}" for *_, detail in plan),
+        ]
+
+        if self._listener is None:
+            self._listener = QueueListener(self._queue, logging.FileHandler(self.log_path, encoding="utf-8", delay=True))
+            self._listener.start()
+
+        self._queue.put_nowait(logging.makeLogRecord({"msg": "\n".join(lines)}))
+
+    def close(self):
+        # Waits for everything already logged to be written.
+        if self._listener is not None:
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            self._listener = None
+
+    @property
+    def calls(self):
+        return sum(s.calls for s in self._statements.values())
+
+    @property
+    def statements(self):
+        return list(self._statements.values())
+
+    def top(self, limit=10, key="time"):
+        return sorted(self._statements.values(), key=lambda s: getattr(s, key), reverse=True)[:limit]
+
+    def reset(self):
+        self._statements.clear()
+
+    def __len__(self):
+        return len(self._statements)
+
+    def __repr__(self):
+        return f"<QueryStats statements={len(self)!r} calls={self.calls!r}>"
@@ -0,0 +1,240 @@
+# Blue Brain - A Discord bot designed to make your server a safer and better place.
+# Copyright (C) 2020  Sarker Istiyak Mahmud
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+# Sarker Istiyak Mahmud
+# kiyotaka.ayanokouji.ehou@gmail.com
+
+
+import asyncio
+import codecs
+import io
+import json
+from string import ascii_lowercase
+from typing import NamedTuple
+
+from bluebrain.db.blobs import pack
+
+# How many tags are written per `executemany` while importing.
+IMPORT_CHUNK_SIZE = 500
+# How many bytes of an import held in memory are decoded at a time.
+READ_SIZE = 64 * 1024
+# Tag names longer than this, or bodies too long to send in one message, are not imported.
+MAX_NAME_LENGTH = 25
+MAX_CONTENT_LENGTH = 2_000
+POLICIES = ("skip", "overwrite", "rename")
+
+EXPORT_SQL = (
+    "SELECT tags.TagName, coalesce(tags.TagContent, inflate(tag_blobs.Compressed, tag_blobs.Content)), tags.UserID,"
+    " tags.TagID, tags.TagTime FROM tags LEFT JOIN tag_blobs ON tag_blobs.Hash = tags.ContentHash"
+    " WHERE tags.GuildID = ? ORDER BY tags.TagName"
+)
+BLOB_SQL = "INSERT OR IGNORE INTO tag_blobs (Hash, Size, Compressed, Content) VALUES (?, ?, ?, ?)"
+NAMES_SQL = "SELECT TagName FROM tags WHERE GuildID = ?"
+CREATE_SQL = "INSERT INTO tags (GuildID, UserID, TagID, TagName, ContentHash) VALUES (?, ?, ?, ?, ?)"
+OVERWRITE_SQL = "UPDATE tags SET ContentHash = ?, TagContent = NULL WHERE GuildID = ? AND TagName = ?"
+
+
+class ImportResult(NamedTuple):
+    created: int = 0
+    overwritten: int = 0
+    renamed: int = 0
+    skipped: int = 0
+    invalid: int = 0
+
+
+def parse_line(line, max_name_length=MAX_NAME_LENGTH):
+    """Returns the `(name, content)` pair held by one line of an export, or `None` if it does not hold a valid tag."""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+
+    if not isinstance(record, dict):
+        return None
+
+    name, content = record.get("name"), record.get("content")
+    if not isinstance(name, str) or not isinstance(content, str):
+        return None
+
+    name = name.lower()
+    if not 0 < len(name) <= max_name_length or any(c not in ascii_lowercase for c in name):
+        return None
+
+    if not 0 < len(content) <= MAX_CONTENT_LENGTH:
+        return None
+
+    return name, content
+
+
+def free_name(name, taken, max_name_length=MAX_NAME_LENGTH):
+    """Returns `name` with the shortest letter suffix ("a", "b", ..., "z", "aa", ...) that is not in `taken`."""
+    n = 0
+    while True:
+        n += 1
+        suffix, i = "", n
+        while i:
+            i, r = divmod(i - 1, 26)
+            suffix = ascii_lowercase[r] + suffix
+
+        if len(suffix) >= max_name_length:
+            return None
+
+        if (candidate := name[: max_name_length - len(suffix)] + suffix) not in taken:
+            return candidate
+
+
+async def read_lines(data, chunk_size=IMPORT_CHUNK_SIZE):
+    """Yields the lines of `data`, a `bytes` object or an async iterable of byte chunks, `chunk_size` lines at a time.
+
+    The bytes are decoded as they arrive, so neither the decoded text nor its full list of lines is ever held at once."""
+    if isinstance(data, (bytes, bytearray)):
+        data = _pieces(data)
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending, lines = "", []
+
+    async for raw in data:
+        *complete, pending = (pending + decoder.decode(raw)).split("\n")
+        lines.extend(complete)
+
+        while len(lines) >= chunk_size:
+            yield lines[:chunk_size]
+            del lines[:chunk_size]
+
+    if pending := pending + decoder.decode(b"", final=True):
+        lines.append(pending)
+    if lines:
+        yield lines
+
+
+async def _pieces(data):
+    for i in range(0, len(data), READ_SIZE):
+        yield bytes(data[i : i + READ_SIZE])
+
+
+class TagTransfer:
+    """Moves a guild's tags in and out as JSON Lines, one tag per line.
+
+    Exports are streamed from the database into memory, so they can be sent as an attachment without touching disk.
+    Imports are decoded, checked, and compressed a chunk at a time before anything is written, then written a chunk at a
+    time, all inside one transaction, so a failed import leaves nothing behind."""
+
+    def __init__(self, bot, chunk_size=IMPORT_CHUNK_SIZE):
+        self.bot = bot
+        self.chunk_size = chunk_size
+        self._last_id = None
+
+    async def export(self, guild_id):
+        """Returns every tag in the guild as JSON Lines, and how many tags were written."""
+        buffer = io.BytesIO()
+        count = 0
+
+        async for name, content, user_id, tag_id, tag_time in self.bot.db.stream(EXPORT_SQL, guild_id):
+            record = {"name": name, "content": content, "owner": user_id, "id": tag_id, "created": tag_time}
+            buffer.write(json.dumps(record, ensure_ascii=False).encode("utf-8") + b"\n")
+            count += 1
+
+        return buffer.getvalue(), count
+
+    async def import_(self, guild_id, user_id, data, policy="skip", max_name_length=MAX_NAME_LENGTH):
+        """Creates a tag, owned by `user_id`, for every line of `data`, which can be `bytes` or an async iterable of
+        byte chunks.
+
+        `policy` decides what happens to a tag whose name is already taken: "skip" leaves the existing tag alone,
+        "overwrite" replaces its content but keeps its owner, and "rename" creates it under the first free name with a
+        letter suffix. Lines that do not hold a valid tag are counted and skipped."""
+        if policy not in POLICIES:
+            raise ValueError(f"Invalid conflict policy: {policy}.")
+
+        loop = asyncio.get_running_loop()
+        counts = dict.fromkeys(ImportResult._fields, 0)
+
+        def parse(lines):
+            parsed = []
+
+            for line in lines:
+                if not line.strip():
+                    continue
+
+                if (tag := parse_line(line, max_name_length)) is None:
+                    counts["invalid"] += 1
+                    continue
+
+                name, content = tag
+                parsed.append((name, pack(content)))
+
+            return parsed
+
+        parsed = []
+        async for lines in read_lines(data, self.chunk_size):
+            # Parsing and compression happen off the event loop, and before the transaction takes the writer, so the
+            # writer is only held for the writes themselves. The attachment's size caps how much is held here.
+            parsed.extend(await loop.run_in_executor(None, parse, lines))
+
+        created = []
+
+        async with self.bot.db.transaction():
+            # Names are checked against the table itself, so tags made since the import started are seen too.
+            taken = set(await self.bot.db.column(NAMES_SQL, guild_id))
+
+            for i in range(0, len(parsed), self.chunk_size):
+                creates, overwrites, blobs = [], [], {}
+
+                for name, blob in parsed[i : i + self.chunk_size]:
+                    if name in taken:
+                        if policy == "skip":
+                            counts["skipped"] += 1
+                            continue
+
+                        if policy == "overwrite":
+                            blobs[blob.hash] = blob
+                            overwrites.append((blob.hash, guild_id, name))
+                            counts["overwritten"] += 1
+                            continue
+
+                        if (name := free_name(name, taken, max_name_length)) is None:
+                            counts["skipped"] += 1
+                            continue
+
+                        counts["renamed"] += 1
+                    else:
+                        counts["created"] += 1
+
+                    taken.add(name)
+                    blobs[blob.hash] = blob
+                    creates.append((guild_id, user_id, self._generate_id(), name, blob.hash))
+
+                await self.bot.db.executemany(BLOB_SQL, list(blobs.values()))
+                await self.bot.db.executemany(CREATE_SQL, creates)
+                await self.bot.db.executemany(OVERWRITE_SQL, overwrites)
+                created.extend((name, tag_id) for _, _, tag_id, name, _ in creates)
+
+        # Only once the import has been committed does the index learn of its tags.
+        for name, tag_id in created:
+            self.bot.tag_index.add(guild_id, name, tag_id, user_id)
+
+        return ImportResult(**counts)
+
+    def _generate_id(self):
+        # IDs come from the clock, as they do for `tags new`, and two tags made within one tick must not share one.
+        while (tag_id := self.bot.generate_id()) == self._last_id:
+            pass
+
+        self._last_id = tag_id
+        return tag_id
+
+    def __repr__(self):
+        return f"<TagTransfer chunk_size={self.chunk_size!r}>"
@@ -22,10 +22,14 @@ SUCCESS_ICON = "https://cdn.discordapp.com/attachments/710177462989881415/738066
 SUPPORT_GUILD_INVITE_LINK = "https://discord.gg/c3b4cZs"
 
 # Dependant on constants above.
+from .bans import BanIndex
 from .embed import EmbedConstructor
-#from .emoji import EmojiGetter
+from .emoji import EmojiRegistry
 from .loc import CodeCounter
+from .members import MemberIndex
 from .presence import PresenceSetter
 from .ready import Ready
-from .search import Search
+from .registry import CommandRegistry
+from .resolver import EntityResolver
+from .search import Search, SearchIndex
 from .oauth_url import oauth_url 
\ No newline at end of file
@@ -0,0 +1,128 @@
+import asyncio
+from collections import OrderedDict
+
+MAX_GUILDS = 1_000
+
+
+class GuildBans:
+    """One guild's banned users, by ID and by name."""
+
+    __slots__ = ("_users", "_names")
+
+    def __init__(self, users=()):
+        self._users = {}
+        # Both "name#discriminator" and the bare username map to the IDs holding them.
+        self._names = {}
+
+        for user in users:
+            self.add(user)
+
+    @staticmethod
+    def _keys(user):
+        return (str(user), user.username)
+
+    def add(self, user):
+        self.remove(user.id)
+        self._users[user.id] = user
+        for key in self._keys(user):
+            self._names.setdefault(key, {})[user.id] = None
+
+    def remove(self, user_id):
+        if (user := self._users.pop(user_id, None)) is not None:
+            for key in self._keys(user):
+                if (ids := self._names.get(key)) is not None:
+                    ids.pop(user_id, None)
+                    if not ids:
+                        del self._names[key]
+
+    def get(self, user_id):
+        return self._users.get(user_id)
+
+    def find(self, arg):
+        """Returns the banned user with the ID, "name#discriminator", or username `arg`."""
+        if arg.isdigit() and (user := self._users.get(int(arg))) is not None:
+            return user
+
+        if ids := self._names.get(arg):
+            return self._users[next(iter(ids))]
+
+    def __len__(self):
+        return len(self._users)
+
+    def __contains__(self, user_id):
+        return user_id in self._users
+
+
+class BanIndex:
+    """Every guild's bans, so banned users can be looked up without pulling the ban list each time.
+
+    A guild's bans are fetched once, the first time they are needed, and kept current by ban create and delete
+    events. Events arriving while the list is still being fetched are applied on top of it."""
+
+    def __init__(self, bot, max_guilds=MAX_GUILDS):
+        self.bot = bot
+        self.max_guilds = max_guilds
+        self.hits = 0
+        self.misses = 0
+
+        self._guilds = OrderedDict()
+        self._loading = {}
+
+    async def load(self, guild_id):
+        # Everyone asking for a guild's bans while they are in flight waits on the same request.
+        if guild_id not in self._loading:
+            bans, unbanned = GuildBans(), set()
+            task = asyncio.ensure_future(self._fetch(guild_id, bans, unbanned))
+            self._loading[guild_id] = (task, bans, unbanned)
+            task.add_done_callback(lambda _: self._loading.pop(guild_id, None))
+
+        return await asyncio.shield(self._loading[guild_id][0])
+
+    async def _fetch(self, guild_id, bans, unbanned):
+        # `unbanned` holds users unbanned while the list was in flight, who may still be in it.
+        for ban in await self.bot.rest.fetch_bans(guild_id):
+            if ban.user.id not in unbanned and ban.user.id not in bans:
+                bans.add(ban.user)
+
+        self._guilds[guild_id] = bans
+        self._guilds.move_to_end(guild_id)
+
+        while len(self._guilds) > self.max_guilds:
+            self._guilds.popitem(last=False)
+
+        return bans
+
+    async def guild(self, guild_id):
+        if (bans := self._guilds.get(guild_id)) is not None:
+            self.hits += 1
+            self._guilds.move_to_end(guild_id)
+            return bans
+
+        self.misses += 1
+        return await self.load(guild_id)
+
+    async def find(self, guild_id, arg):
+        return (await self.guild(guild_id)).find(arg)
+
+    def invalidate(self, guild_id):
+        self._guilds.pop(guild_id, None)
+
+    async def on_ban_create(self, event):
+        if (bans := self._guilds.get(event.guild_id)) is not None:
+            bans.add(event.user)
+        elif (loading := self._loading.get(event.guild_id)) is not None:
+            loading[1].add(event.user)
+            loading[2].discard(event.user.id)
+
+    async def on_ban_delete(self, event):
+        if (bans := self._guilds.get(event.guild_id)) is not None:
+            bans.remove(event.user.id)
+        elif (loading := self._loading.get(event.guild_id)) is not None:
+            loading[1].remove(event.user.id)
+            loading[2].add(event.user.id)
+
+    def __len__(self):
+        return len(self._guilds)
+
+    def __repr__(self):
+        return f"<BanIndex guilds={len(self)!r} max_guilds={self.max_guilds!r} hits={self.hits!r} misses={self.misses!r}>"
@@ -19,7 +19,7 @@ def bot_has_booted():
         if not ctx.bot.ready.booted:
             hub = ctx.bot.get_plugin("Hub")
             if (sc := getattr(hub, "stdout_channel", None)) is not None:
-                await sc.send(f"{(await ctx.bot.cross)} Blue Brain is still booting and is not ready to receive commands. Please try again later.")
+                await sc.send(f"{ctx.bot.cross} Blue Brain is still booting and is not ready to receive commands. Please try again later.")
             raise BotHasNotBooted()
         return True
 
@@ -54,7 +54,7 @@ def bot_is_ready():
         if not ctx.bot.ready.ok:
             hub = ctx.bot.get_plugin("Hub")
             if (sc := getattr(hub, "stdout_channel", None)) is not None:
-                await sc.send(f"{(await ctx.bot.cross)} Blue Brain is still performing some start-up procedures. Please try again later.")
+                await sc.send(f"{ctx.bot.cross} Blue Brain is still performing some start-up procedures. Please try again later.")
             raise BotIsNotReady()
         return True
 
@@ -3,8 +3,6 @@ import re
 import hikari
 import lightbulb
 
-from bluebrain.utils import Search
-
 import datetime
 from operator import attrgetter
 from typing import (
@@ -140,52 +138,25 @@ class Guild(Converter):
 
 class Command(Converter):
     async def convert(self, ctx, arg):
-        if (c := ctx.bot.get_command(arg)) is not None:
+        # Qualified names and aliases, subcommands included, all resolve through the registry.
+        if (c := ctx.bot.commands_registry.get(arg)) is not None:
             return c
-        else:
-            # Check for subcommands.
-            for cmd in ctx.bot.walk_commands():
-                if arg == f"{cmd.parent.name} {cmd.name}":
-                    return cmd
         raise hikari.NotFoundError
 
 
 class SearchedMember(Converter):
     async def convert(self, ctx, arg):
-        obj_list = []
-
-        for m in ctx.get_guild().get_members():
-            obj_list.append((await ctx.bot.rest.fetch_user(m)))
+        # Resolved from the member cache, by mention, ID, username, or nickname.
+        guild = ctx.get_guild()
 
-        async def grab_object(x):
-            person = await ctx.bot.rest.fetch_user(x)
-            return person.username
-
-        if (
-            member := get(
-                obj_list,
-                username=str(Search(arg, [(await grab_object(m)) for m in ctx.get_guild().get_members()]).best(min_accuracy=0.75)),
-            )
-        ) is None:
+        if (member_id := ctx.bot.members.find(guild.id, arg)) is None or (member := guild.get_member(member_id)) is None:
             raise hikari.NotFoundError
-        print(member)
-        print(member.username)
-        print(member.id)
-        return member
+        return member.user
 
 
 class BannedUser(Converter):
     async def convert(self, ctx, arg):
-        if ctx.guild.me.guild_permissions.ban_members:
-            if arg.isdigit():
-                try:
-                    return (await ctx.bot.rest.fetch_ban(guild=ctx.guild, user=Object(id=int(arg)))).user
-                except hikari.NotFoundError:
-                    raise hikari.BadRequestError
-
-            banned = [e.user for e in await ctx.guild.bans()]
-            if banned:
-                if (user := find(lambda u: str(u) == arg, banned)) is not None:
-                    return user
-                else:
-                    raise hikari.NotFoundError
\ No newline at end of file
+        # Looked up in the guild's ban index, by ID, "name#discriminator", or username.
+        if (user := await ctx.bot.bans.find(ctx.get_guild().id, arg)) is None:
+            raise hikari.NotFoundError
+        return user
\ No newline at end of file
@@ -0,0 +1,72 @@
+from bluebrain import Config
+
+# The hub's emoji the bot refers to by name. Anything else in the hub is still found by its own name or ID.
+EMOJI = {
+    "info": 796345797112365107,
+    "confirm": 832160810738253834,
+    "cancel": 832160894079074335,
+    "exit": 796315251360137276,
+    "stepback": 830402919110672416,
+    "pageback": 830402884830494721,
+    "pagenext": 830402902044442634,
+    "stepnext": 830402938831634492,
+}
+
+
+class EmojiRegistry:
+    """The hub guild's emoji, by ID and by name, so replies and menus never fetch the hub to draw one.
+
+    The emoji are loaded once at startup, from the gateway cache if the hub is already in it and from the REST API
+    otherwise, and replaced whenever an emoji update event arrives for the hub."""
+
+    def __init__(self, bot, guild_id=None):
+        self.bot = bot
+        self.guild_id = guild_id or Config.HUB_GUILD_ID
+        self.loads = 0
+
+        self._ids = {}
+        self._names = {}
+
+    async def load(self):
+        if not (emojis := list(self.bot.cache.get_emojis_view_for_guild(self.guild_id).values())):
+            emojis = await self.bot.rest.fetch_guild_emojis(self.guild_id)
+
+        self.update(emojis)
+
+        if missing := [name for name, emoji_id in EMOJI.items() if emoji_id not in self._ids]:
+            print(f" Missing hub emoji: {', '.join(missing)}.")
+
+    def update(self, emojis):
+        self._ids = {emoji.id: emoji for emoji in emojis}
+        self._names = {emoji.name: emoji for emoji in emojis}
+        self.loads += 1
+
+    def get(self, key):
+        """Returns the hub emoji with the ID or name `key`."""
+        if isinstance(key, int) or key.isdigit():
+            return self._ids.get(int(key))
+
+        if (emoji_id := EMOJI.get(key)) is not None and (emoji := self._ids.get(emoji_id)) is not None:
+            return emoji
+
+        return self._names.get(key)
+
+    def mention(self, key):
+        if (emoji := self.get(key)) is not None:
+            return emoji.mention
+
+        # An emoji deleted from the hub shouldn't break the message it was meant for.
+        return f":{key}:"
+
+    async def on_emojis_update(self, event):
+        if event.guild_id == self.guild_id:
+            self.update(event.emojis)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __repr__(self):
+        return f"<EmojiRegistry guild_id={self.guild_id!r} emoji={len(self)!r} loads={self.loads!r}>"
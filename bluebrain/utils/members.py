@@ -0,0 +1,118 @@
+import re
+from collections import OrderedDict
+
+from bluebrain.utils.search import SearchIndex
+
+MAX_GUILDS = 1_000
+# How names are matched, and how closely, before a member is picked from one.
+SCORER = "position"
+MIN_ACCURACY = 0.75
+
+MENTION_REGEX = re.compile(r"<@!?(\d+)>|(\d{15,21})")
+
+
+class GuildMembers:
+    """One guild's member names, each member holding a slot for their username and, if they have one, their nickname."""
+
+    __slots__ = ("index", "_slots", "_owners")
+
+    def __init__(self, members=()):
+        # Members come and go too often for NumPy's array, rebuilt after every change, to pay off.
+        self.index = SearchIndex((), numpy_threshold=float("inf"), scorer=SCORER)
+        self._slots = {}
+        self._owners = {}
+
+        for member in members:
+            self.add(member)
+
+    def add(self, member):
+        self.remove(member.id)
+
+        slots = self._slots[member.id] = []
+        for name in dict.fromkeys(n for n in (member.username, member.nickname) if n):
+            slot = self.index.add(name)
+            slots.append(slot)
+            self._owners[slot] = member.id
+
+    def remove(self, member_id):
+        for slot in self._slots.pop(member_id, ()):
+            self.index.remove(slot)
+            del self._owners[slot]
+
+    def find(self, name, min_accuracy=MIN_ACCURACY):
+        if name and (match := self.index.top(name)) and match[0][0] >= min_accuracy:
+            return self._owners[match[0][1]]
+
+    @property
+    def stale(self):
+        # Past this, holes left by departed or renamed members cost more to skip than a rebuild does.
+        return self.index.holes > len(self.index)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, member_id):
+        return member_id in self._slots
+
+
+class MemberIndex:
+    """Every cached member's names, per guild, so members can be found by name without touching the REST API.
+
+    A guild's names are read from the member cache the first time it is searched. Member create, update, and delete
+    events keep indexed guilds current."""
+
+    def __init__(self, bot, max_guilds=MAX_GUILDS):
+        self.bot = bot
+        self.max_guilds = max_guilds
+        self.hits = 0
+        self.misses = 0
+
+        self._guilds = OrderedDict()
+
+    def load(self, guild_id):
+        members = self._guilds[guild_id] = GuildMembers(self.bot.cache.get_members_view_for_guild(guild_id).values())
+        self._guilds.move_to_end(guild_id)
+
+        while len(self._guilds) > self.max_guilds:
+            self._guilds.popitem(last=False)
+
+        return members
+
+    def guild(self, guild_id):
+        if (members := self._guilds.get(guild_id)) is not None and not members.stale:
+            self.hits += 1
+            self._guilds.move_to_end(guild_id)
+            return members
+
+        self.misses += 1
+        return self.load(guild_id)
+
+    def find(self, guild_id, arg, min_accuracy=MIN_ACCURACY):
+        """Returns the ID of the member `arg` mentions, or whose username or nickname best matches it."""
+        if (match := MENTION_REGEX.fullmatch(arg.strip())) is not None:
+            member_id = int(match.group(1) or match.group(2))
+            if self.bot.cache.get_member(guild_id, member_id) is not None:
+                return member_id
+
+        return self.guild(guild_id).find(arg, min_accuracy)
+
+    def invalidate(self, guild_id):
+        self._guilds.pop(guild_id, None)
+
+    async def on_member_create(self, event):
+        if (members := self._guilds.get(event.guild_id)) is not None:
+            members.add(event.member)
+
+    async def on_member_update(self, event):
+        if (members := self._guilds.get(event.guild_id)) is not None:
+            members.add(event.member)
+
+    async def on_member_delete(self, event):
+        if (members := self._guilds.get(event.guild_id)) is not None:
+            members.remove(event.user_id)
+
+    def __len__(self):
+        return len(self._guilds)
+
+    def __repr__(self):
+        return f"<MemberIndex guilds={len(self)!r} max_guilds={self.max_guilds!r} hits={self.hits!r} misses={self.misses!r}>"
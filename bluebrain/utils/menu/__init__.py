@@ -1 +1 @@
-from .menus import MultiPageMenu, NumberedSelectionMenu, SelectionMenu
\ No newline at end of file
+from .menus import LazyMultiPageMenu, MultiPageMenu, NumberedSelectionMenu, SelectionMenu
\ No newline at end of file
@@ -148,4 +148,57 @@ class MultiPageMenu(Menu):
             f" delete_after={self.delete_after!r}"
             f" delete_invoke_after={self.delete_invoke_after!r}"
             f" message={self.message!r}>"
-        )
\ No newline at end of file
+        )
+
+
+class LazyMultiPageMenu(MultiPageMenu):
+    """A `MultiPageMenu` whose pages are only built when they are first viewed.
+
+    `build_page` is awaited with a page number, and must return that page's pagemap."""
+
+    def __init__(
+        self,
+        ctx,
+        page_count,
+        build_page,
+        *,
+        delete_after=False,
+        delete_invoke_after=None,
+        timeout=300.0,
+        auto_exit=True,
+        check=None,
+    ):
+        super().__init__(
+            ctx,
+            [None] * page_count,
+            delete_after=delete_after,
+            delete_invoke_after=delete_invoke_after,
+            timeout=timeout,
+            auto_exit=auto_exit,
+            check=check,
+        )
+        self.build_page = build_page
+
+    async def load_page(self, page):
+        if (pagemap := self.selector.pagemaps[page]) is None:
+            pagemap = self.selector.pagemaps[page] = await self.build_page(page)
+        return pagemap
+
+    async def start(self):
+        self.pagemap = await self.load_page(0)
+        return await super().start()
+
+    async def switch(self, emoji_name, emoji_id):
+        await self.load_page(self.selector.page)
+        await super().switch(emoji_name, emoji_id)
+
+    def __repr__(self):
+        return (
+            f"<LazyMultiPageMenu"
+            f" timeout={self.timeout!r}"
+            f" auto_exit={self.auto_exit!r}"
+            f" check={self.check!r}"
+            f" delete_after={self.delete_after!r}"
+            f" delete_invoke_after={self.delete_invoke_after!r}"
+            f" message={self.message!r}>"
+        )
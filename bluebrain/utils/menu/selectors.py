@@ -2,7 +2,6 @@ import hikari
 from datetime import timedelta
 from asyncio import TimeoutError
 
-from bluebrain import Config
 from bluebrain.utils import chron
 
 
@@ -32,10 +31,11 @@ class Selector:
 
     async def _serve(self):
         await self.menu.message.remove_all_reactions()
-        emoji = await self.menu.bot.rest.fetch_guild(Config.HUB_GUILD_ID)
 
         for e in self.selection:
-            await self.menu.message.add_reaction(emoji.get_emoji(int(e)))
+            # An emoji deleted from the hub can't be reacted with, but the rest of the menu still works.
+            if (emoji := self.menu.bot.emoji.get(e)) is not None:
+                await self.menu.message.add_reaction(emoji)
 
     async def response(self):
         await self._serve()
@@ -106,9 +106,8 @@ class NumericalSelector(Selector):
         return f"Page {self.page + 1:,} of {self.max_page:,}"
 
     @property
-    async def table(self):
-        emoji = await self.menu.bot.rest.fetch_guild(Config.HUB_GUILD_ID)
-        return "\n".join(f"{emoji.get_emoji(k).mention} {v}" for k, v in self.pages[self.page].items())
+    def table(self):
+        return "\n".join(f"{self.menu.bot.emoji.mention(k)} {v}" for k, v in self.pages[self.page].items())
 
     def set_selection(self):
         s = self._base_selection.copy()
@@ -5,11 +5,12 @@ from bluebrain.utils.modules import retrieve
 
 async def gateway(ctx):
     async with ctx.get_channel().trigger_typing():
+        settings = (await ctx.bot.settings.guild(ctx.get_guild().id))["gateway"]
         active, rc_id, br_id, gt = (
-            await ctx.bot.db.record(
-                "SELECT Active, RulesChannelID, BlockingRoleID, GateText FROM gateway WHERE GuildID = ?", ctx.get_guild().id
-            )
-            or [None] * 4
+            settings["Active"],
+            settings["RulesChannelID"],
+            settings["BlockingRoleID"],
+            settings["GateText"],
         )
 
         perm = lightbulb.utils.permissions_for(
@@ -39,16 +40,11 @@ async def gateway(ctx):
                 or f"**Attention:** Do you accept the rules outlined above? If you do, select {ctx.bot.emoji.mention('confirm')}, otherwise select {ctx.bot.emoji.mention('cancel')}."
             )
             
-            emoji = []
-            emoji.append(ctx.bot.cache.get_emoji(832160810738253834))
-            emoji.append(ctx.bot.cache.get_emoji(832160894079074335))
-            
-            for em in emoji:
-                await gm.add_reaction(em)
+            for em in ("confirm", "cancel"):
+                if (emoji := ctx.bot.emoji.get(em)) is not None:
+                    await gm.add_reaction(emoji)
 
-            await ctx.bot.db.execute(
-                "UPDATE gateway SET Active = 1, GateMessageID = ? WHERE GuildID = ?", gm.id, ctx.get_guild().id
-            )
+            await ctx.bot.settings.update(ctx.get_guild().id, "gateway", Active=1, GateMessageID=gm.id)
             await ctx.respond(f"{ctx.bot.tick} The gateway module has been activated.")
             lc = await retrieve.log_channel(ctx.bot, ctx.get_guild().id)
             await lc.send(f"{ctx.bot.info} The gateway module has been activated.")
@@ -21,7 +21,7 @@ MAX_STRIKES = 9
 
 
 async def system__runfts(ctx, channel, value):
-    await ctx.bot.db.execute("UPDATE system SET RunFTS = ? WHERE GuildID = ?", value, channel.guild_id)
+    await ctx.bot.settings.update(channel.guild_id, "system", RunFTS=value)
 
 
 async def system__prefix(ctx, channel, value):
@@ -34,7 +34,8 @@ async def system__prefix(ctx, channel, value):
             f"{bot.cross} The server prefix must be no longer than {MAX_PREFIX_LEN} characters in length."
         )
     else:
-        await ctx.bot.db.execute("UPDATE system SET Prefix = ? WHERE GuildID = ?", value, channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "system", Prefix=value)
+        ctx.bot.prefixes.set(channel.guild_id, value)
         await channel.send(f"{bot.tick} The server prefix has been set to {value}.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The server prefix has been set to {value}.")
@@ -60,7 +61,7 @@ async def system__logchannel(ctx, channel, value):
             f"{bot.cross} The given channel can not be used as the log channel as Solaris can not send messages to it."
         )
     else:
-        await ctx.bot.db.execute("UPDATE system SET LogChannelID = ? WHERE GuildID = ?", value.id, channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "system", LogChannelID=value.id)
         await channel.send(f"{bot.tick} The log channel has been set to {value.mention}.")
         await value.send(
             (
@@ -95,7 +96,7 @@ async def system__adminrole(ctx, channel, value):
             f"{bot.cross} The given role can not be used as the admin role as it is above Solaris' top role in the role hierarchy."
         )
     else:
-        await ctx.bot.db.execute("UPDATE system SET AdminRoleID = ? WHERE GuildID = ?", value.id, channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "system", AdminRoleID=value.id)
         await channel.send(f"{bot.tick} The admin role has been set to {value.mention}.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The admin role has been set to {value.mention}.")
@@ -110,7 +111,7 @@ async def system__adminrole(ctx, channel, value):
 
 
 async def gateway__active(ctx, channel, value):
-    await ctx.bot.db.execute("UPDATE gateway SET Active = ? WHERE GuildID = ?", value, channel.guild_id)
+    await ctx.bot.settings.update(channel.guild_id, "gateway", Active=value)
 
 
 async def gateway__ruleschannel(ctx, channel, value):
@@ -138,7 +139,7 @@ async def gateway__ruleschannel(ctx, channel, value):
             f"{bot.cross} The given channel can not be used as the rules channel as Solaris can not send messages to it or manage exising messages there."
         )
     else:
-        await ctx.bot.db.execute("UPDATE gateway SET RulesChannelID = ? WHERE GuildID = ?", value.id, channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", RulesChannelID=value.id)
         await channel.send(
             f"{bot.tick} The rules channel has been set to {value.mention}. Make sure this is the first channel new members see when they join."
         )
@@ -148,9 +149,9 @@ async def gateway__ruleschannel(ctx, channel, value):
 
 async def gateway__gatemessage(ctx, channel, value):
     if value is not None:
-        await ctx.bot.db.execute("UPDATE gateway SET GateMessageID = ? WHERE GuildID = ?", value.id, channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", GateMessageID=value.id)
     else:
-        await ctx.bot.db.execute("UPDATE gateway SET GateMessageID = NULL WHERE GuildID = ?", channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", GateMessageID=None)
 
 
 async def gateway__blockingrole(ctx, channel, value):
@@ -172,7 +173,7 @@ async def gateway__blockingrole(ctx, channel, value):
             f"{bot.cross} The given role can not be used as the blocking role as it is above Solaris' top role in the role hierarchy."
         )
     else:
-        await ctx.bot.db.execute("UPDATE gateway SET BlockingRoleID = ? WHERE GuildID = ?", value.id, channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", BlockingRoleID=value.id)
         await channel.send(
             f"{bot.tick} The blocking role has been set to {value.mention}. Make sure the permissions are set correctly."
         )
@@ -190,7 +191,7 @@ async def gateway__memberroles(ctx, channel, values):
     if (br := await retrieve.gateway__blockingrole(ctx.bot, channel.guild_id)) is None:
         await channel.send(f"{bot.cross} You need to set the blocking role before you can set the member roles.")
     elif values[0] is None:
-        await ctx.bot.db.execute("UPDATE gateway SET MemberRoleIDs = NULL WHERE GuildID = ?", channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", MemberRoleIDs=None)
         await channel.send(f"{bot.tick} The member roles have been reset.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The member roles have been reset.")
@@ -209,10 +210,10 @@ async def gateway__memberroles(ctx, channel, values):
             f"{bot.cross} One or more given roles can not be used as member roles as they are above Solaris' top role in the role hierarchy."
         )
     else:
-        await ctx.bot.db.execute(
-            "UPDATE gateway SET MemberRoleIDs = ? WHERE GuildID = ?",
-            ",".join(f"{v.id}" for v in values),
+        await ctx.bot.settings.update(
             channel.guild_id,
+            "gateway",
+            MemberRoleIDs=",".join(f"{v.id}" for v in values),
         )
         await channel.send(
             f"{bot.tick} The member roles have been set to {string.list_of([v.mention for v in values])}. Make sure the permissions are set correctly."
@@ -229,7 +230,7 @@ async def gateway__exceptionroles(ctx, channel, values):
     if (br := await retrieve.gateway__blockingrole(ctx.bot, channel.guild_id)) is None:
         await channel.send(f"{bot.cross} You need to set the blocking role before you can set the exception roles.")
     elif values[0] is None:
-        await ctx.bot.db.execute("UPDATE gateway SET ExceptionRoleIDs = NULL WHERE GuildID = ?", channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", ExceptionRoleIDs=None)
         await channel.send(f"{bot.tick} The exception roles have been reset.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The exception roles have been reset.")
@@ -244,10 +245,10 @@ async def gateway__exceptionroles(ctx, channel, values):
     elif any(v == br for v in values):
         await channel.send(f"{bot.cross} No exception roles can be the same as the blocking role.")
     else:
-        await ctx.bot.db.execute(
-            "UPDATE gateway SET ExceptionRoleIDs = ? WHERE GuildID = ?",
-            ",".join(f"{v.id}" for v in values),
+        await ctx.bot.settings.update(
             channel.guild_id,
+            "gateway",
+            ExceptionRoleIDs=",".join(f"{v.id}" for v in values),
         )
         await channel.send(
             f"{bot.tick} The exception roles have been set to {string.list_of([v.mention for v in values])}."
@@ -274,7 +275,7 @@ async def gateway__welcomechannel(ctx, channel, value):
     if (rc := await retrieve.gateway__ruleschannel(ctx.bot, channel.guild_id)) is None:
         await channel.send(f"{bot.cross} You need to set the rules channel before you can set the welcome channel.")
     elif value is None:
-        await ctx.bot.db.execute("UPDATE gateway SET WelcomeChannelID = NULL WHERE GuildID = ?", channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", WelcomeChannelID=None)
         await channel.send(
             f"{bot.tick} The welcome channel has been reset. Solaris will stop sending welcome messages."
         )
@@ -289,7 +290,7 @@ async def gateway__welcomechannel(ctx, channel, value):
             f"{bot.cross} The given channel can not be used as the welcome channel as Solaris can not send messages to it."
         )
     else:
-        await ctx.bot.db.execute("UPDATE gateway SET WelcomeChannelID = ? WHERE GuildID = ?", value.id, channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", WelcomeChannelID=value.id)
         await channel.send(f"{bot.tick} The welcome channel has been set to {value.mention}.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The welcome channel has been set to {value.mention}.")
@@ -311,7 +312,7 @@ async def gateway__goodbyechannel(ctx, channel, value):
     if (rc := await retrieve.gateway__ruleschannel(ctx.bot, channel.guild_id)) is None:
         await channel.send(f"{bot.cross} You need to set the rules channel before you can set the goodbye channel.")
     elif value is None:
-        await ctx.bot.db.execute("UPDATE gateway SET GoodbyeChannelID = NULL WHERE GuildID = ?", channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", GoodbyeChannelID=None)
         await channel.send(
             f"{bot.tick} The goodbye channel has been reset. Solaris will stop sending goodbye messages."
         )
@@ -326,7 +327,7 @@ async def gateway__goodbyechannel(ctx, channel, value):
             f"{bot.cross} The given channel can not be used as the goodbye channel as Solaris can not send messages to it."
         )
     else:
-        await ctx.bot.db.execute("UPDATE gateway SET GoodbyeChannelID = ? WHERE GuildID = ?", value.id, channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", GoodbyeChannelID=value.id)
         await channel.send(f"{bot.tick} The goodbye channel has been set to {value.mention}.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The goodbye channel has been set to {value.mention}.")
@@ -336,7 +337,7 @@ async def gateway__timeout(ctx, channel, value):
     """The gateway timeout
     The amount of time Solaris gives new members to react to the gate message before being kicked. This is set in minutes, and can be set to any value between 1 and 60 inclusive. If no timeout is set, the default is 5 minutes. This can be reset at any time by passing no arguments to the command below."""
     if value is None:
-        await ctx.bot.db.execute("UPDATE gateway SET Timeout = NULL WHERE GuildID = ?", channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", Timeout=None)
         await channel.send(f"{bot.tick} The timeout has been reset.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The timeout has been reset.")
@@ -347,7 +348,7 @@ async def gateway__timeout(ctx, channel, value):
             f"{bot.cross} The timeout must be between {MIN_TIMEOUT} and {MAX_TIMEOUT} minutes inclusive."
         )
     else:
-        await ctx.bot.db.execute("UPDATE gateway SET Timeout = ? WHERE GuildID = ?", value * 60, channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", Timeout=value * 60)
         await channel.send(
             f"{bot.tick} The timeout has been set to {value} minute(s). This will only apply to members who enter the server from now."
         )
@@ -359,7 +360,7 @@ async def gateway__gatetext(ctx, channel, value):
     """The gate message text
     The message displayed in the gate message. The message can be up to 250 characters in length, and should **not** contain the server rules. If no message is set, a default will be used instead. The message can be reset at any time by passing no arguments to the command below."""
     if value is None:
-        await ctx.bot.db.execute("UPDATE gateway SET GateText = NULL WHERE GuildID = ?", channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", GateText=None)
         await channel.send(
             f"{bot.tick} The gate message text has been reset. The module needs to be restarted for these changes to take effect."
         )
@@ -374,7 +375,7 @@ async def gateway__gatetext(ctx, channel, value):
     elif not string.text_is_formattible(value):
         await channel.send(f"{bot.cross} The given message is not formattible (probably unclosed brace).")
     else:
-        await ctx.bot.db.execute("UPDATE gateway SET GateText = ? WHERE GuildID = ?", value, channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", GateText=value)
         await channel.send(
             f"{bot.tick} The gate message text has been set. The module needs to be restarted for these changes to take effect."
         )
@@ -386,7 +387,7 @@ async def gateway__welcometext(ctx, channel, value):
     """The welcome message text
     The message sent to the welcome channel (if set) when a new member accepts the server rules. This message can be up to 1,000 characters in length. If no message is set, a default will be used instead. The message can be reset at any time by passing no arguments to the command below."""
     if value is None:
-        await ctx.bot.db.execute("UPDATE gateway SET WelcomeText = NULL WHERE GuildID = ?", channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", WelcomeText=None)
         await channel.send(f"{bot.tick} The welcome message text has been reset.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The welcome message text has been reset.")
@@ -399,7 +400,7 @@ async def gateway__welcometext(ctx, channel, value):
     elif not string.text_is_formattible(value):
         await channel.send(f"{bot.cross} The given message is not formattible (probably unclosed brace).")
     else:
-        await ctx.bot.db.execute("UPDATE gateway SET WelcomeText = ? WHERE GuildID = ?", value, channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", WelcomeText=value)
         await channel.send(f"{bot.tick} The welcome message text has been set.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The welcome message text has been set to the following: {value}")
@@ -409,7 +410,7 @@ async def gateway__goodbyetext(ctx, channel, value):
     """The goodbye message text
     The message sent to the goodbye channel (if set) when a member leaves the server. This message can be up to 1,000 characters in length. If no message is set, a default will be used instead. The message can be reset at any time by passing no arguments to the command below."""
     if value is None:
-        await ctx.bot.db.execute("UPDATE gateway SET GoodbyeText = NULL WHERE GuildID = ?", channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", GoodbyeText=None)
         await channel.send(f"{bot.tick} The goodbye message text has been reset.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The goodbye message text has been reset.")
@@ -422,7 +423,7 @@ async def gateway__goodbyetext(ctx, channel, value):
     elif not string.text_is_formattible(value):
         await channel.send(f"{bot.cross} The given message is not formattible (probably unclosed brace).")
     else:
-        await ctx.bot.db.execute("UPDATE gateway SET GoodbyeText = ? WHERE GuildID = ?", value, channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", GoodbyeText=value)
         await channel.send(f"{bot.tick} The goodbye message text has been set.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The goodbye message text has been set to the following: {value}")
@@ -432,7 +433,7 @@ async def gateway__welcomebottext(ctx, channel, value):
     """The welcome message text for bots
     The message sent to the welcome channel (if set) when a bot joins the server. This message can be up to 500 characters in length. If no message is set, a default will be used instead. The message can be reset at any time by passing no arguments to the command below."""
     if value is None:
-        await ctx.bot.db.execute("UPDATE gateway SET WelcomeBotText = NULL WHERE GuildID = ?", channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", WelcomeBotText=None)
         await channel.send(f"{bot.tick} The welcome bot message text has been reset.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The welcome bot message text has been reset.")
@@ -445,7 +446,7 @@ async def gateway__welcomebottext(ctx, channel, value):
     elif not string.text_is_formattible(value):
         await channel.send(f"{bot.cross} The given message is not formattible (probably unclosed brace).")
     else:
-        await ctx.bot.db.execute("UPDATE gateway SET WelcomeBotText = ? WHERE GuildID = ?", value, channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", WelcomeBotText=value)
         await channel.send(f"{bot.tick} The welcome bot message text has been set.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The welcome bot message text has been set to the following: {value}")
@@ -455,7 +456,7 @@ async def gateway__goodbyebottext(ctx, channel, value):
     """The goodbye message text for bots
     The message sent to the goodbye channel (if set) when a bot leaves the server. This message can be up to 500 characters in length. If no message is set, a default will be used instead. The message can be reset at any time by passing no arguments to the command below."""
     if value is None:
-        await ctx.bot.db.execute("UPDATE gateway SET GoodbyeBotText = NULL WHERE GuildID = ?", channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", GoodbyeBotText=None)
         await channel.send(f"{bot.tick} The goodbye bot message text has been reset.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The goodbye bot message text has been reset.")
@@ -468,7 +469,7 @@ async def gateway__goodbyebottext(ctx, channel, value):
     elif not string.text_is_formattible(value):
         await channel.send(f"{bot.cross} The given message is not formattible (probably unclosed brace).")
     else:
-        await ctx.bot.db.execute("UPDATE gateway SET GoodbyeBotText = ? WHERE GuildID = ?", value, channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "gateway", GoodbyeBotText=value)
         await channel.send(f"{bot.tick} The goodbye bot message text has been set.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The goodbye bot message text has been set to the following: {value}")
@@ -478,7 +479,7 @@ async def warn__warnrole(ctx, channel, value):
     """The warn role
     The role that members need to have in order to warn other members, typically a moderator or staff role. If this is not set, only server administrators will be able to warn members. This can be reset at any time by passing no arguments to the command below."""
     if value is None:
-        await ctx.bot.db.execute("UPDATE warn SET WarnRoleID = NULL WHERE GuildID = ?", channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "warn", WarnRoleID=None)
         await channel.send(f"{bot.tick} The warn role has been reset.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The warn role has been reset.")
@@ -489,7 +490,7 @@ async def warn__warnrole(ctx, channel, value):
     elif value.name == "@here":
         await channel.send(f"{bot.cross} The here role can not be used as the warn role.")
     else:
-        await ctx.bot.db.execute("UPDATE warn SET WarnRoleID = ? WHERE GuildID = ?", value.id, channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "warn", WarnRoleID=value.id)
         await channel.send(f"{bot.tick} The warn role has been set to {value.mention}.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The warn role has been set to {value.mention}.")
@@ -499,7 +500,7 @@ async def warn__maxpoints(ctx, channel, value):
     """The max points total
     The number of points a member needs in total to get banned from a warning. This can be set to any value between 5 and 99 inclusive. If no value is set, the default is 12. This can be reset at any time by passing no arguments to the command below."""
     if value is None:
-        await ctx.bot.db.execute("UPDATE warn SET MaxPoints = NULL WHERE GuildID = ?", channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "warn", MaxPoints=None)
         await channel.send(f"{bot.tick} The max points total has been reset.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The max points total has been reset.")
@@ -510,7 +511,7 @@ async def warn__maxpoints(ctx, channel, value):
             f"{bot.cross} The max points total must be between {MIN_POINTS} and {MAX_POINTS} inclusive."
         )
     else:
-        await ctx.bot.db.execute("UPDATE warn SET MaxPoints = ? WHERE GuildID = ?", value, channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "warn", MaxPoints=value)
         await channel.send(
             f"{bot.tick} The max points total has been set to {value}. Members currently at or exceeding this total will not be retroactively banned."
         )
@@ -522,7 +523,7 @@ async def warn__maxstrikes(ctx, channel, value):
     """The max strikes per offence
     The number of times a member needs to be warned of a particular offence to get banned from a warning. This is per offence, and not a total number of strikes. This can be set to any value between 1 and 9 inclusive. If no value is set, the default is 3. This can be reset at any time by passing no arguments to the command below."""
     if value is None:
-        await ctx.bot.db.execute("UPDATE warn SET MaxStrikes = NULL WHERE GuildID = ?", channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "warn", MaxStrikes=None)
         await channel.send(f"{bot.tick} The max strikes per offence has been reset.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The max strikes per offence has been reset.")
@@ -533,7 +534,7 @@ async def warn__maxstrikes(ctx, channel, value):
             f"{bot.cross} The max strikes per offence must be between {MIN_STRIKES} and {MAX_STRIKES} inclusive."
         )
     else:
-        await ctx.bot.db.execute("UPDATE warn SET MaxStrikes = ? WHERE GuildID = ?", value, channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "warn", MaxStrikes=value)
         await channel.send(
             f"{bot.tick} The max strikes per offence has been set to {value}. Members currently at or exceeding this total will not be retroactively banned."
         )
@@ -549,7 +550,7 @@ async def warn__retroupdates(ctx, channel, value):
     elif not 0 <= value <= 1:
         await channel.send(f"{bot.cross} The retroactive updates toggle must be either 0 or 1.")
     else:
-        await ctx.bot.db.execute("UPDATE warn SET RetroUpdates = ? WHERE GuildID = ?", value, channel.guild_id)
+        await ctx.bot.settings.update(channel.guild_id, "warn", RetroUpdates=value)
         await channel.send(f"{bot.tick} The retroactive updates toggle has been set to {value}.")
         lc = await retrieve.log_channel(ctx.bot, channel.guild_id)
         await lc.send(f"{bot.info} The retroactive updates toggle has been set to {value}.")
@@ -5,9 +5,8 @@ from bluebrain.utils.modules import retrieve
 
 async def gateway(ctx):
     async with ctx.get_channel().trigger_typing():
-        active, rc_id, gm_id = await ctx.bot.db.record(
-            "SELECT Active, RulesChannelID, GateMessageID FROM gateway WHERE GuildID = ?", ctx.get_guild().id
-        )
+        settings = (await ctx.bot.settings.guild(ctx.get_guild().id))["gateway"]
+        active, rc_id, gm_id = settings["Active"], settings["RulesChannelID"], settings["GateMessageID"]
 
         if not active:
             await ctx.respond(f"{ctx.bot.cross} The gateway module is already inactive.")
@@ -19,9 +18,7 @@ async def gateway(ctx):
                 pass
 
             await ctx.bot.db.execute("DELETE FROM entrants WHERE GuildID = ?", ctx.get_guild().id)
-            await ctx.bot.db.execute(
-                "UPDATE gateway SET Active = 0, GateMessageID = NULL WHERE GuildID = ?", ctx.get_guild().id
-            )
+            await ctx.bot.settings.update(ctx.get_guild().id, "gateway", Active=0, GateMessageID=None)
 
             await ctx.respond(f"{ctx.bot.tick} The gateway module has been deactivated.")
             lc = await retrieve.log_channel(ctx.bot, ctx.get_guild().id)
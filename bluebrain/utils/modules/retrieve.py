@@ -2,23 +2,23 @@ import hikari
 
 
 async def system__runfts(bot, guild_id):
-    return await bot.db.field("SELECT RunFTS FROM system WHERE GuildID = ?", guild_id)
+    return await bot.settings.get(guild_id, "system", "RunFTS")
 
 
 async def system__prefix(bot, guild_id):
-    return await bot.db.field("SELECT Prefix FROM system WHERE GuildID = ?", guild_id)
+    return await bot.settings.get(guild_id, "system", "Prefix")
 
 
 async def system__defaultlogchannel(bot, guild_id):
     try:
-        return bot.cache.get_guild_channel(await bot.db.field("SELECT DefaultLogChannelID FROM system WHERE GuildID = ?", guild_id))
+        return bot.cache.get_guild_channel(await bot.settings.get(guild_id, "system", "DefaultLogChannelID"))
     except Exception:
         return None
 
 
 async def system__logchannel(bot, guild_id):
     try:
-        return bot.cache.get_guild_channel(await bot.db.field("SELECT LogChannelID FROM system WHERE GuildID = ?", guild_id))
+        return bot.cache.get_guild_channel(await bot.settings.get(guild_id, "system", "LogChannelID"))
     except Exception:
         return None
 
@@ -30,34 +30,33 @@ async def log_channel(bot, guild_id):
 
 async def system__defaultadminrole(bot, guild_id):
     try:
-        return bot.cache.get_role(await bot.db.field("SELECT DefaultAdminRoleID FROM system WHERE GuildID = ?", guild_id))
+        return bot.cache.get_role(await bot.settings.get(guild_id, "system", "DefaultAdminRoleID"))
     except Exception:
         return None
 
 
 async def system__adminrole(bot, guild_id):
     try:
-        return bot.cache.get_role(await bot.db.field("SELECT AdminRoleID FROM system WHERE GuildID = ?", guild_id))
+        return bot.cache.get_role(await bot.settings.get(guild_id, "system", "AdminRoleID"))
     except Exception:
         return None
 
 
 async def gateway__active(bot, guild_id):
-    return bool(await bot.db.field("SELECT Active FROM gateway WHERE GuildID = ?", guild_id))
+    return bool(await bot.settings.get(guild_id, "gateway", "Active"))
 
 
 async def gateway__ruleschannel(bot, guild_id):
     try:
-        return bot.cache.get_guild_channel(await bot.db.field("SELECT RulesChannelID FROM gateway WHERE GuildID = ?", guild_id))
+        return bot.cache.get_guild_channel(await bot.settings.get(guild_id, "gateway", "RulesChannelID"))
     except Exception:
         return None
 
 
 async def gateway__gatemessage(bot, guild_id):
     try:
-        rc_id, gm_id = await bot.db.record(
-            "SELECT RulesChannelID, GateMessageID FROM gateway WHERE GuildID = ?", guild_id
-        )
+        settings = await bot.settings.guild(guild_id)
+        rc_id, gm_id = settings["gateway"]["RulesChannelID"], settings["gateway"]["GateMessageID"]
         return await bot.rest.fetch_channel(rc_id).fetch_message(gm_id)
     except hikari.NotFoundError:
         return None
@@ -65,20 +64,20 @@ async def gateway__gatemessage(bot, guild_id):
 
 async def gateway__blockingrole(bot, guild_id):
     try:
-        return bot.cache.get_role(int(await bot.db.field("SELECT BlockingRoleID FROM gateway WHERE GuildID = ?", guild_id)))
+        return bot.cache.get_role(int(await bot.settings.get(guild_id, "gateway", "BlockingRoleID")))
     except Exception:
         return None
 
 
 async def gateway__memberroles(bot, guild_id):
-    if ids := await bot.db.field("SELECT MemberRoleIDs FROM gateway WHERE GuildID = ?", guild_id):
+    if ids := await bot.settings.get(guild_id, "gateway", "MemberRoleIDs"):
         return [guild.get_role(int(id_)) for id_ in ids.split(",")]
     else:
         return []
 
 
 async def gateway__exceptionroles(bot, guild_id):
-    if ids := await bot.db.field("SELECT ExceptionRoleIDs FROM gateway WHERE GuildID = ?", guild_id):
+    if ids := await bot.settings.get(guild_id, "gateway", "ExceptionRoleIDs"):
         return [guild.get_role(int(id_)) for id_ in ids.split(",")]
     else:
         return []
@@ -86,56 +85,56 @@ async def gateway__exceptionroles(bot, guild_id):
 
 async def gateway__welcomechannel(bot, guild_id):
     try:
-        return bot.cache.get_guild_channel(await bot.db.field("SELECT WelcomeChannelID FROM gateway WHERE GuildID = ?", guild_id))
+        return bot.cache.get_guild_channel(await bot.settings.get(guild_id, "gateway", "WelcomeChannelID"))
     except Exception:
         return None
 
 
 async def gateway__goodbyechannel(bot, guild_id):
     try:
-        return bot.cache.get_guild_channel(await bot.db.field("SELECT GoodbyeChannelID FROM gateway WHERE GuildID = ?", guild_id))
+        return bot.cache.get_guild_channel(await bot.settings.get(guild_id, "gateway", "GoodbyeChannelID"))
     except Exception:
         return None
 
 
 async def gateway__timeout(bot, guild_id):
-    return await bot.db.field("SELECT Timeout FROM gateway WHERE GuildID = ?", guild_id)
+    return await bot.settings.get(guild_id, "gateway", "Timeout")
 
 
 async def gateway__gatetext(bot, guild_id):
-    return await bot.db.field("SELECT GateText FROM gateway WHERE GuildID = ?", guild_id)
+    return await bot.settings.get(guild_id, "gateway", "GateText")
 
 
 async def gateway__welcometext(bot, guild_id):
-    return await bot.db.field("SELECT WelcomeText FROM gateway WHERE GuildID = ?", guild_id)
+    return await bot.settings.get(guild_id, "gateway", "WelcomeText")
 
 
 async def gateway__goodbyetext(bot, guild_id):
-    return await bot.db.field("SELECT GoodbyeText FROM gateway WHERE GuildID = ?", guild_id)
+    return await bot.settings.get(guild_id, "gateway", "GoodbyeText")
 
 
 async def gateway__welcomebottext(bot, guild_id):
-    return await bot.db.field("SELECT WelcomeBotText FROM gateway WHERE GuildID = ?", guild.id)
+    return await bot.settings.get(guild_id, "gateway", "WelcomeBotText")
 
 
 async def gateway__goodbyebottext(bot, guild_id):
-    return await bot.db.field("SELECT GoodbyeBotText FROM gateway WHERE GuildID = ?", guild_id)
+    return await bot.settings.get(guild_id, "gateway", "GoodbyeBotText")
 
 
 async def warn__warnrole(bot, guild_id):
     try:
-        return bot.cache.get_role(await bot.db.field("SELECT WarnRoleID FROM warn WHERE GuildID = ?", guild_id))
+        return bot.cache.get_role(await bot.settings.get(guild_id, "warn", "WarnRoleID"))
     except Exception:
         return None
 
 
 async def warn__maxpoints(bot, guild_id):
-    return await bot.db.field("SELECT MaxPoints FROM warn WHERE GuildID = ?", guild_id)
+    return await bot.settings.get(guild_id, "warn", "MaxPoints")
 
 
 async def warn__maxstrikes(bot, guild_id):
-    return await bot.db.field("SELECT MaxStrikes FROM warn WHERE GuildID = ?", guild_id)
+    return await bot.settings.get(guild_id, "warn", "MaxStrikes")
 
 
 async def warn__retroupdates(bot, guild_id):
-    return await bot.db.field("SELECT RetroUpdates FROM warn WHERE GuildID = ?", guild_id)
+    return await bot.settings.get(guild_id, "warn", "RetroUpdates")
@@ -0,0 +1,59 @@
+class CommandRegistry:
+    """Every command by qualified name and alias, and every plugin's commands, as of the last plugin change.
+
+    Blue_Bot refreshes the snapshot whenever a plugin is added or removed, which is whenever an extension is loaded or
+    unloaded, so looking up a command or a plugin's commands never walks the command tree."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.refreshes = 0
+
+        self._commands = {}
+        self._plugins = {}
+
+    @staticmethod
+    def _key(name):
+        # Commands are matched case insensitively, and however the words of a qualified name are spaced.
+        return " ".join(name.split()).lower()
+
+    def _names(self, command):
+        names = [command.name, *getattr(command, "aliases", ())]
+        if command.parent is None:
+            return names
+        return [f"{parent} {name}" for parent in self._names(command.parent) for name in names]
+
+    def refresh(self):
+        commands = {}
+        for command in self.bot.walk_commands():
+            for name in self._names(command):
+                commands.setdefault(self._key(name), command)
+
+        self._commands = commands
+        self._plugins = {
+            name.lower(): (plugin, list(plugin.walk_commands())) for name, plugin in self.bot.plugins.items()
+        }
+        self.refreshes += 1
+
+    def get(self, name):
+        return self._commands.get(self._key(name))
+
+    def plugin(self, name):
+        """Returns the plugin called `name`, and its commands."""
+        return self._plugins.get(name.lower(), (None, []))
+
+    @property
+    def names(self):
+        return list(self._commands)
+
+    @property
+    def plugins(self):
+        return self._plugins
+
+    def __len__(self):
+        return len(self._commands)
+
+    def __contains__(self, name):
+        return self._key(name) in self._commands
+
+    def __repr__(self):
+        return f"<CommandRegistry names={len(self)!r} plugins={len(self._plugins)!r} refreshes={self.refreshes!r}>"
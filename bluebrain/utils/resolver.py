@@ -0,0 +1,117 @@
+import time
+from collections import OrderedDict
+
+import hikari
+
+MAX_ENTRIES = 10_000
+# How long, in seconds, fetched objects are reused, and how long IDs that fetched nothing are remembered as missing.
+TTL = 300
+NEGATIVE_TTL = 60
+
+KINDS = ("user", "channel", "guild")
+
+
+class TTLCache:
+    """An LRU whose entries expire a while after they are stored. Misses are stored as `None`, and expire sooner."""
+
+    def __init__(self, max_entries=MAX_ENTRIES, ttl=TTL, negative_ttl=NEGATIVE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        """Returns whether `key` is stored, and its value."""
+        if (entry := self._entries.get(key)) is None:
+            return False, None
+
+        expires, value = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return False, None
+
+        self._entries.move_to_end(key)
+        return True, value
+
+    def set(self, key, value):
+        self._entries[key] = (time.monotonic() + (self.ttl if value is not None else self.negative_ttl), value)
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class EntityResolver:
+    """Resolves users, channels, and guilds by ID, touching the REST API only when nothing else knows of them.
+
+    The gateway cache is checked first, then recently fetched objects, then IDs recently found not to exist. Only after
+    all three does a request go out, and its result, found or not, is remembered."""
+
+    def __init__(self, bot, max_entries=MAX_ENTRIES, ttl=TTL, negative_ttl=NEGATIVE_TTL):
+        self.bot = bot
+        self._caches = {kind: TTLCache(max_entries, ttl, negative_ttl) for kind in KINDS}
+        self._counts = {kind: dict.fromkeys(("gateway", "cached", "negative", "fetched"), 0) for kind in KINDS}
+
+    async def user(self, arg):
+        return await self._resolve("user", arg, self.bot.cache.get_user, self.bot.rest.fetch_user)
+
+    async def channel(self, arg):
+        return await self._resolve("channel", arg, self.bot.cache.get_guild_channel, self.bot.rest.fetch_channel)
+
+    async def guild(self, arg):
+        return await self._resolve("guild", arg, self.bot.cache.get_guild, self.bot.rest.fetch_guild)
+
+    async def _resolve(self, kind, arg, from_gateway, fetch):
+        try:
+            entity_id = int(arg)
+        except (TypeError, ValueError):
+            return None
+
+        counts = self._counts[kind]
+
+        if (entity := from_gateway(entity_id)) is not None:
+            counts["gateway"] += 1
+            return entity
+
+        found, entity = self._caches[kind].get(entity_id)
+        if found:
+            counts["cached" if entity is not None else "negative"] += 1
+            return entity
+
+        counts["fetched"] += 1
+        try:
+            entity = await fetch(entity_id)
+        except hikari.NotFoundError:
+            entity = None
+
+        self._caches[kind].set(entity_id, entity)
+        return entity
+
+    def invalidate(self, kind, entity_id):
+        self._caches[kind].discard(entity_id)
+
+    def hit_ratio(self, kind=None):
+        """The share of lookups, of one kind or all, answered without a request."""
+        counts = [self._counts[kind]] if kind is not None else self._counts.values()
+        total = sum(sum(c.values()) for c in counts)
+        return (total - sum(c["fetched"] for c in counts)) / total if total else 0.0
+
+    @property
+    def stats(self):
+        return {
+            kind: {**counts, "entries": len(self._caches[kind]), "hit_ratio": self.hit_ratio(kind)}
+            for kind, counts in self._counts.items()
+        }
+
+    def __repr__(self):
+        return f"<EntityResolver hit_ratio={self.hit_ratio()!r}>"
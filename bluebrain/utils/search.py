@@ -1,15 +1,188 @@
+from abc import ABC, abstractmethod
+from heapq import heappush, heapreplace
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Above this many candidates, scores are computed with NumPy, if it is installed.
+NUMPY_THRESHOLD = 2_000
+# Codepoints never reach this, so it pads shorter candidates without ever matching.
+PAD = 0x110000
+
+
+class Scorer(ABC):
+    """Scores how closely a term matches a candidate, from 0 to 1.
+
+    `prepare` runs once per candidate, when it is indexed, and once per term, so work on either string alone is never
+    repeated. `bound` gives a cheap upper limit on `score`, so candidates that can not make the top `k` are skipped."""
+
+    name = None
+
+    def prepare(self, key):
+        return key
+
+    @abstractmethod
+    def score(self, term, candidate):
+        ...
+
+    def bound(self, term, candidate):
+        return 1.0
+
+    def __repr__(self):
+        return f"<{type(self).__name__}>"
+
+
+class PositionScorer(Scorer):
+    """The most characters of the term that line up with the candidate at any one offset, as `Match` has always scored.
+
+    `SearchIndex` indexes candidates by character position for this scorer, so it never runs through `score`."""
+
+    name = "position"
+
+    def score(self, term, candidate):
+        return Match(term, candidate).strength
+
+
+class LevenshteinScorer(Scorer):
+    """One minus the edit distance, relative to the longer string."""
+
+    name = "levenshtein"
+
+    def score(self, term, candidate):
+        if not term and not candidate:
+            return 1.0
+
+        previous = list(range(len(candidate) + 1))
+        for i, a in enumerate(term, start=1):
+            current = [i]
+            for j, b in enumerate(candidate, start=1):
+                current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (a != b)))
+            previous = current
+
+        return 1 - previous[-1] / max(len(term), len(candidate))
+
+    def bound(self, term, candidate):
+        # At least the difference in length has to be inserted or deleted.
+        longest = max(len(term), len(candidate))
+        return 1 - abs(len(term) - len(candidate)) / longest if longest else 1.0
+
+
+class JaroWinklerScorer(Scorer):
+    """Jaro similarity, raised for candidates sharing up to four leading characters with the term."""
+
+    name = "jaro_winkler"
+
+    def __init__(self, prefix_scale=0.1, max_prefix=4):
+        self.prefix_scale = prefix_scale
+        self.max_prefix = max_prefix
+
+    def score(self, term, candidate):
+        if term == candidate:
+            return 1.0
+        if not term or not candidate:
+            return 0.0
+
+        window = max(max(len(term), len(candidate)) // 2 - 1, 0)
+        taken = [False] * len(candidate)
+        term_matches = []
+
+        for i, c in enumerate(term):
+            for j in range(max(0, i - window), min(len(candidate), i + window + 1)):
+                if not taken[j] and candidate[j] == c:
+                    taken[j] = True
+                    term_matches.append(c)
+                    break
+
+        if not (matches := len(term_matches)):
+            return 0.0
+
+        candidate_matches = [c for c, t in zip(candidate, taken) if t]
+        transpositions = sum(a != b for a, b in zip(term_matches, candidate_matches)) / 2
+        jaro = (matches / len(term) + matches / len(candidate) + (matches - transpositions) / matches) / 3
+
+        prefix = 0
+        for a, b in zip(term[: self.max_prefix], candidate[: self.max_prefix]):
+            if a != b:
+                break
+            prefix += 1
+
+        return jaro + prefix * self.prefix_scale * (1 - jaro)
+
+
+class TrigramScorer(Scorer):
+    """The Jaccard index of the two strings' sets of three-character runs, padded so short strings still have some."""
+
+    name = "trigram"
+
+    def prepare(self, key):
+        padded = f"  {key} "
+        return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+    def score(self, term, candidate):
+        if not term or not candidate:
+            return 0.0
+        shared = len(term & candidate)
+        return shared / (len(term) + len(candidate) - shared)
+
+    def bound(self, term, candidate):
+        if not term or not candidate:
+            return 0.0
+        return min(len(term), len(candidate)) / max(len(term), len(candidate))
+
+
+class PrefixScorer(Scorer):
+    """How much of the term the candidate starts with."""
+
+    name = "prefix"
+
+    def score(self, term, candidate):
+        if not term:
+            return 0.0
+
+        shared = 0
+        for a, b in zip(term, candidate):
+            if a != b:
+                break
+            shared += 1
+
+        return shared / len(term)
+
+    def bound(self, term, candidate):
+        return min(len(term), len(candidate)) / len(term) if term else 0.0
+
+
+SCORERS = {
+    scorer.name: scorer
+    for scorer in (PositionScorer(), LevenshteinScorer(), JaroWinklerScorer(), TrigramScorer(), PrefixScorer())
+}
+
+
+def get_scorer(scorer):
+    """Returns the scorer called `scorer`, or `scorer` itself if it is already one."""
+    if isinstance(scorer, Scorer):
+        return scorer
+
+    try:
+        return SCORERS[scorer]
+    except KeyError:
+        raise ValueError(f"Unknown scorer: {scorer}.") from None
+
+
 class Match:
-    def __init__(self, term, comparison, case_sensitive=False):
+    def __init__(self, term, comparison, case_sensitive=False, strength=None):
         self.term = term
         self.comparison = comparison
         self.case_sensitive = case_sensitive
-        self._strength = self._calculate_strength()
+        self._strength = self._calculate_strength() if strength is None else strength
 
     @property
     def strength(self):
         return self._strength
 
     def _calculate_strength(self):
+        # The reference scorer. `SearchIndex` gives the same strengths without comparing every character pair.
         most_matches = 0
 
         for idx in range(len(self.comparison)):
@@ -48,40 +221,280 @@ class Match:
         return self.comparison != value.comparison
 
 
+class SearchIndex:
+    """Candidates prepared once, so they can be scored against any number of terms.
+
+    Each candidate is lowercased and prepared for the scorer once. With the default position scorer, each candidate is
+    stored as the positions of each of its characters, so only character pairs that actually match are ever visited,
+    and candidates that can not beat the current top `k` are skipped unscored. Large candidate sets are then scored as
+    a single array when NumPy is installed. Other scorers skip candidates using their `bound`.
+
+    Candidates can be added and removed in place. A removed candidate leaves a hole (`None`) behind, so every other
+    candidate keeps its index."""
+
+    def __init__(self, comparisons, case_sensitive=False, numpy_threshold=NUMPY_THRESHOLD, scorer="position"):
+        self.comparisons = list(comparisons)
+        self.case_sensitive = case_sensitive
+        self.numpy_threshold = numpy_threshold
+        self.scorer = get_scorer(scorer)
+        self._positional = isinstance(self.scorer, PositionScorer)
+
+        # For the position scorer, where each character falls in each candidate, and which candidates hold each
+        # character, and how often.
+        self._prepared = []
+        self._postings = {}
+        for i, comparison in enumerate(self.comparisons):
+            self._index(i, comparison)
+
+        self.holes = 0
+        self._matrix = None
+        self._limits = None
+
+    def _index(self, i, comparison):
+        if not self._positional:
+            self._prepared.append(self.scorer.prepare(self._key(comparison)))
+            return
+
+        positions = self._index_term(self._key(comparison))
+        self._prepared.append(positions)
+        for c, ps in positions.items():
+            self._postings.setdefault(c, []).append((i, len(ps)))
+
+    def add(self, comparison):
+        """Adds a candidate, and returns its index."""
+        i = len(self.comparisons)
+        self.comparisons.append(comparison)
+        self._index(i, comparison)
+        self._matrix = None
+        return i
+
+    def remove(self, i):
+        # Postings still list the hole, and are skipped over when scoring.
+        if self.comparisons[i] is not None:
+            self.comparisons[i] = None
+            self._prepared[i] = None
+            self.holes += 1
+            self._matrix = None
+
+    def _key(self, term):
+        return term if self.case_sensitive else term.lower()
+
+    def _matches(self, term_positions, i):
+        # Matching characters at term position `j` and candidate position `p` line up at offset `p - j`.
+        limit = len(self.comparisons[i])
+        positions = self._prepared[i]
+        offsets = {}
+
+        for c, js in term_positions.items():
+            if (ps := positions.get(c)) is not None:
+                for p in ps:
+                    for j in js:
+                        # Offsets past the end of the candidate only happen when lowercasing lengthens it.
+                        if j <= p and (offset := p - j) < limit:
+                            offsets[offset] = offsets.get(offset, 0) + 1
+
+        return max(offsets.values(), default=0)
+
+    @staticmethod
+    def _index_term(key):
+        positions = {}
+        for j, c in enumerate(key):
+            positions.setdefault(c, []).append(j)
+        return positions
+
+    def _array_scores(self, key):
+        if self._matrix is None:
+            keys = [self._key(comparison or "") for comparison in self.comparisons]
+            width = max(map(len, keys), default=0)
+            self._matrix = numpy.full((len(keys), width), PAD, dtype=numpy.uint32)
+            for row, key_ in enumerate(keys):
+                self._matrix[row, : len(key_)] = [ord(c) for c in key_]
+            limits = [len(comparison or "") for comparison in self.comparisons]
+            # Only needed where lowercasing lengthened a candidate.
+            if any(limit != len(key_) for limit, key_ in zip(limits, keys)):
+                self._limits = numpy.array(limits)
+
+        matrix = self._matrix
+        term = numpy.array([ord(c) for c in key], dtype=numpy.uint32)
+        best = numpy.zeros(len(matrix), dtype=numpy.int64)
+
+        for offset in range(matrix.shape[1]):
+            span = min(len(term), matrix.shape[1] - offset)
+            matches = (matrix[:, offset : offset + span] == term[:span]).sum(axis=1)
+            if self._limits is not None:
+                matches = numpy.where(offset < self._limits, matches, 0)
+            numpy.maximum(best, matches, out=best)
+
+        if self.holes:
+            best[[i for i, positions in enumerate(self._prepared) if positions is None]] = -1
+
+        return best
+
+    def _use_numpy(self):
+        return self._positional and numpy is not None and len(self) >= self.numpy_threshold
+
+    def scores(self, term):
+        """Returns the strength of every candidate, in order, with `None` for holes."""
+        key = self._key(term)
+
+        if self._use_numpy():
+            return [int(matches) / len(term) if matches >= 0 else None for matches in self._array_scores(key)]
+
+        if not self._positional:
+            prepared = self.scorer.prepare(key)
+            return [
+                self.scorer.score(prepared, candidate) if candidate is not None else None for candidate in self._prepared
+            ]
+
+        term_positions = self._index_term(key)
+        return [
+            self._matches(term_positions, i) / len(term) if positions is not None else None
+            for i, positions in enumerate(self._prepared)
+        ]
+
+    def top(self, term, limit=1):
+        """Returns the `(strength, index)` of the best `limit` candidates, in the order a stable sort would give."""
+        if limit <= 0:
+            return []
+
+        if self._use_numpy():
+            matches = self._array_scores(self._key(term))
+            order = numpy.argsort(-matches, kind="stable")[:limit]
+            return [(int(matches[i]) / len(term), int(i)) for i in order if matches[i] >= 0]
+
+        if not self._positional:
+            return self._top_scored(self.scorer.prepare(self._key(term)), limit)
+
+        key = self._key(term)
+        term_positions = self._index_term(key)
+
+        # No candidate can match more of the term than the characters it shares with it, so candidates are visited
+        # from the most shared characters down, until none left could make the top `limit`.
+        bounds = {}
+        for c, js in term_positions.items():
+            for i, count in self._postings.get(c, ()):
+                bounds[i] = bounds.get(i, 0) + min(len(js), count)
+
+        buckets = [[] for _ in range(len(key) + 1)]
+        for i, bound in bounds.items():
+            if self._prepared[i] is not None:
+                buckets[bound].append(i)
+
+        # A min-heap of (matches, -index), so the weakest, latest candidate is always on top.
+        heap = []
+
+        def offer(item):
+            if len(heap) < limit:
+                heappush(heap, item)
+            elif item > heap[0]:
+                heapreplace(heap, item)
+            else:
+                return False
+            return True
+
+        for bound in range(len(key), 0, -1):
+            if len(heap) == limit and bound < heap[0][0]:
+                break
+            for i in buckets[bound]:
+                offer((self._matches(term_positions, i), -i))
+
+        # Candidates sharing no characters all score nothing, so the earliest of them fill any places left.
+        if len(heap) < limit or heap[0][0] == 0:
+            for i in range(len(self.comparisons)):
+                if i not in bounds and self._prepared[i] is not None and not offer((0, -i)):
+                    break
+
+        return [(matches / len(term), -i) for matches, i in sorted(heap, reverse=True)]
+
+    def _top_scored(self, term, limit):
+        scorer = self.scorer
+        # A min-heap of (score, -index), as for the position scorer.
+        heap = []
+
+        for i, candidate in enumerate(self._prepared):
+            if candidate is None or len(heap) == limit and scorer.bound(term, candidate) <= heap[0][0]:
+                continue
+
+            item = (scorer.score(term, candidate), -i)
+            if len(heap) < limit:
+                heappush(heap, item)
+            elif item > heap[0]:
+                heapreplace(heap, item)
+
+        return [(score, -i) for score, i in sorted(heap, reverse=True)]
+
+    def search(self, term):
+        return Search(term, self)
+
+    def __len__(self):
+        return len(self.comparisons) - self.holes
+
+    def __repr__(self):
+        return (
+            f"<SearchIndex comparisons={len(self)!r} holes={self.holes!r}"
+            f" case_sensitive={self.case_sensitive!r} scorer={self.scorer.name!r}>"
+        )
+
+
 class Search:
-    def __init__(self, term, comparisons, case_sensitive=False):
+    def __init__(self, term, comparisons, case_sensitive=False, scorer="position"):
+        # Pass a `SearchIndex` to reuse candidates that have already been prepared, along with its scorer.
+        if isinstance(comparisons, SearchIndex):
+            self.index = comparisons
+        else:
+            self.index = SearchIndex(comparisons, case_sensitive, scorer=scorer)
         self.term = term
-        self.comparisons = comparisons
-        self._matches = [Match(term, c, case_sensitive) for c in comparisons]
+        self.comparisons = self.index.comparisons
+        self._scores = None
+
+    def _match(self, strength, i):
+        return Match(self.term, self.comparisons[i], self.index.case_sensitive, strength)
+
+    @property
+    def scores(self):
+        if self._scores is None:
+            self._scores = self.index.scores(self.term)
+        return self._scores
 
     @property
     def matches(self):
-        return self._matches
+        return [self._match(strength, i) for i, strength in enumerate(self.scores) if strength is not None]
+
+    def _live(self):
+        return [i for i, strength in enumerate(self.scores) if strength is not None]
+
+    def _ranked(self):
+        return sorted(self._live(), key=self.scores.__getitem__, reverse=True)
 
     def best(self, min_accuracy=0):
-        if (match := max(self.matches, key=lambda x: x.strength)).strength >= min_accuracy:
-            return match
+        if (top := self.index.top(self.term)) and top[0][0] >= min_accuracy:
+            return self._match(*top[0])
 
     def worst(self):
-        return min(self.matches, key=lambda x: x.strength)
+        i = min(self._live(), key=self.scores.__getitem__)
+        return self._match(self.scores[i], i)
 
     def top(self, limit=1):
-        return sorted(self.matches, key=lambda x: x.strength, reverse=True)[:limit]
+        if limit < 0:
+            return [self._match(self.scores[i], i) for i in self._ranked()[:limit]]
+        return [self._match(strength, i) for strength, i in self.index.top(self.term, limit)]
 
     def bottom(self, limit=1):
-        return sorted(self.matches, key=lambda x: x.strength, reverse=True)[-limit:]
+        return [self._match(self.scores[i], i) for i in self._ranked()[-limit:]]
 
     def range(self, min, max):
-        return sorted(self.matches, key=lambda x: x.strength, reverse=True)[min:max]
+        if max is None or min < 0 or max < 0:
+            return [self._match(self.scores[i], i) for i in self._ranked()[min:max]]
+        return self.top(max)[min:]
 
     def accurate_to(self, accuracy):
-        return sorted([m for m in self.matches if m.strength >= accuracy], key=lambda x: x.strength, reverse=True)
+        return [self._match(self.scores[i], i) for i in self._ranked() if self.scores[i] >= accuracy]
 
     def __str__(self, /):
         return self.term
 
     def __repr__(self, /):
-        return f"<Search term={repr(self.term)} comparisons={repr(len(self.comparisons))}>"
+        return f"<Search term={repr(self.term)} comparisons={repr(len(self.index))}>"
 
     def __int__(self, /):
         return int(self.matches)
@@ -90,4 +503,4 @@ class Search:
         return round(self.matches)
 
     def __float__(self, /):
-        return self.matches
\ No newline at end of file
+        return self.matches